@@ -0,0 +1,49 @@
+"""Time list_submoves, do_submove and list_moves with each board backend."""
+import time
+from functools import partial
+from typing import Callable
+from typing import List
+
+from pygammon.pygammon import Backend
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.randomboard import make_positions
+
+def list_submoves(positions: List[Board]) -> None:
+    """List the submoves of every die."""
+    for _ in range(0, 200):
+        for board in positions:
+            for die in range(1, 7):
+                board.list_submoves(Color.Black, die)
+
+def do_submoves(positions: List[Board]) -> None:
+    """Play and take back every legal submove."""
+    for board in positions:
+        for die in range(1, 7):
+            submoves = board.list_submoves(Color.Black, die)
+            for _ in range(0, 50):
+                for submove in submoves:
+                    did_hit = board.do_submove(Color.Black, submove)
+                    board.undo_submove(Color.Black, submove, did_hit)
+
+def list_moves(positions: List[Board]) -> None:
+    """List the moves of every roll."""
+    for board in positions:
+        for first_die in range(1, 7):
+            for second_die in range(first_die, 7):
+                board.list_moves(Color.Black, [first_die, second_die])
+
+def main() -> None:
+    """Print the time of each benchmark for each backend."""
+    benchmarks = [list_submoves, do_submoves, list_moves] \
+        # type: List[Callable[[List[Board]], None]]
+    for backend in Backend:
+        positions = make_positions(20, partial(Board, backend=backend))
+        for benchmark in benchmarks:
+            start = time.perf_counter()
+            benchmark(positions)
+            seconds = time.perf_counter() - start
+            print('{}: {} {:.2f}s'.format(
+                backend.name, benchmark.__name__, seconds))
+
+main()
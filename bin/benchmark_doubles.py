@@ -0,0 +1,48 @@
+"""Count the nodes searched to list the moves of doubles, with and without
+listing submoves with the same die in one order only. A node is a position
+whose submoves are listed."""
+import time
+from typing import List
+
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.pygammon import DICE
+from pygammon.pygammon import Move
+from pygammon.pygammon import Submove
+from pygammon.randomboard import make_positions
+
+class CountingBoard(Board):
+    """Board counting the positions whose submoves are listed."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.nodes = 0
+
+    def _list_moves_r(
+            self, checkers: List[int], is_open: List[bool], outside: int,
+            dice: DICE, die_index: int, submoves: List[Submove],
+            canonical: bool, moves: List[Move]) -> bool:
+        self.nodes += 1
+        return super()._list_moves_r(
+            checkers, is_open, outside, dice, die_index, submoves, canonical,
+            moves)
+
+def main() -> None:
+    """Print the nodes and time for each mode."""
+    positions = make_positions(20, CountingBoard)
+    for canonical in (False, True):
+        nodes = 0
+        num_moves = 0
+        start = time.perf_counter()
+        for board in positions:
+            for die in range(1, 7):
+                board.nodes = 0
+                moves = board.list_moves_with_ordered_dice_r(
+                    Color.Black, [die] * 4, canonical)
+                nodes += board.nodes
+                num_moves += len(moves)
+        seconds = time.perf_counter() - start
+        print('canonical={}: {} nodes, {} moves, {:.2f}s'.format(
+            canonical, nodes, num_moves, seconds))
+
+main()
@@ -0,0 +1,37 @@
+"""Time random games played one at a time by Game and in lockstep by
+Simulator, with the policy playing like Game and the cheaper one."""
+import random
+import time
+
+import numpy as np
+
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.pygammon import Game
+from pygammon.pygammon import Observer
+from pygammon.pygammon import RandomDice
+from pygammon.randomplayer import RandomPlayer
+from pygammon.simulator import Simulator
+
+def main() -> None:
+    """Print the games per hour of each way."""
+    games = 200
+    player = RandomPlayer(random.Random(0))
+    dice = RandomDice(np.random.default_rng(0))
+    start = time.perf_counter()
+    for _ in range(0, games):
+        Game(Board(), Observer(), dice).play_round(player, player)
+    seconds = time.perf_counter() - start
+    print('Game: {:.0f} games/hour'.format(games * 3600 / seconds))
+
+    # The first policy plays like Game. The second is a cheaper one.
+    for policy in (player.choose_moves, player.choose_walk_moves):
+        simulator = Simulator(policy, policy, np.random.default_rng(0))
+        start = time.perf_counter()
+        results = simulator.play(games)
+        seconds = time.perf_counter() - start
+        print('Simulator with {}: {:.0f} games/hour, Black wins {:.3f}'
+              .format(policy.__name__, games * 3600 / seconds,
+                      results.get_win_rate(Color.Black)))
+
+main()
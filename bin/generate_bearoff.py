@@ -0,0 +1,16 @@
+"""Write the one-sided bear-off database, for example
+python bin/generate_bearoff.py bearoff.db 15"""
+import sys
+import time
+
+from pygammon.bearoff import write_database
+
+def main() -> None:
+    """Write the database to the path given."""
+    path = sys.argv[1]
+    max_checkers = int(sys.argv[2]) if 2 < len(sys.argv) else 15
+    start = time.perf_counter()
+    write_database(path, max_checkers)
+    print('Wrote {} in {:.2f}s'.format(path, time.perf_counter() - start))
+
+main()
@@ -0,0 +1,6 @@
+"""Check the games of a record file, for example
+python bin/replay.py games.rec --workers 4"""
+from pygammon.replay import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,11 @@
+"""Run a tournament between two players, for example
+python bin/tournament.py pygammon.randomplayer.RandomPlayer \
+    pygammon.randomplayer.RandomPlayer --matches 100
+Network players need their weights:
+python bin/tournament.py pygammon.searchplayer.SearchPlayer \
+    pygammon.neuralplayer.NeuralPlayer --first-weights net.bin \
+    --second-weights net.bin"""
+from pygammon.tournament import main
+
+if __name__ == '__main__':
+    main()
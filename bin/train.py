@@ -0,0 +1,6 @@
+"""Train a network by self-play, for example
+python bin/train.py weights.net --games 10000 --workers 4"""
+from pygammon.training import main
+
+if __name__ == '__main__':
+    main()
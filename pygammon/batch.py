@@ -0,0 +1,244 @@
+"""Many positions at once, with legality checks vectorized by NumPy."""
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+
+from pygammon.pygammon import Backend
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.pygammon import DICE
+from pygammon.pygammon import Move
+from pygammon.pygammon import SUBMOVES
+from pygammon.pygammon import Submove
+
+# The sources and dice of every submove, as columns and rows of the masks.
+_SOURCES = np.arange(Board.BAR_POS, Board.BEARING_OFF_POS).reshape(-1, 1)
+_DICE = np.arange(1, 7).reshape(1, -1)
+_DESTINATIONS = _SOURCES + _DICE
+# Where the opponent's checkers blocking each destination are. Bearing off
+# is never blocked, so it points at the opponent's bar to stay in range.
+_BLOCKING_POS = np.where(
+    _DESTINATIONS < Board.BEARING_OFF_POS,
+    Board.BEARING_OFF_POS - _DESTINATIONS, Board.BAR_POS)
+
+class BoardBatch:
+    """Represent many positions, each seen by the player to move.
+    checkers has shape (positions, 2, Board.BOARD_SIZE). checkers[i, 0] holds
+    the checkers of the player to move in position i and checkers[i, 1] the
+    opponent's, each from its owner's point of view like the arrays of Board.
+    """
+
+    def __init__(self, checkers: np.ndarray) -> None:
+        self.checkers = checkers
+
+    @staticmethod
+    def from_boards(boards: List[Board], colors: List[Color]) -> 'BoardBatch':
+        """Make a batch with colors[i] to move on boards[i]."""
+        checkers = np.zeros(
+            (len(boards), 2, Board.BOARD_SIZE), dtype=np.int8)
+        for index, (board, color) in enumerate(zip(boards, colors)):
+            checkers[index, 0] = list(board.get_board(color))
+            checkers[index, 1] = list(board.get_board(color.opposite()))
+        return BoardBatch(checkers)
+
+    def __len__(self) -> int:
+        return len(self.checkers)
+
+    def to_board(
+            self, index: int, backend: Backend = Backend.ByteArray,
+            board: Optional[Board] = None) -> Board:
+        """Make a board of a position, with the player to move as Black.
+        Pass a board to write the position into it instead, which saves
+        setting up a new one."""
+        if board is None:
+            board = Board(backend=backend)
+        backend = board.backend
+        for color in Color:
+            checkers = self.checkers[index, color.value]
+            if Backend.ByteArray == backend:
+                board.get_board(color)[:] = checkers.tobytes()
+            else:
+                board.get_board(color)[:] = checkers
+        board.recompute()
+        return board
+
+    def submove_mask(self) -> np.ndarray:
+        """Check every submove of every position at once.
+        Return a boolean array of shape (positions, 25, 6), where
+        [i, source, die - 1] tells if the submove is legal in position i. The
+        rules are those of Board.is_valid_submove.
+        """
+        own = self.checkers[:, 0, :].astype(np.int32)
+        opposite = self.checkers[:, 1, :].astype(np.int32)
+        # Make sure there is a checker to move.
+        mask = (0 < own[:, Board.BAR_POS:Board.BEARING_OFF_POS])[:, :, None]
+        # Make sure the destination is not blocked.
+        mask = mask & ((opposite[:, _BLOCKING_POS] < 2) |
+                       (Board.BEARING_OFF_POS <= _DESTINATIONS))
+        # Make sure the bar is empty or we're getting out the bar.
+        is_bar_empty = 0 == own[:, Board.BAR_POS]
+        mask &= (is_bar_empty[:, None] |
+                 (Board.BAR_POS == _SOURCES.T))[:, :, None]
+        # When bearing off, make sure everyone is home. If there's no checker
+        # on the point rolled, make sure we're bearing off from the highest
+        # point, meaning nothing is further back than the source.
+        is_all_home = 0 == own[:, Board.BAR_POS:Board.HOME_POS].sum(axis=1)
+        has_checkers = 0 < own[:, Board.BAR_POS:Board.BEARING_OFF_POS]
+        back_pos = np.where(
+            has_checkers.any(axis=1), has_checkers.argmax(axis=1),
+            Board.BEARING_OFF_POS)
+        can_bear_off = is_all_home[:, None, None] & (
+            (Board.BEARING_OFF_POS == _DESTINATIONS) |
+            (_SOURCES <= back_pos[:, None, None]))
+        return mask & ((_DESTINATIONS < Board.BEARING_OFF_POS) | can_bear_off)
+
+    def is_valid_submove(
+            self, sources: np.ndarray, dice: np.ndarray) -> np.ndarray:
+        """Check a submove from sources[i] with dice[i] in each position i."""
+        sources = np.asarray(sources)
+        dice = np.asarray(dice)
+        is_in_range = (Board.BAR_POS <= sources) & \
+            (sources < Board.BEARING_OFF_POS) & (1 <= dice) & (dice <= 6)
+        mask = self.submove_mask()
+        positions = np.arange(len(self))
+        return is_in_range & mask[
+            positions, np.clip(sources, Board.BAR_POS,
+                               Board.BEARING_OFF_POS - 1),
+            np.clip(dice, 1, 6) - 1]
+
+    def list_submoves(
+            self, index: int, die: int,
+            mask: Optional[np.ndarray] = None) -> List[Submove]:
+        """List the legal submoves of a position given the die roll.
+        Pass the result of submove_mask to avoid computing it again."""
+        if mask is None:
+            mask = self.submove_mask()
+        return [SUBMOVES[source * 6 + die - 1]
+                for source in np.flatnonzero(mask[index, :, die - 1])]
+
+    def has_legal_move(self, dice: np.ndarray) -> np.ndarray:
+        """Check if each position i has a legal move with the roll dice[i].
+        dice has shape (positions, 2)."""
+        dice = np.asarray(dice)
+        can_move = self.submove_mask().any(axis=1)
+        positions = np.arange(len(self))
+        return can_move[positions, dice[:, 0] - 1] | \
+            can_move[positions, dice[:, 1] - 1]
+
+    def list_moves(self, index: int, dice: DICE,
+                   board: Optional[Board] = None) -> List[Move]:
+        """List the legal moves of a position, like Board.list_moves.
+        Pass a board to reuse it, as in to_board."""
+        return self.to_board(index, board=board).list_moves(
+            Color.Black, dice)
+
+    def do_moves(self, moves: List[Optional[Move]]) -> None:
+        """Play moves[i] in position i, or nothing if moves[i] is None.
+        The submoves are played in order across the whole batch at once,
+        hitting like Board.do_move. The player to move does not change."""
+        sources = np.full((len(self), 4), -1, dtype=np.int32)
+        dice = np.zeros((len(self), 4), dtype=np.int32)
+        for index, move in enumerate(moves):
+            if move is None:
+                continue
+            # The last submove is played first.
+            for order, submove in enumerate(reversed(move.submoves)):
+                sources[index, order] = submove.source
+                dice[index, order] = submove.die
+        for order in range(0, 4):
+            positions = np.flatnonzero(0 <= sources[:, order])
+            if 0 == len(positions):
+                break
+            _do_submoves(self.checkers, positions, sources[positions, order],
+                         dice[positions, order])
+
+    def choose_random_moves(
+            self, dice: np.ndarray,
+            rng: np.random.Generator) -> List[Optional[Move]]:
+        """Choose a random legal move in each position i with the roll
+        dice[i], or None if there is no legal move. The submoves are drawn
+        from submove_mask one step at a time across the whole batch, the
+        dice in a random order. A move using every die is always legal, so
+        only the few positions where the draw gets stuck earlier are left
+        to list_moves. The moves are not equally likely: each submove is,
+        among those legal at its step."""
+        dice = np.asarray(dice)
+        steps = np.where(dice[:, 0] == dice[:, 1], 4, 2)
+        # The die of each step: doubles four times, otherwise both dice in
+        # a random order.
+        is_swapped = rng.random(len(self)) < 0.5
+        step_dice = np.where(is_swapped[:, None], dice[:, ::-1], dice)
+        step_dice = np.concatenate([step_dice, step_dice], axis=1)
+        sources, used = _draw_submoves(
+            self.checkers.copy(), step_dice, steps, rng)
+        moves = [] # type: List[Optional[Move]]
+        for index in range(0, len(self)):
+            if 0 == used[index]:
+                moves.append(None)
+            elif used[index] < steps[index]:
+                legal_moves = self.list_moves(index, dice[index].tolist())
+                moves.append(legal_moves[rng.integers(len(legal_moves))])
+            else:
+                # The submoves of a move are in reverse order.
+                moves.append(Move([
+                    SUBMOVES[sources[index, step] * 6 +
+                             step_dice[index, step] - 1]
+                    for step in range(used[index] - 1, -1, -1)]))
+        return moves
+
+def _do_submoves(checkers: np.ndarray, positions: np.ndarray,
+                 sources: np.ndarray, dice: np.ndarray) -> None:
+    """Play a submove from sources[i] with dice[i] in each position
+    positions[i] of checkers, hitting like Board.do_submove."""
+    own = checkers[:, 0, :]
+    opposite = checkers[:, 1, :]
+    destinations = np.minimum(sources + dice, Board.BEARING_OFF_POS)
+    own[positions, sources] -= 1
+    own[positions, destinations] += 1
+    opposite_destinations = Board.BEARING_OFF_POS - destinations
+    is_hit = (destinations < Board.BEARING_OFF_POS) & \
+        (1 == opposite[positions, opposite_destinations])
+    hit_positions = positions[is_hit]
+    opposite[hit_positions, opposite_destinations[is_hit]] = 0
+    opposite[hit_positions, Board.BAR_POS] += 1
+
+def _choose_sources(legal: np.ndarray,
+                    rng: np.random.Generator) -> np.ndarray:
+    """Pick a random legal source in each row of legal by giving each a
+    random key, or -1 if none is legal."""
+    keys = rng.random(legal.shape)
+    keys[~legal] = -1.0
+    return np.where(legal.any(axis=1), keys.argmax(axis=1), -1)
+
+def _draw_submoves(
+        checkers: np.ndarray, step_dice: np.ndarray, steps: np.ndarray,
+        rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """Play random submoves in each position i of checkers with
+    step_dice[i, step] until steps[i] are played or none is legal. The first
+    two dice of step_dice are swapped where only the second can start.
+    Return the source of each submove and how many each position played."""
+    sources = np.zeros((len(checkers), 4), dtype=np.int32)
+    used = np.zeros(len(checkers), dtype=np.int32)
+    for step in range(0, 4):
+        walking = np.flatnonzero((step == used) & (step < steps))
+        if 0 == len(walking):
+            break
+        rows = np.arange(len(walking))
+        mask = BoardBatch(checkers[walking]).submove_mask()
+        die = step_dice[walking, step]
+        if 0 == step:
+            # Start with the other die if this one can't be played.
+            is_stuck = ~mask[rows, :, die - 1].any(axis=1) & \
+                (2 == steps[walking])
+            step_dice[walking[is_stuck]] = \
+                step_dice[walking[is_stuck]][:, [1, 0, 3, 2]]
+            die = step_dice[walking, step]
+        chosen = _choose_sources(mask[rows, :, die - 1], rng)
+        is_moving = 0 <= chosen
+        moving = walking[is_moving]
+        sources[moving, step] = chosen[is_moving]
+        _do_submoves(checkers, moving, chosen[is_moving], die[is_moving])
+        used[moving] += 1
+    return sources, used
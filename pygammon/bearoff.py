@@ -0,0 +1,220 @@
+"""A one-sided bear-off database.
+
+It holds every position of up to max_checkers checkers on the six home
+points of one player, with the expected number of rolls to bear them all
+off and the probability of needing each number of rolls. Each roll is played
+to minimize the expected rolls.
+
+Positions are ranked with the combinatorial number system. Counting the
+checkers already off as a seventh point, a position splits max_checkers
+checkers between seven bins, which is a choice of six separators among
+max_checkers + 6 slots. The rank of the separators is the index of the
+position, so there are C(max_checkers + 6, 6) positions and no gaps.
+
+The database file is a header followed by one row of float32 per position:
+the expected rolls, then the probabilities of finishing in 0, 1, 2, ...
+rolls. It is memory-mapped, so opening it reads nothing and processes share
+its pages.
+"""
+import struct
+from typing import List
+from typing import Sequence
+
+import numpy as np
+
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+
+HOME_POINTS = 6
+# A roll moves at least three pips, so 15 checkers on the six-point finish
+# in 30 rolls.
+MAX_ROLLS = 31
+
+_MAGIC = b'PYGBEAR1'
+# The magic, the number of checkers, of positions and of rolls.
+_HEADER = struct.Struct('<8sIII')
+_HEADER_SIZE = 64
+
+# The 21 distinct rolls and their probabilities.
+_ROLLS = [(first_die, second_die, (1 if first_die == second_die else 2) / 36)
+          for first_die in range(1, 7) for second_die in range(first_die, 7)]
+
+def _make_binomials(size: int) -> np.ndarray:
+    """Make a table of C(n, k) for n and k below size."""
+    binomials = np.zeros((size, size), dtype=np.int64)
+    for n in range(0, size):
+        binomials[n, 0] = 1
+        for k in range(1, n + 1):
+            binomials[n, k] = binomials[n - 1, k - 1] + binomials[n - 1, k]
+    return binomials
+
+def count_positions(max_checkers: int) -> int:
+    """Count the positions of up to max_checkers checkers."""
+    return int(_make_binomials(max_checkers + HOME_POINTS + 1)[
+        max_checkers + HOME_POINTS, HOME_POINTS])
+
+def _rank(counts: np.ndarray, max_checkers: int,
+          binomials: np.ndarray) -> np.ndarray:
+    """Rank positions given as rows of checkers on points 1 to 6."""
+    # The separator after each bin sits after the checkers in the bins
+    # before it, starting with the checkers off.
+    separator = max_checkers - counts.sum(axis=-1)
+    rank = np.zeros(counts.shape[:-1], dtype=np.int64)
+    for point in range(1, HOME_POINTS + 1):
+        rank += binomials[separator, point]
+        separator = separator + counts[..., point - 1] + 1
+    return rank
+
+def rank_position(counts: Sequence[int], max_checkers: int) -> int:
+    """Get the index of a position given the checkers on points 1 to 6."""
+    binomials = _make_binomials(max_checkers + HOME_POINTS + 1)
+    return int(_rank(np.array(counts), max_checkers, binomials))
+
+def _list_positions(max_checkers: int) -> np.ndarray:
+    """List the checkers on points 1 to 6 of every position by rank."""
+    positions = [[]] # type: List[List[int]]
+    for _ in range(0, HOME_POINTS):
+        positions = [position + [checkers] for position in positions
+                     for checkers in range(
+                         0, max_checkers - sum(position) + 1)]
+    counts = np.array(positions, dtype=np.int64)
+    binomials = _make_binomials(max_checkers + HOME_POINTS + 1)
+    ranked = np.zeros_like(counts)
+    ranked[_rank(counts, max_checkers, binomials)] = counts
+    return ranked
+
+def _list_successors(counts: np.ndarray, max_checkers: int) -> np.ndarray:
+    """Get the positions reached by playing one die in every position.
+    Return an array of shape (positions + 1, 6, 6) where [i, die - 1] lists
+    the ranks reached from position i with the die, one per source point.
+    Illegal submoves lead to the extra position at the end. Bearing off the
+    last checker stays there, so every die of a roll can be played.
+    """
+    binomials = _make_binomials(max_checkers + HOME_POINTS + 1)
+    num_positions = len(counts)
+    invalid = num_positions
+    successors = np.full(
+        (num_positions + 1, 6, HOME_POINTS), invalid, dtype=np.int64)
+    # The highest point with a checker, or 0 once everything is off.
+    occupied = 0 < counts
+    highest = np.where(occupied.any(axis=1),
+                       HOME_POINTS - occupied[:, ::-1].argmax(axis=1), 0)
+    for die in range(1, 7):
+        for point in range(1, HOME_POINTS + 1):
+            # Move within the home board, bear off exactly, or bear off
+            # from the highest point with a larger die.
+            is_legal = occupied[:, point - 1] & (
+                (die <= point) | (highest == point))
+            after = counts.copy()
+            after[:, point - 1] -= 1
+            if die < point:
+                after[:, point - die - 1] += 1
+            ranks = _rank(
+                np.maximum(after, 0), max_checkers, binomials)
+            successors[:-1, die - 1, point - 1] = np.where(
+                is_legal, ranks, invalid)
+    finished = num_positions - 1
+    successors[finished, :, 0] = finished
+    return successors
+
+def generate(max_checkers: int) -> np.ndarray:
+    """Compute the database rows of every position by rank."""
+    counts = _list_positions(max_checkers)
+    num_positions = len(counts)
+    successors = _list_successors(counts, max_checkers)
+    expected = np.full(num_positions + 1, np.inf)
+    distributions = np.zeros((num_positions + 1, MAX_ROLLS))
+    finished = num_positions - 1
+    expected[finished] = 0.0
+    distributions[finished, 0] = 1.0
+    # Every submove takes pips away, so positions depend only on positions
+    # with fewer pips.
+    pips = counts @ np.arange(1, HOME_POINTS + 1)
+    for pip_count in range(1, int(pips.max()) + 1):
+        positions = np.flatnonzero(pip_count == pips)
+        position_expected = np.zeros(len(positions))
+        position_distributions = np.zeros((len(positions), MAX_ROLLS))
+        for first_die, second_die, probability in _ROLLS:
+            if first_die == second_die:
+                reached = positions
+                for _ in range(0, 4):
+                    reached = successors[reached, first_die - 1]
+                candidates = reached.reshape(len(positions), -1)
+            else:
+                candidates = np.concatenate([
+                    successors[successors[positions, first_die - 1],
+                               second_die - 1],
+                    successors[successors[positions, second_die - 1],
+                               first_die - 1],
+                ], axis=1).reshape(len(positions), -1)
+            best = candidates[np.arange(len(positions)),
+                              expected[candidates].argmin(axis=1)]
+            position_expected += probability * (1 + expected[best])
+            position_distributions[:, 1:] += \
+                probability * distributions[best, :-1]
+        expected[positions] = position_expected
+        distributions[positions] = position_distributions
+    rows = np.zeros((num_positions, 1 + MAX_ROLLS))
+    rows[:, 0] = expected[:-1]
+    rows[:, 1:] = distributions[:-1]
+    return rows
+
+def write_database(path: str, max_checkers: int = 15) -> None:
+    """Generate the database and write it to a file."""
+    rows = generate(max_checkers).astype(np.float32)
+    with open(path, 'wb') as database_file:
+        database_file.write(_HEADER.pack(
+            _MAGIC, max_checkers, len(rows), MAX_ROLLS).ljust(
+                _HEADER_SIZE, b'\0'))
+        database_file.write(rows.tobytes())
+
+class BearoffDatabase:
+    """Look up positions in a database file written by write_database."""
+
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as database_file:
+            magic, max_checkers, num_positions, max_rolls = _HEADER.unpack(
+                database_file.read(_HEADER.size))
+        if _MAGIC != magic:
+            raise ValueError('Not a bear-off database: {}'.format(path))
+        self.max_checkers = max_checkers
+        self.rows = np.memmap(
+            path, dtype=np.float32, mode='r', offset=_HEADER_SIZE,
+            shape=(num_positions, 1 + max_rolls))
+        self._binomials = _make_binomials(
+            max_checkers + HOME_POINTS + 1).tolist()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _get_counts(self, board: Board, color: Color) -> List[int]:
+        """Get the checkers on points 1 to 6 of the player."""
+        return [board.get_checkers(color, Board.BEARING_OFF_POS - point)
+                for point in range(1, HOME_POINTS + 1)]
+
+    def includes(self, board: Board, color: Color) -> bool:
+        """Check if the player's position is in the database."""
+        return board.is_all_home(color) and \
+            sum(self._get_counts(board, color)) <= self.max_checkers
+
+    def get_rank(self, board: Board, color: Color) -> int:
+        """Get the index of the player's position."""
+        if not board.is_all_home(color):
+            raise ValueError('{} is not bearing off.'.format(color))
+        counts = self._get_counts(board, color)
+        separator = self.max_checkers - sum(counts)
+        if separator < 0:
+            raise ValueError('{} has too many checkers.'.format(color))
+        rank = 0
+        for point in range(1, HOME_POINTS + 1):
+            rank += self._binomials[separator][point]
+            separator += counts[point - 1] + 1
+        return rank
+
+    def get_expected_rolls(self, board: Board, color: Color) -> float:
+        """Get the expected rolls to bear off the player's checkers."""
+        return float(self.rows[self.get_rank(board, color), 0])
+
+    def get_distribution(self, board: Board, color: Color) -> np.ndarray:
+        """Get the probabilities of bearing off in 0, 1, 2, ... rolls."""
+        return self.rows[self.get_rank(board, color), 1:]
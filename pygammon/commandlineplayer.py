@@ -59,7 +59,7 @@ class CommandLinePlayer(Player):
             if not isinstance(move, Move):
                 sys.stdout.write('Error: Expected a move.\n')
                 continue
-            if game.board.is_valid_move(color, dice, move):
+            if game.is_legal_move(color, dice, move):
                 return move
             sys.stdout.write('Invalid move.\n')
 
@@ -128,7 +128,7 @@ class CommandLinePlayer(Player):
             destination = Board.get_opposite_pos(destination)
 
         die = destination - source
-        return Submove(source, die)
+        return Submove.get(source, die)
 
     def _parse_move(
             self, feed: str, color: Color, dice: DICE) -> Union[Move, Error]:
@@ -153,7 +153,7 @@ class CommandLinePlayer(Player):
         # If there are more dice than submoves, take the highest.
         sorted_dice = sorted_dice[len(dice) - len(submoves):]
 
-        for submove in submoves:
+        for submove_index, submove in enumerate(submoves):
             # If we're not bearing off, the die is correct.
             if Board.BEARING_OFF_POS != submove.destination():
                 if submove.die in sorted_dice:
@@ -168,7 +168,7 @@ class CommandLinePlayer(Player):
                 if die < submove.die:
                     continue
                 did_find_die = True
-                submove.die = die
+                submoves[submove_index] = Submove.get(submove.source, die)
                 sorted_dice.remove(die)
                 break
 
@@ -211,7 +211,7 @@ class CommandLinePlayer(Player):
                 'show -- show the board\n')
 
         if 'list' == feed:
-            moves = board.list_moves(color, dice)
+            moves = board.list_unique_moves(color, dice)
 
             for move_index in range(0, len(moves)):
                 sys.stdout.write('{}: {}\n'.format(
@@ -0,0 +1,157 @@
+"""A player narrowing down its candidate moves in stages of growing cost.
+
+1. Static: every legal move is scored by a weighted sum of the features of
+   the position it reaches, which Board keeps up to date as moves are
+   generated.
+2. Neural: the survivors are scored by the network in one batch.
+3. Deep: the last few are searched as by SearchPlayer, or rolled out.
+
+Each stage passes on its best moves and any close behind the best, so a
+clear best move skips the expensive stages altogether.
+"""
+import sys
+import time
+from enum import Enum
+from typing import List
+from typing import Optional
+from typing import TextIO
+
+import numpy as np
+
+from pygammon.neuralplayer import Network
+from pygammon.neuralplayer import NeuralPlayer
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.pygammon import DICE
+from pygammon.pygammon import Feature
+from pygammon.pygammon import Move
+from pygammon.rollout import rollout
+from pygammon.searchplayer import SearchPlayer
+
+# Weights of the features of a position, seen by the player who just moved,
+# in the static score. A pip is worth 1.
+STATIC_WEIGHTS = np.zeros(Feature.SIZE)
+STATIC_WEIGHTS[Feature.Pips] = -1.0
+STATIC_WEIGHTS[Feature.Blots] = -4.0
+STATIC_WEIGHTS[Feature.MadePoints] = 3.0
+STATIC_WEIGHTS[Feature.PrimeLength] = 3.0
+STATIC_WEIGHTS[Feature.BackCheckers] = -1.0
+STATIC_WEIGHTS[Feature.OpponentPips] = 1.0
+STATIC_WEIGHTS[Feature.OpponentBlots] = 1.0
+STATIC_WEIGHTS[Feature.OpponentMadePoints] = -3.0
+STATIC_WEIGHTS[Feature.OpponentPrimeLength] = -3.0
+STATIC_WEIGHTS[Feature.OpponentBackCheckers] = 2.0
+
+class Stage(Enum):
+    """The stages of the filter."""
+    Static = 0
+    Neural = 1
+    Deep = 2
+
+class StageFilter:
+    """Which moves a stage passes on: the best keep moves, and any others
+    within threshold of the best score."""
+
+    def __init__(self, keep: int, threshold: float = 0.0) -> None:
+        self.keep = keep
+        self.threshold = threshold
+
+    def select(self, scores: np.ndarray) -> np.ndarray:
+        """Get the indices of the moves passed on, best first."""
+        order = np.argsort(-scores, kind='stable')
+        selected = scores[order] >= scores[order[0]] - self.threshold
+        selected[:max(self.keep, 1)] = True
+        return order[selected]
+
+class FilterStats:
+    """Counters of each stage, indexed by Stage.value: the moves it scored
+    and the time it took."""
+
+    def __init__(self) -> None:
+        self.decisions = 0
+        self.candidates = [0] * len(Stage)
+        self.seconds = [0.0] * len(Stage)
+
+    def add(self, stage: Stage, candidates: int, seconds: float) -> None:
+        """Count a run of a stage."""
+        self.candidates[stage.value] += candidates
+        self.seconds[stage.value] += seconds
+
+    def print(self, stream: Optional[TextIO] = None) -> None:
+        """Print the counters."""
+        if stream is None:
+            stream = sys.stdout
+        stream.write('{} decisions\n'.format(self.decisions))
+        for stage in Stage:
+            stream.write('{}: {} moves in {:.3f}s\n'.format(
+                stage.name, self.candidates[stage.value],
+                self.seconds[stage.value]))
+
+class FilteringPlayer(SearchPlayer):
+    """Pick moves through the static, neural and deep stages. The deep
+    stage searches down to max_depth plies, or plays rollout_trials trials
+    of each move with NeuralPlayer if rollout_trials is positive.
+    """
+
+    def __init__(self, network: Network,
+                 static_filter: Optional[StageFilter] = None,
+                 neural_filter: Optional[StageFilter] = None,
+                 max_depth: int = 2, time_budget: Optional[float] = None,
+                 rollout_trials: int = 0) -> None:
+        super().__init__(network, max_depth, time_budget)
+        self.static_filter = StageFilter(8, 8.0) \
+            if static_filter is None else static_filter
+        self.neural_filter = StageFilter(3, 0.02) \
+            if neural_filter is None else neural_filter
+        self.rollout_trials = rollout_trials
+        self.stats = FilterStats()
+
+    def choose_move(
+            self, board: Board, color: Color, dice: DICE) -> Optional[Move]:
+        """Filter the moves and pick the best survivor of the last stage
+        run."""
+        candidates = board.list_moves_with_features(color, dice)
+        self.depth = 1
+        if len(candidates) <= 1:
+            return candidates[0][0] if candidates else None
+        self.stats.decisions += 1
+        start = time.perf_counter()
+        scores = np.array([features for _, _, features in candidates],
+                          dtype=float) @ STATIC_WEIGHTS
+        indices = self.static_filter.select(scores)
+        now = time.perf_counter()
+        self.stats.add(Stage.Static, len(candidates), now - start)
+        if 1 == len(indices):
+            return candidates[indices[0]][0]
+        start = now
+        values = self._evaluate([candidates[index][1] for index in indices])
+        selected = self.neural_filter.select(values)
+        now = time.perf_counter()
+        self.stats.add(Stage.Neural, len(indices), now - start)
+        if 1 == len(selected) or \
+                (self.max_depth < 2 and self.rollout_trials <= 0):
+            return candidates[indices[selected[0]]][0]
+        start = now
+        moves = [candidates[indices[index]][0] for index in selected]
+        if 0 < self.rollout_trials:
+            values = self._roll_out_moves(board, color, moves)
+        else:
+            values = self.search_moves(board, color, moves, values[selected])
+        self.stats.add(Stage.Deep, len(moves), time.perf_counter() - start)
+        return moves[int(np.argmax(values))]
+
+    def _roll_out_moves(
+            self, board: Board, color: Color,
+            moves: List[Move]) -> np.ndarray:
+        """Get the winning probability of each move by rollouts."""
+        player = NeuralPlayer(self.network)
+        values = np.zeros(len(moves))
+        for index, move in enumerate(moves):
+            did_hits = board.do_move(color, move)
+            try:
+                results = rollout(board, color.opposite(), player,
+                                  self.rollout_trials)
+            finally:
+                board.undo_move(color, move, did_hits)
+            values[index] = 1.0 - results.get_win()[0]
+        return values
@@ -0,0 +1,175 @@
+"""Neural network player in the style of TD-Gammon."""
+import struct
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+
+from pygammon.pygammon import AcceptCommand
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.pygammon import Command
+from pygammon.pygammon import DICE
+from pygammon.pygammon import Game
+from pygammon.pygammon import Move
+from pygammon.pygammon import Player
+from pygammon.pygammon import ResignCommand
+from pygammon.pygammon import RollCommand
+
+# Four units for each of the 24 points of each player, then the checkers on
+# the bar and borne off of each player and two units for the player to move.
+INPUTS = 198
+_POINT_INPUTS = 2 * 24 * 4
+
+_MAGIC = b'PYGNET01'
+# The magic and the number of inputs, hidden units and outputs.
+_HEADER = struct.Struct('<8sIII')
+_HEADER_SIZE = 64
+
+def encode_keys(keys: Sequence[bytes]) -> np.ndarray:
+    """Encode positions given by Board.get_key without dice, seen by the
+    player who just moved, into rows of network inputs."""
+    checkers = np.frombuffer(b''.join(keys), dtype=np.uint8).reshape(
+        len(keys), 2, Board.BOARD_SIZE)
+    return encode_checkers(checkers)
+
+def encode_checkers(checkers: np.ndarray) -> np.ndarray:
+    """Encode positions of shape (positions, 2, Board.BOARD_SIZE), the
+    player who just moved first, into rows of network inputs. Each point
+    takes the TD-Gammon units: one checker, two, three and half of the rest.
+    """
+    points = checkers[:, :, Board.BAR_POS + 1:Board.BEARING_OFF_POS].astype(
+        np.float32)
+    inputs = np.zeros((len(checkers), INPUTS), dtype=np.float32)
+    units = inputs[:, :_POINT_INPUTS].reshape(len(checkers), 2, 24, 4)
+    units[..., 0] = 1 <= points
+    units[..., 1] = 2 <= points
+    units[..., 2] = 3 <= points
+    units[..., 3] = np.maximum(points - 3, 0) / 2
+    inputs[:, _POINT_INPUTS:_POINT_INPUTS + 2] = \
+        checkers[:, :, Board.BAR_POS] / 2
+    inputs[:, _POINT_INPUTS + 2:_POINT_INPUTS + 4] = \
+        checkers[:, :, Board.BEARING_OFF_POS] / 15
+    # The opponent is to move.
+    inputs[:, INPUTS - 1] = 1
+    return inputs
+
+def _sigmoid(values: np.ndarray) -> np.ndarray:
+    """Squash values into (0, 1)."""
+    return 1 / (1 + np.exp(-values))
+
+class Network:
+    """A network with one hidden layer of sigmoid units. Its output is the
+    probability that the player who just moved wins.
+    """
+
+    def __init__(self, hidden_weights: np.ndarray, hidden_biases: np.ndarray,
+                 output_weights: np.ndarray,
+                 output_biases: np.ndarray) -> None:
+        self.hidden_weights = hidden_weights
+        self.hidden_biases = hidden_biases
+        self.output_weights = output_weights
+        self.output_biases = output_biases
+
+    @staticmethod
+    def create(hidden: int = 40,
+               rng: Optional[np.random.Generator] = None) -> 'Network':
+        """Make a network with small random weights."""
+        if rng is None:
+            rng = np.random.default_rng()
+        return Network(
+            rng.uniform(-0.1, 0.1, (INPUTS, hidden)).astype(np.float32),
+            np.zeros(hidden, dtype=np.float32),
+            rng.uniform(-0.1, 0.1, (hidden, 1)).astype(np.float32),
+            np.zeros(1, dtype=np.float32))
+
+    @staticmethod
+    def load(path: str, writable: bool = False) -> 'Network':
+        """Load weights written by save. Unless writable, the file is
+        memory-mapped read-only, so processes share its pages."""
+        with open(path, 'rb') as network_file:
+            magic, inputs, hidden, outputs = _HEADER.unpack(
+                network_file.read(_HEADER.size))
+        if _MAGIC != magic or INPUTS != inputs:
+            raise ValueError('Not a network file: {}'.format(path))
+        weights = np.memmap(
+            path, dtype=np.float32, mode='r',
+            offset=_HEADER_SIZE) # type: np.ndarray
+        if writable:
+            weights = np.array(weights)
+        sizes = [inputs * hidden, hidden, hidden * outputs, outputs]
+        offsets = np.cumsum([0] + sizes)
+        return Network(
+            weights[offsets[0]:offsets[1]].reshape(inputs, hidden),
+            weights[offsets[1]:offsets[2]],
+            weights[offsets[2]:offsets[3]].reshape(hidden, outputs),
+            weights[offsets[3]:offsets[4]])
+
+    def save(self, path: str) -> None:
+        """Write the weights to a file."""
+        inputs, hidden = self.hidden_weights.shape
+        outputs = self.output_weights.shape[1]
+        with open(path, 'wb') as network_file:
+            network_file.write(_HEADER.pack(
+                _MAGIC, inputs, hidden, outputs).ljust(_HEADER_SIZE, b'\0'))
+            for weights in (self.hidden_weights, self.hidden_biases,
+                            self.output_weights, self.output_biases):
+                network_file.write(
+                    np.ascontiguousarray(weights, dtype=np.float32).tobytes())
+
+    def forward(self, inputs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the hidden units and the winning probability of each row of
+        inputs."""
+        hidden = _sigmoid(inputs @ self.hidden_weights + self.hidden_biases)
+        outputs = _sigmoid(hidden @ self.output_weights + self.output_biases)
+        return hidden, outputs[:, 0]
+
+    def evaluate(self, inputs: np.ndarray) -> np.ndarray:
+        """Get the winning probability of each row of inputs."""
+        return self.forward(inputs)[1]
+
+class NeuralPlayer(Player):
+    """Play the move reaching the position the network likes best. Never
+    doubles, and accepts doubles when it has a fair chance to win.
+    """
+
+    ACCEPT_THRESHOLD = 0.25
+
+    def __init__(self, network: Network) -> None:
+        self.network = network
+
+    def roll_or_double(self, _color: Color, _game: Game) -> Command:
+        """Roll."""
+        return RollCommand()
+
+    def choose_move(
+            self, board: Board, color: Color, dice: DICE) -> Optional[Move]:
+        """Score every position reachable with the dice at once and pick
+        the best, or None if there is no legal move."""
+        moves_with_keys = board.list_moves_with_keys(color, dice)
+        if 0 == len(moves_with_keys):
+            return None
+        if 1 == len(moves_with_keys):
+            return moves_with_keys[0][0]
+        scores = self.network.evaluate(
+            encode_keys([key for _, key in moves_with_keys]))
+        return moves_with_keys[int(np.argmax(scores))][0]
+
+    def make_move(self, color: Color, game: Game, dice: DICE) -> Move:
+        """Play the best move."""
+        move = self.choose_move(game.board, color, dice)
+        if move is None:
+            return Move([])
+        return move
+
+    def accept_or_resign(self, color: Color, game: Game) -> Command:
+        """Accept if the chance to win is good enough. The doubler is about
+        to roll, so the position is seen as by the player who just moved."""
+        keys = [game.board.get_key(
+            color.opposite(), [])] # type: List[bytes]
+        if NeuralPlayer.ACCEPT_THRESHOLD <= \
+                self.network.evaluate(encode_keys(keys))[0]:
+            return AcceptCommand()
+        return ResignCommand()
@@ -2,15 +2,25 @@
 
 from abc import ABCMeta
 from abc import abstractmethod
-import copy
+from collections import OrderedDict
 from enum import Enum
+from typing import Generator
+from typing import Iterator
 from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Set
+from typing import TextIO
+from typing import Tuple
+from typing import Union
 import random
 import sys
 
 import numpy as np
 
 DICE = List[int]
+CHECKERS_ARRAY = Union[np.ndarray, bytearray]
 
 class Error:
     """Represent errors."""
@@ -35,14 +45,43 @@ class Color(Enum):
 class Command:
     """Represents commands from players."""
 
-class Submove:
-    """Represent each movement in a move."""
+    __slots__ = () # type: Tuple[str, ...]
 
-    def __init__(self, source: int, die: int) -> None:
-        self.source = source
-        self.die = die
+# The fields of a Submove. index is its index in SUBMOVES, or -1 if it
+# isn't there, and end_pos is where the checker moves to.
+_SubmoveFields = NamedTuple('_SubmoveFields', [
+    ('source', int), ('die', int), ('index', int), ('end_pos', int)])
+
+class Submove(_SubmoveFields):
+    """Represent each movement in a move.
+    Submoves are immutable. Use Submove.get to share the instances in
+    SUBMOVES instead of making new ones.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, source: int, die: int) -> 'Submove':
+        index = -1
+        if (0 <= source < Board.BOARD_SIZE) and (1 <= die <= 6):
+            index = source * 6 + die - 1
+        end_pos = source + die
+        if Board.BEARING_OFF_POS < end_pos:
+            end_pos = Board.BEARING_OFF_POS
+        return super().__new__(cls, source, die, index, end_pos)
+
+    def __getnewargs__(self) -> Tuple[int, int]:
+        return (self.source, self.die)
+
+    @staticmethod
+    def get(source: int, die: int) -> 'Submove':
+        """Get the shared submove, or make one if the die is out of range."""
+        if (0 <= source < Board.BOARD_SIZE) and (1 <= die <= 6):
+            return SUBMOVES[source * 6 + die - 1]
+        return Submove(source, die)
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Submove):
             return False
         return self.source == other.source and self.die == other.die
@@ -50,37 +89,40 @@ class Submove:
     def __ne__(self, other: object) -> bool:
         return not self.__eq__(other)
 
+    def __hash__(self) -> int:
+        if 0 <= self.index:
+            return self.index
+        return hash((self.source, self.die))
+
     def __str__(self) -> str:
         return '{}/{}'.format(self.source, self.destination())
 
     def destination(self) -> int:
         """This is where the checker moves to."""
-        dst = self.source + self.die
-        if Board.BEARING_OFF_POS < dst:
-            dst = Board.BEARING_OFF_POS
-        return dst
+        return self.end_pos
 
 class Move(Command):
     """Represent a player's move.
-    The submoves are in reverse order.
+    The submoves are in reverse order. Moves hash by their submove indices,
+    so don't push or pop a move after using it as a key.
     """
 
-    def __init__(self, submoves: List[Submove]) -> None:
-        self.submoves = submoves
+    __slots__ = ('submoves',)
+
+    def __init__(self, submoves: Sequence[Submove]) -> None:
+        self.submoves = tuple(submoves)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Move):
             return False
-        if self.size() != other.size():
-            return False
-        for submove_index in range(0, self.size()):
-            if self.submoves[submove_index] != other.submoves[submove_index]:
-                return False
-        return True
+        return self.submoves == other.submoves
 
     def __ne__(self, other: object) -> bool:
         return not self.__eq__(other)
 
+    def __hash__(self) -> int:
+        return hash(self.submoves)
+
     def __str__(self) -> str:
         result = '['
         for submove in reversed(self.submoves):
@@ -94,11 +136,13 @@ class Move(Command):
 
     def push(self, submove: Submove) -> None:
         """Add a submove to the move."""
-        self.submoves.append(submove)
+        self.submoves += (submove,)
 
     def pop(self) -> Submove:
         """Get the next submove of this move and remove it."""
-        return self.submoves.pop()
+        submove = self.submoves[-1]
+        self.submoves = self.submoves[:-1]
+        return submove
 
 class RollCommand(Command):
     """Represent request to roll dice."""
@@ -127,17 +171,116 @@ class Player(metaclass=ABCMeta):
     def accept_or_resign(self, color: Color, game: 'Game') -> Command:
         """Accept or decline a doubling of stakes."""
 
+class MoveCache:
+    """Remember the legal moves of recently seen positions.
+    Positions are keyed from the point of view of the player to move, so
+    Black and White share the entries of mirrored positions. Once there are
+    more than max_size entries, the least recently used one is dropped.
+    """
+
+    def __init__(self, max_size: int = 100000) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict() # type: OrderedDict[bytes, List[Move]]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes) -> Optional[List[Move]]:
+        """Get the moves stored for key, or None if there aren't any."""
+        moves = self._entries.get(key)
+        if moves is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return moves
+
+    def put(self, key: bytes, moves: List[Move]) -> None:
+        """Store the moves for key."""
+        self._entries[key] = moves
+        self._entries.move_to_end(key)
+        while self.max_size < len(self._entries):
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+class Backend(Enum):
+    """Represents how Board stores the checkers of each color."""
+    # A NumPy array of ints.
+    NumPy = 0
+    # A bytearray. Reading and writing single points is several times
+    # faster than with NumPy.
+    ByteArray = 1
+
+class Feature:
+    """Indices of the features in Board.get_features. The features of the
+    player come first, then the same features of the opponent."""
+
+    Pips = 0
+    Blots = 1
+    MadePoints = 2
+    PrimeLength = 3
+    # The checkers on the bar or in the opponent's home board.
+    BackCheckers = 4
+    OpponentPips = 5
+    OpponentBlots = 6
+    OpponentMadePoints = 7
+    OpponentPrimeLength = 8
+    OpponentBackCheckers = 9
+    # 1 if the checkers can still hit each other, else 0 for a race.
+    Contact = 10
+    SIZE = 11
+
 class Board:
     """Represent the game state."""
 
     BOARD_SIZE = 26
     BAR_POS = 0
+    # The last point of the opponent's home board.
+    OPPONENT_HOME_POS = 6
     HOME_POS = 19
     BEARING_OFF_POS = 25
 
-    def __init__(self) -> None:
-        self.black_board = np.zeros(Board.BOARD_SIZE, dtype=int)
-        self.white_board = np.zeros(Board.BOARD_SIZE, dtype=int)
+    def __init__(
+            self, move_cache: Optional[MoveCache] = None,
+            backend: Backend = Backend.NumPy) -> None:
+        # If given, list_moves looks up and stores moves here.
+        self.move_cache = move_cache
+        self.backend = backend
+        self.black_board = Board._make_array(backend)
+        self.white_board = Board._make_array(backend)
+        # Zobrist hash of the checkers, kept up to date as they move.
+        self.position_hash = 0
+        # Summaries of each color's checkers, indexed by Color.value and
+        # kept up to date as they move: the furthest point from bearing off
+        # with checkers, the checkers outside of the home board, and the
+        # checkers on the bar and borne off.
+        self._back_pos = [Board.BEARING_OFF_POS] * 2
+        self._outside_checkers = [0] * 2
+        self._bar_checkers = [0] * 2
+        self._off_checkers = [0] * 2
+        # Evaluation features of each color kept up to date the same way:
+        # the pip count, the points with one checker, the points with more
+        # and a bitmask of them by position, and the checkers back.
+        self._pips = [0] * 2
+        self._blots = [0] * 2
+        self._made_points = [0] * 2
+        self._made_mask = [0] * 2
+        self._back_checkers = [0] * 2
+        self.recompute()
+
+    @staticmethod
+    def _make_array(backend: Backend) -> CHECKERS_ARRAY:
+        """Make an empty array of checkers for one color."""
+        if Backend.ByteArray == backend:
+            return bytearray(Board.BOARD_SIZE)
+        return np.zeros(Board.BOARD_SIZE, dtype=int)
 
     def setup(self) -> None:
         """Creates the starting board."""
@@ -148,8 +291,156 @@ class Board:
         for board_index in range(0, len(boards)):
             for pos in range(0, len(starting_checkers)):
                 boards[board_index][pos] = starting_checkers[pos]
+        self.recompute()
+
+    def recompute(self) -> None:
+        """Recompute the hash and the summaries from scratch.
+        Call this after writing to the boards directly.
+        """
+        position_hash = 0
+        for color in Color:
+            keys = ZOBRIST_KEYS[color.value]
+            board = self.get_board(color)
+            for pos in range(0, Board.BOARD_SIZE):
+                position_hash ^= keys[pos][board[pos]]
+            self._summarize(color)
+        self.position_hash = position_hash
+
+    def _summarize(self, color: Color) -> None:
+        """Recompute the summaries of the checkers of color."""
+        checkers = self._list_checkers(color)
+        color_index = color.value
+        self._back_pos[color_index] = Board._find_back_pos(
+            self.get_board(color), Board.BAR_POS)
+        self._outside_checkers[color_index] = sum(
+            checkers[Board.BAR_POS:Board.HOME_POS])
+        self._bar_checkers[color_index] = checkers[Board.BAR_POS]
+        self._off_checkers[color_index] = checkers[Board.BEARING_OFF_POS]
+        self._pips[color_index] = sum(
+            checkers[pos] * (Board.BEARING_OFF_POS - pos)
+            for pos in range(Board.BAR_POS, Board.BEARING_OFF_POS))
+        self._blots[color_index] = sum(
+            1 for pos in range(Board.BAR_POS + 1, Board.BEARING_OFF_POS)
+            if 1 == checkers[pos])
+        made_mask = 0
+        for pos in range(Board.BAR_POS + 1, Board.BEARING_OFF_POS):
+            if 1 < checkers[pos]:
+                made_mask |= 1 << pos
+        self._made_mask[color_index] = made_mask
+        self._made_points[color_index] = bin(made_mask).count('1')
+        self._back_checkers[color_index] = sum(
+            checkers[Board.BAR_POS:Board.OPPONENT_HOME_POS + 1])
 
-    def get_board(self, color: Color) -> np.ndarray:
+    @staticmethod
+    def _find_back_pos(board: CHECKERS_ARRAY, start_pos: int) -> int:
+        """Find the first point from start_pos on with checkers."""
+        for pos in range(start_pos, Board.BEARING_OFF_POS):
+            if 0 < board[pos]:
+                return pos
+        return Board.BEARING_OFF_POS
+
+    def get_back_pos(self, color: Color) -> int:
+        """Get the furthest point from bearing off with checkers of color.
+        This is the bearing off position if there are none."""
+        return self._back_pos[color.value]
+
+    def get_outside_checkers(self, color: Color) -> int:
+        """Get the number of checkers outside of the home board."""
+        return self._outside_checkers[color.value]
+
+    def get_bar_checkers(self, color: Color) -> int:
+        """Get the number of checkers on the bar."""
+        return self._bar_checkers[color.value]
+
+    def get_off_checkers(self, color: Color) -> int:
+        """Get the number of checkers borne off."""
+        return self._off_checkers[color.value]
+
+    def get_pips(self, color: Color) -> int:
+        """Get the pip count of the player."""
+        return self._pips[color.value]
+
+    def get_prime_length(self, color: Color) -> int:
+        """Get the most consecutive points made by the player."""
+        made_mask = self._made_mask[color.value]
+        length = 0
+        while made_mask:
+            made_mask &= made_mask << 1
+            length += 1
+        return length
+
+    def is_race(self) -> bool:
+        """Check if no checker can hit another anymore."""
+        # Black's furthest checker is ahead of White's in Black's view.
+        return Board.BEARING_OFF_POS <= \
+            self._back_pos[0] + self._back_pos[1]
+
+    def get_features(self, color: Color) -> List[int]:
+        """Get the features of the position from the player's point of
+        view, laid out as in Feature."""
+        color_index = color.value
+        other_index = 1 - color_index
+        return [
+            self._pips[color_index],
+            self._blots[color_index],
+            self._made_points[color_index],
+            self.get_prime_length(color),
+            self._back_checkers[color_index],
+            self._pips[other_index],
+            self._blots[other_index],
+            self._made_points[other_index],
+            self.get_prime_length(color.opposite()),
+            self._back_checkers[other_index],
+            0 if self.is_race() else 1,
+        ]
+
+    def get_hash(self, color: Color) -> int:
+        """Get the 64-bit hash of the position with color to move."""
+        if Color.White == color:
+            return self.position_hash ^ ZOBRIST_WHITE_TO_MOVE_KEY
+        return self.position_hash
+
+    def copy(self) -> 'Board':
+        """Make a copy of the board. The summaries and the hash are copied
+        rather than recomputed, so this skips __init__."""
+        board = Board.__new__(Board)
+        board.move_cache = self.move_cache
+        board.backend = self.backend
+        board.black_board = self.black_board.copy()
+        board.white_board = self.white_board.copy()
+        board.position_hash = self.position_hash
+        board._back_pos = self._back_pos[:]
+        board._outside_checkers = self._outside_checkers[:]
+        board._bar_checkers = self._bar_checkers[:]
+        board._off_checkers = self._off_checkers[:]
+        board._pips = self._pips[:]
+        board._blots = self._blots[:]
+        board._made_points = self._made_points[:]
+        board._made_mask = self._made_mask[:]
+        board._back_checkers = self._back_checkers[:]
+        return board
+
+    def key(self) -> bytes:
+        """Get a key that identifies the position of the checkers."""
+        return bytes(self._list_checkers(Color.Black)) + \
+            bytes(self._list_checkers(Color.White))
+
+    def get_key(self, color: Color, dice: DICE) -> bytes:
+        """Get a compact key for the position and the dice, seen from the
+        point of view of color."""
+        return bytes(self._list_checkers(color)) + \
+            bytes(self._list_checkers(color.opposite())) + \
+            bytes(sorted(dice[0:2]))
+
+    def _list_checkers(self, color: Color) -> Sequence[int]:
+        """Get the checkers of color in a sequence that is fast to index.
+        Don't change it, since it may be the board itself."""
+        board = self.get_board(color)
+        if isinstance(board, np.ndarray):
+            return board.tolist()
+        return board
+
+    def get_board(self, color: Color) -> CHECKERS_ARRAY:
         """Get a board reference."""
         if Color.Black == color:
             return self.black_board
@@ -161,12 +452,12 @@ class Board:
         """Get the position from the point of view of the other player."""
         return Board.BEARING_OFF_POS - pos
 
-    def get_checkers(self, color: Color, pos: int) -> bool:
+    def get_checkers(self, color: Color, pos: int) -> int:
         """Get the number of checkers of color."""
         board = self.get_board(color)
         return board[pos]
 
-    def get_opposite_checkers(self, color: Color, pos: int) -> bool:
+    def get_opposite_checkers(self, color: Color, pos: int) -> int:
         """Get the number of checkers of opposite color."""
         board = self.get_board(color.opposite())
         return board[self.get_opposite_pos(pos)]
@@ -174,13 +465,16 @@ class Board:
     def set_checkers(self, color: Color, pos: int, checkers: int) -> None:
         """Set the number of checkers."""
         board = self.get_board(color)
+        keys = ZOBRIST_KEYS[color.value][pos]
+        self.position_hash ^= keys[board[pos]] ^ keys[checkers]
         board[pos] = checkers
+        self._summarize(color)
 
     def set_opposite_checkers(
             self, color: Color, pos: int, checkers: int) -> None:
         """Set the number of opposite colored checkers."""
-        board = self.get_board(color.opposite())
-        board[self.get_opposite_pos(pos)] = checkers
+        self.set_checkers(
+            color.opposite(), self.get_opposite_pos(pos), checkers)
 
     def is_blocked(self, color: Color, pos: int) -> bool:
         """Check if the point is blocked by the opponent."""
@@ -190,13 +484,13 @@ class Board:
 
     def is_all_home(self, color: Color) -> bool:
         """Check if we can start bearing off."""
-        for pos in range(Board.BAR_POS, Board.HOME_POS):
-            if 0 < self.get_checkers(color, pos):
-                return False
-        return True
+        return 0 == self._outside_checkers[color.value]
 
     def is_highest_home_point(self, color: Color, test_pos: int) -> bool:
         """Check this is the furthest from bearing off among home points."""
+        back_pos = self._back_pos[color.value]
+        if Board.HOME_POS <= back_pos:
+            return test_pos <= back_pos
         for pos in range(Board.HOME_POS, test_pos):
             if 0 < self.get_checkers(color, pos):
                 return False
@@ -210,115 +504,524 @@ class Board:
         # Make sure the destination is not blocked.
         if self.is_blocked(color, submove.destination()):
             return False
+        color_index = color.value
         # Make sure the bar is empty or we're getting out the bar.
-        if (0 < self.get_checkers(color, Board.BAR_POS)) and \
+        if (0 < self._bar_checkers[color_index]) and \
                 (Board.BAR_POS != submove.source):
             return False
         # We're bearing off a checker.
         if Board.BEARING_OFF_POS == submove.destination():
             # Make sure everyone is home.
-            if not self.is_all_home(color):
+            if 0 < self._outside_checkers[color_index]:
                 return False
             # If there's no checker on the point rolled, make sure we're
             # bearing off from the highest point.
             if (submove.source + submove.die != Board.BEARING_OFF_POS) and \
-                    (not self.is_highest_home_point(color, submove.source)):
+                    (self._back_pos[color_index] < submove.source):
                 return False
         return True
 
-    def do_submove(self, color: Color, submove: Submove) -> None:
-        """Move checkers according to the submove."""
-        board = self.get_board(color)
+    def do_submove(self, color: Color, submove: Submove) -> bool:
+        """Move checkers according to the submove.
+        Return whether a blot was hit. This is the undo record that
+        undo_submove needs to take the submove back.
+        """
+        if Color.Black == color:
+            color_index = 0
+            board = self.black_board
+            other_board = self.white_board
+        else:
+            color_index = 1
+            board = self.white_board
+            other_board = self.black_board
+        keys = ZOBRIST_KEYS[color_index]
         # Move the checker
+        source = submove.source
         destination = submove.destination()
-        board[submove.source] -= 1
-        board[destination] += 1
+        source_checkers = int(board[source])
+        board[source] = source_checkers - 1
+        position_hash = self.position_hash ^ \
+            keys[source][source_checkers] ^ keys[source][source_checkers - 1]
+        checkers = int(board[destination])
+        board[destination] = checkers + 1
+        position_hash ^= \
+            keys[destination][checkers] ^ keys[destination][checkers + 1]
+        # Update the summaries.
+        if source < Board.HOME_POS:
+            self._outside_checkers[color_index] -= 1
+            if Board.BAR_POS == source:
+                self._bar_checkers[color_index] -= 1
+        if destination < Board.HOME_POS:
+            self._outside_checkers[color_index] += 1
+        elif Board.BEARING_OFF_POS == destination:
+            self._off_checkers[color_index] += 1
+        if (1 == source_checkers) and \
+                (source == self._back_pos[color_index]):
+            self._back_pos[color_index] = Board._find_back_pos(
+                board, source + 1)
+        # Update the features.
+        self._pips[color_index] -= destination - source
+        if Board.BAR_POS != source:
+            if 1 == source_checkers:
+                self._blots[color_index] -= 1
+            elif 2 == source_checkers:
+                self._blots[color_index] += 1
+                self._made_points[color_index] -= 1
+                self._made_mask[color_index] &= ~(1 << source)
+        if Board.BEARING_OFF_POS != destination:
+            if 0 == checkers:
+                self._blots[color_index] += 1
+            elif 1 == checkers:
+                self._blots[color_index] -= 1
+                self._made_points[color_index] += 1
+                self._made_mask[color_index] |= 1 << destination
+        if source <= Board.OPPONENT_HOME_POS:
+            self._back_checkers[color_index] -= 1
+        if destination <= Board.OPPONENT_HOME_POS:
+            self._back_checkers[color_index] += 1
         # If we're hitting a blot, send it to the bar.
         # But don't hit anything in the opponent's bar.
-        if (Board.BEARING_OFF_POS != destination) and \
-                (1 == self.get_opposite_checkers(color, destination)):
-            other_board = self.get_board(color.opposite())
-            other_board[Board.BAR_POS] += 1
-            other_board[Board.get_opposite_pos(destination)] = 0
+        opposite_destination = Board.BEARING_OFF_POS - destination
+        did_hit = (Board.BEARING_OFF_POS != destination) and \
+            (1 == other_board[opposite_destination])
+        if did_hit:
+            other_index = 1 - color_index
+            other_keys = ZOBRIST_KEYS[other_index]
+            checkers = int(other_board[Board.BAR_POS])
+            other_board[Board.BAR_POS] = checkers + 1
+            other_board[opposite_destination] = 0
+            position_hash ^= other_keys[Board.BAR_POS][checkers] ^ \
+                other_keys[Board.BAR_POS][checkers + 1] ^ \
+                other_keys[opposite_destination][1] ^ \
+                other_keys[opposite_destination][0]
+            self._bar_checkers[other_index] += 1
+            self._back_pos[other_index] = Board.BAR_POS
+            if Board.HOME_POS <= opposite_destination:
+                self._outside_checkers[other_index] += 1
+            self._pips[other_index] += opposite_destination
+            self._blots[other_index] -= 1
+            if Board.OPPONENT_HOME_POS < opposite_destination:
+                self._back_checkers[other_index] += 1
+        self.position_hash = position_hash
+        return did_hit
+
+    def undo_submove(
+            self, color: Color, submove: Submove, did_hit: bool) -> None:
+        """Take back a submove played by do_submove."""
+        if Color.Black == color:
+            color_index = 0
+            board = self.black_board
+            other_board = self.white_board
+        else:
+            color_index = 1
+            board = self.white_board
+            other_board = self.black_board
+        keys = ZOBRIST_KEYS[color_index]
+        source = submove.source
+        destination = submove.destination()
+        destination_checkers = int(board[destination])
+        board[destination] = destination_checkers - 1
+        position_hash = self.position_hash ^ \
+            keys[destination][destination_checkers] ^ \
+            keys[destination][destination_checkers - 1]
+        checkers = int(board[source])
+        board[source] = checkers + 1
+        position_hash ^= keys[source][checkers] ^ keys[source][checkers + 1]
+        # Update the summaries.
+        if source < Board.HOME_POS:
+            self._outside_checkers[color_index] += 1
+            if Board.BAR_POS == source:
+                self._bar_checkers[color_index] += 1
+        if destination < Board.HOME_POS:
+            self._outside_checkers[color_index] -= 1
+        elif Board.BEARING_OFF_POS == destination:
+            self._off_checkers[color_index] -= 1
+        if source < self._back_pos[color_index]:
+            self._back_pos[color_index] = source
+        # Update the features.
+        self._pips[color_index] += destination - source
+        if Board.BAR_POS != source:
+            if 0 == checkers:
+                self._blots[color_index] += 1
+            elif 1 == checkers:
+                self._blots[color_index] -= 1
+                self._made_points[color_index] += 1
+                self._made_mask[color_index] |= 1 << source
+        if Board.BEARING_OFF_POS != destination:
+            if 1 == destination_checkers:
+                self._blots[color_index] -= 1
+            elif 2 == destination_checkers:
+                self._blots[color_index] += 1
+                self._made_points[color_index] -= 1
+                self._made_mask[color_index] &= ~(1 << destination)
+        if source <= Board.OPPONENT_HOME_POS:
+            self._back_checkers[color_index] += 1
+        if destination <= Board.OPPONENT_HOME_POS:
+            self._back_checkers[color_index] -= 1
+        # Bring the blot we hit back from the bar.
+        if did_hit:
+            other_index = 1 - color_index
+            other_keys = ZOBRIST_KEYS[other_index]
+            opposite_destination = Board.BEARING_OFF_POS - destination
+            checkers = int(other_board[Board.BAR_POS])
+            other_board[Board.BAR_POS] = checkers - 1
+            other_board[opposite_destination] = 1
+            position_hash ^= other_keys[Board.BAR_POS][checkers] ^ \
+                other_keys[Board.BAR_POS][checkers - 1] ^ \
+                other_keys[opposite_destination][0] ^ \
+                other_keys[opposite_destination][1]
+            self._bar_checkers[other_index] -= 1
+            if Board.HOME_POS <= opposite_destination:
+                self._outside_checkers[other_index] -= 1
+            self._pips[other_index] -= opposite_destination
+            self._blots[other_index] += 1
+            if Board.OPPONENT_HOME_POS < opposite_destination:
+                self._back_checkers[other_index] -= 1
+            if 1 == checkers:
+                self._back_pos[other_index] = Board._find_back_pos(
+                    other_board, Board.BAR_POS + 1)
+        self.position_hash = position_hash
 
     def list_submoves(self, color: Color, die: int) -> List[Submove]:
-        """List legal submoves given the die roll."""
+        """List legal submoves given the die roll.
+        This applies the rules of is_valid_submove to every point at once.
+        """
         submoves = [] # type: List[Submove]
-        for pos in range(Board.BAR_POS, Board.BEARING_OFF_POS):
-            submove = Submove(pos, die)
-            if self.is_valid_submove(color, submove):
-                submoves.append(submove)
+        if Color.Black == color:
+            color_index = 0
+        else:
+            color_index = 1
+        checkers = self._list_checkers(color)
+        opposite_checkers = self._list_checkers(color.opposite())
+        # Only checkers on the bar can move while the bar is not empty.
+        if 0 < self._bar_checkers[color_index]:
+            sources = [Board.BAR_POS] # type: Sequence[int]
+        else:
+            sources = range(Board.BAR_POS + 1, Board.BEARING_OFF_POS)
+        is_all_home = 0 == self._outside_checkers[color_index]
+        back_pos = self._back_pos[color_index]
+        for pos in sources:
+            # Make sure there is a checker to move.
+            if checkers[pos] < 1:
+                continue
+            destination = pos + die
+            if destination < Board.BEARING_OFF_POS:
+                # Make sure the destination is not blocked.
+                if 1 < opposite_checkers[Board.BEARING_OFF_POS - destination]:
+                    continue
+            # We're bearing off a checker. Make sure everyone is home, and
+            # if there's no checker on the point rolled, make sure we're
+            # bearing off from the highest point.
+            elif (not is_all_home) or \
+                    ((Board.BEARING_OFF_POS < destination) and
+                     (back_pos < pos)):
+                continue
+            submoves.append(SUBMOVES[pos * 6 + die - 1])
         return submoves
 
     def list_moves_with_ordered_dice_r(
-            self, color: Color, dice: DICE) -> List[Move]:
+            self, color: Color, dice: DICE,
+            canonical: bool = True) -> List[Move]:
         """List moves using the given order of dice. The moves are not always
-        legal."""
-        result = [] # type: List[Move]
+        legal. If canonical, submoves with the same die are listed in one
+        order only. The moves come in the same order as from _iter_moves_r,
+        but are found on a plain list of the checkers of color, without the
+        hash and summaries do_submove keeps up to date."""
+        moves = [] # type: List[Move]
         if 0 == len(dice):
-            return result
-        die = dice[0]
-        rest = dice[1:]
-        submoves = self.list_submoves(color, die)
-        for submove in submoves:
-            board = copy.deepcopy(self)
-            board.do_submove(color, submove)
-            moves = board.list_moves_with_ordered_dice_r(color, rest)
-            # We didn't find any moves. Create an empty move to add submoves.
-            if 0 == len(moves):
-                moves.append(Move([]))
-            for move in moves:
-                move.push(submove)
-            result += moves
-        return result
-
-    def list_moves(self, color: Color, dice: DICE) -> List[Move]:
-        """List legal moves."""
-        # We rolled a double.
+            return moves
+        opposite_checkers = self._list_checkers(color.opposite())
+        # Hitting a blot leaves its point open, so which points are open
+        # doesn't change while moving.
+        is_open = [True] * (Board.BEARING_OFF_POS + 1)
+        for pos in range(Board.BAR_POS + 1, Board.BEARING_OFF_POS):
+            is_open[pos] = \
+                opposite_checkers[Board.BEARING_OFF_POS - pos] < 2
+        self._list_moves_r(
+            list(self._list_checkers(color)), is_open,
+            self._outside_checkers[color.value], dice, 0, [], canonical,
+            moves)
+        return moves
+
+    def _list_moves_r(
+            self, checkers: List[int], is_open: List[bool], outside: int,
+            dice: DICE, die_index: int, submoves: List[Submove],
+            canonical: bool, moves: List[Move]) -> bool:
+        """Add to moves every way to continue the submoves played so far on
+        checkers with the dice from die_index on, like _iter_moves_r.
+        checkers is changed and restored, and outside is how many of them
+        are outside of the home board. Return whether any submove was
+        legal."""
+        die = dice[die_index]
+        if 0 < checkers[Board.BAR_POS]:
+            sources = [Board.BAR_POS] # type: Sequence[int]
+        else:
+            sources = range(Board.BAR_POS + 1, Board.BEARING_OFF_POS)
+        is_last_die = len(dice) <= die_index + 1
+        previous = submoves[-1] if canonical and submoves else None
+        # The submoves of a move are in reverse order.
+        reversed_submoves = tuple(submoves[::-1])
+        has_submove = False
+        for pos in sources:
+            # The rules of list_submoves.
+            if 0 == checkers[pos]:
+                continue
+            destination = pos + die
+            if destination < Board.BEARING_OFF_POS:
+                if not is_open[destination]:
+                    continue
+            elif (0 < outside) or \
+                    ((Board.BEARING_OFF_POS < destination) and
+                     any(checkers[Board.HOME_POS:pos])):
+                continue
+            has_submove = True
+            if (previous is not None) and (die == previous.die) and \
+                    (pos < previous.source):
+                continue
+            submove = SUBMOVES[pos * 6 + die - 1]
+            if is_last_die:
+                # The move ends here, so there's no need to play it.
+                moves.append(Move((submove,) + reversed_submoves))
+                continue
+            end_pos = submove.end_pos
+            checkers[pos] -= 1
+            checkers[end_pos] += 1
+            submoves.append(submove)
+            if not self._list_moves_r(
+                    checkers, is_open,
+                    outside - (pos < Board.HOME_POS) +
+                    (end_pos < Board.HOME_POS),
+                    dice, die_index + 1, submoves, canonical, moves):
+                moves.append(Move((submove,) + reversed_submoves))
+            submoves.pop()
+            checkers[pos] += 1
+            checkers[end_pos] -= 1
+        return has_submove
+
+    def _iter_moves_r(
+            self, color: Color, dice: DICE, die_index: int,
+            submoves: List[Submove],
+            canonical: bool) -> Generator[Move, None, bool]:
+        """Yield every way to continue the submoves played so far with the
+        dice from die_index on. Return whether any submove was legal."""
+        die = dice[die_index]
+        legal_submoves = self.list_submoves(color, die)
+        for submove in legal_submoves:
+            # After a submove with the same die, only move checkers from the
+            # same point or further forward. Playing the same submoves from
+            # back to front is always legal and reaches the same position,
+            # so the other orders would only repeat work.
+            if canonical and (0 < len(submoves)) and \
+                    (die == submoves[-1].die) and \
+                    (submove.source < submoves[-1].source):
+                continue
+            did_hit = self.do_submove(color, submove)
+            submoves.append(submove)
+            try:
+                can_continue = False
+                if die_index + 1 < len(dice):
+                    can_continue = yield from self._iter_moves_r(
+                        color, dice, die_index + 1, submoves, canonical)
+                # We couldn't continue, so the move ends here. If we only
+                # skipped submoves, another order of them ends elsewhere.
+                if not can_continue:
+                    yield Move(submoves[::-1])
+            finally:
+                # Also restore the board when the generator is closed early.
+                submoves.pop()
+                self.undo_submove(color, submove, did_hit)
+        return 0 < len(legal_submoves)
+
+    def iter_moves(
+            self, color: Color, dice: DICE) -> Generator[Move, None, None]:
+        """Yield legal moves lazily, in the same order as list_moves.
+        While the generator is suspended, the board is in the position the
+        move yielded reaches. It is restored when the generator is exhausted
+        or closed, so don't change it meanwhile.
+        """
+        # When we roll a double, the order doesn't matter.
         if dice[0] == dice[1]:
-            # When we roll a double, the order doesn't matter.
-            return self.list_moves_with_ordered_dice_r(color, [dice[0]] * 4)
-        # We didn't roll a double.
+            yield from self._iter_moves_r(
+                color, [dice[0]] * 4, 0, [], True)
+            return
         high_roll = max(dice)
         low_roll = min(dice)
-        high_moves = self.list_moves_with_ordered_dice_r(
-            color, [high_roll, low_roll])
-        low_moves = self.list_moves_with_ordered_dice_r(
-            color, [low_roll, high_roll])
-        both_dice_moves = []
         can_play_both_dice = False
-
-        for move in high_moves:
-            if 2 == move.size():
-                can_play_both_dice = True
-                both_dice_moves.append(move)
-
-        for move in low_moves:
-            if 2 == move.size():
-                can_play_both_dice = True
-                both_dice_moves.append(move)
-
+        for ordered_dice in ([high_roll, low_roll], [low_roll, high_roll]):
+            for move in self._iter_moves_r(
+                    color, ordered_dice, 0, [], True):
+                if 2 == move.size():
+                    can_play_both_dice = True
+                    yield move
         # Make sure we use all possible dice.
         if can_play_both_dice:
-            return both_dice_moves
-
+            return
         # Make sure we play the highest possible die.
-        if 0 < len(high_moves):
-            return high_moves
-        return low_moves
+        for die in (high_roll, low_roll):
+            submoves = self.list_submoves(color, die)
+            if 0 < len(submoves):
+                for submove in submoves:
+                    did_hit = self.do_submove(color, submove)
+                    try:
+                        yield Move([submove])
+                    finally:
+                        self.undo_submove(color, submove, did_hit)
+                return
 
-    def is_valid_move(self, color: Color, dice: DICE, move: Move) -> bool:
-        """Check if the move is legal."""
-        moves = self.list_moves(color, dice)
-        for legal_move in moves:
-            if legal_move == move:
+    def has_legal_move(self, color: Color, dice: DICE) -> bool:
+        """Check if there is any legal move, without listing them."""
+        for die in set(dice[0:2]):
+            if self._can_move(color, die):
                 return True
         return False
 
-    def do_move(self, color: Color, move: Move) -> None:
-        """Play a move."""
-        for submove in reversed(move.submoves):
-            self.do_submove(color, submove)
+    def list_moves(self, color: Color, dice: DICE) -> List[Move]:
+        """List legal moves."""
+        if self.move_cache is None:
+            return self._list_moves(color, dice)
+        key = self.get_key(color, dice)
+        moves = self.move_cache.get(key)
+        if moves is None:
+            moves = self._list_moves(color, dice)
+            self.move_cache.put(key, moves)
+        # Callers may push and pop, so don't hand out the cached moves.
+        return [Move(move.submoves) for move in moves]
+
+    def _list_moves(self, color: Color, dice: DICE) -> List[Move]:
+        """List legal moves without using the cache, in the same order as
+        iter_moves but without moving the checkers of the board."""
+        # When we roll a double, the order doesn't matter.
+        if dice[0] == dice[1]:
+            return self.list_moves_with_ordered_dice_r(color, [dice[0]] * 4)
+        high_roll = max(dice)
+        low_roll = min(dice)
+        moves = [move
+                 for ordered_dice in ([high_roll, low_roll],
+                                      [low_roll, high_roll])
+                 for move in self.list_moves_with_ordered_dice_r(
+                     color, ordered_dice)
+                 if 2 == move.size()]
+        # Make sure we use all possible dice.
+        if 0 < len(moves):
+            return moves
+        # Make sure we play the highest possible die.
+        for die in (high_roll, low_roll):
+            submoves = self.list_submoves(color, die)
+            if 0 < len(submoves):
+                return [Move([submove]) for submove in submoves]
+        return moves
+
+    def _iter_unique_moves(self, color: Color, dice: DICE) -> Iterator[Move]:
+        """Yield one legal move for each distinct resulting position.
+        The board is left in the resulting position until the next move is
+        requested.
+        """
+        hashes = set() # type: Set[int]
+        for move in self.iter_moves(color, dice):
+            if self.position_hash not in hashes:
+                hashes.add(self.position_hash)
+                yield move
+
+    def list_unique_moves(self, color: Color, dice: DICE) -> List[Move]:
+        """List legal moves, keeping the first move listed for each distinct
+        resulting position."""
+        return list(self._iter_unique_moves(color, dice))
+
+    def list_moves_with_positions(
+            self, color: Color, dice: DICE) -> List[Tuple[Move, 'Board']]:
+        """List unique legal moves along with the positions they reach."""
+        return [(move, self.copy())
+                for move in self._iter_unique_moves(color, dice)]
+
+    def list_moves_with_keys(
+            self, color: Color, dice: DICE) -> List[Tuple[Move, bytes]]:
+        """List unique legal moves along with the keys of the positions they
+        reach, seen by color as in get_key but without dice. This is much
+        cheaper than copying every position."""
+        return [(move, self.get_key(color, []))
+                for move in self._iter_unique_moves(color, dice)]
+
+    def list_moves_with_features(
+            self, color: Color,
+            dice: DICE) -> List[Tuple[Move, bytes, List[int]]]:
+        """List unique legal moves along with the keys and the features of
+        the positions they reach, both seen by color."""
+        return [(move, self.get_key(color, []), self.get_features(color))
+                for move in self._iter_unique_moves(color, dice)]
+
+    def _can_move(self, color: Color, die: int) -> bool:
+        """Check if any checker can move with the die."""
+        return 0 < len(self.list_submoves(color, die))
+
+    def _can_play_both_dice(self, color: Color, high: int, low: int) -> bool:
+        """Check if some move uses both dice of a roll that isn't a double."""
+        for first_die, second_die in ((high, low), (low, high)):
+            for submove in self.list_submoves(color, first_die):
+                did_hit = self.do_submove(color, submove)
+                can_move = self._can_move(color, second_die)
+                self.undo_submove(color, submove, did_hit)
+                if can_move:
+                    return True
+        return False
+
+    def is_valid_move(self, color: Color, dice: DICE, move: Move) -> bool:
+        """Check if the move is legal.
+        This agrees with list_moves without listing every move. We play the
+        submoves one by one and then look for a move using more dice, or the
+        higher die, stopping at the first one we find.
+        """
+        high = max(dice[0:2])
+        low = min(dice[0:2])
+        submoves = list(reversed(move.submoves))
+        move_dice = [submove.die for submove in submoves]
+        # Make sure the submoves use the dice we rolled.
+        if high == low:
+            if not 0 < len(move_dice) <= 4 or \
+                    any(high != die for die in move_dice):
+                return False
+        elif 2 == len(move_dice):
+            if sorted(move_dice) != [low, high]:
+                return False
+        elif (1 != len(move_dice)) or (move_dice[0] not in (low, high)):
+            return False
+        # Play the submoves, making sure each is legal.
+        did_hits = [] # type: List[bool]
+        is_valid = True
+        for submove in submoves:
+            if (submove.source < Board.BAR_POS) or \
+                    (Board.BEARING_OFF_POS <= submove.source) or \
+                    (not self.is_valid_submove(color, submove)):
+                is_valid = False
+                break
+            did_hits.append(self.do_submove(color, submove))
+        # A double has to be played until the checkers are stuck.
+        if is_valid and (high == low) and (len(submoves) < 4):
+            is_valid = not self._can_move(color, high)
+        for submove_index in range(len(did_hits) - 1, -1, -1):
+            self.undo_submove(
+                color, submoves[submove_index], did_hits[submove_index])
+        if (not is_valid) or (high == low) or (2 == len(submoves)):
+            return is_valid
+        # Make sure we use both dice when possible.
+        if self._can_play_both_dice(color, high, low):
+            return False
+        # Make sure we play the higher die when possible.
+        return (high == move_dice[0]) or (not self._can_move(color, high))
+
+    def do_move(self, color: Color, move: Move) -> List[bool]:
+        """Play a move.
+        Return the undo records of the submoves in the order they were played.
+        """
+        return [self.do_submove(color, submove)
+                for submove in reversed(move.submoves)]
+
+    def undo_move(
+            self, color: Color, move: Move, did_hits: List[bool]) -> None:
+        """Take back a move played by do_move."""
+        # The submoves are stored in reverse order, so this undoes the last
+        # played submove first.
+        for submove, did_hit in zip(move.submoves, reversed(did_hits)):
+            self.undo_submove(color, submove, did_hit)
 
     def is_gammon(self, color: Color) -> bool:
         """Check if the player won a gammon."""
@@ -337,55 +1040,74 @@ class Board:
         """Check if the player won the game."""
         return 15 <= self.get_checkers(color, Board.BEARING_OFF_POS)
 
-    def _print_checkers(self, pos: int) -> None:
+    def _print_checkers(self, pos: int, stream: TextIO) -> None:
         """Print a point from Black's point of view."""
         black_checkers = self.get_checkers(Color.Black, pos)
         white_checkers = self.get_opposite_checkers(Color.Black, pos)
         if 0 < black_checkers:
-            sys.stdout.write(' B{:<2}'.format(black_checkers))
+            stream.write(' B{:<2}'.format(black_checkers))
         elif 0 < white_checkers:
-            sys.stdout.write(' W{:<2}'.format(white_checkers))
+            stream.write(' W{:<2}'.format(white_checkers))
         else:
-            sys.stdout.write(' __ ')
+            stream.write(' __ ')
 
-    def print(self) -> None:
-        """Print the board."""
+    def print(self, stream: Optional[TextIO] = None) -> None:
+        """Print the board to the stream, or to stdout by default."""
+        if stream is None:
+            stream = sys.stdout
         for pos in range(13, 19):
-            sys.stdout.write(' {:>2} '.format(pos))
-        sys.stdout.write('    ')
+            stream.write(' {:>2} '.format(pos))
+        stream.write('    ')
         for pos in range(19, 25):
-            sys.stdout.write(' {:>2} '.format(pos))
-        sys.stdout.write('    ')
-        sys.stdout.write('Black bar: {}'.format(self.get_checkers(
+            stream.write(' {:>2} '.format(pos))
+        stream.write('    ')
+        stream.write('Black bar: {}'.format(self.get_checkers(
             Color.Black, Board.BAR_POS)))
-        sys.stdout.write('\n')
+        stream.write('\n')
         for pos in range(13, 19):
-            self._print_checkers(pos)
-        sys.stdout.write('    ')
+            self._print_checkers(pos, stream)
+        stream.write('    ')
         for pos in range(19, 25):
-            self._print_checkers(pos)
-        sys.stdout.write('    ')
-        sys.stdout.write('Black off: {}'.format(self.get_checkers(
+            self._print_checkers(pos, stream)
+        stream.write('    ')
+        stream.write('Black off: {}'.format(self.get_checkers(
             Color.Black, Board.BEARING_OFF_POS)))
-        sys.stdout.write('\n')
+        stream.write('\n')
         for pos in range(12, 6, -1):
-            self._print_checkers(pos)
-        sys.stdout.write('    ')
+            self._print_checkers(pos, stream)
+        stream.write('    ')
         for pos in range(6, 0, -1):
-            self._print_checkers(pos)
-        sys.stdout.write('    ')
-        sys.stdout.write('White bar: {}'.format(self.get_checkers(
+            self._print_checkers(pos, stream)
+        stream.write('    ')
+        stream.write('White bar: {}'.format(self.get_checkers(
             Color.White, Board.BAR_POS)))
-        sys.stdout.write('\n')
+        stream.write('\n')
         for pos in range(12, 6, -1):
-            sys.stdout.write(' {:>2} '.format(pos))
-        sys.stdout.write('    ')
+            stream.write(' {:>2} '.format(pos))
+        stream.write('    ')
         for pos in range(6, 0, -1):
-            sys.stdout.write(' {:>2} '.format(pos))
-        sys.stdout.write('    ')
-        sys.stdout.write('White off: {}'.format(self.get_checkers(
+            stream.write(' {:>2} '.format(pos))
+        stream.write('    ')
+        stream.write('White off: {}'.format(self.get_checkers(
             Color.White, Board.BEARING_OFF_POS)))
-        sys.stdout.write('\n')
+        stream.write('\n')
+
+# Every submove with a die from 1 to 6, indexed by Submove.index.
+SUBMOVES = [Submove(source, die)
+            for source in range(0, Board.BOARD_SIZE)
+            for die in range(1, 7)]
+
+# A player has at most this many checkers on a point.
+MAX_CHECKERS = 15
+
+# Random keys for Zobrist hashing, indexed by color, position and the number
+# of checkers there. The seed is fixed so that hashes agree across processes.
+_ZOBRIST_RANDOM = random.Random(0)
+ZOBRIST_KEYS = [
+    [[_ZOBRIST_RANDOM.getrandbits(64) for _ in range(0, MAX_CHECKERS + 1)]
+     for _ in range(0, Board.BOARD_SIZE)]
+    for _ in Color]
+ZOBRIST_WHITE_TO_MOVE_KEY = _ZOBRIST_RANDOM.getrandbits(64)
 
 class Cube(Enum):
     """Represents the doubling cube."""
@@ -393,21 +1115,213 @@ class Cube(Enum):
     Black = 1
     White = 2
 
+class Forfeit(Enum):
+    """Represent the reasons for forfeiting."""
+    IllegalMove = 0
+    IllegalResponse = 1
+    IllegalCommand = 2
+
+class Observer:
+    """Receive the events of a game. Every method does nothing, so subclasses
+    override the events they want. The game is not finished changing when an
+    event is sent, so keep what is needed rather than the game itself.
+    """
+
+    def on_turn_started(self, game: 'Game', color: Color) -> None:
+        """The player is about to roll or double."""
+
+    def on_dice_rolled(self, game: 'Game', color: Color, dice: DICE) -> None:
+        """The player rolled the dice."""
+
+    def on_move_played(
+            self, game: 'Game', color: Color, dice: DICE, move: Move) -> None:
+        """The player played a legal move."""
+
+    def on_no_legal_moves(self, game: 'Game', color: Color) -> None:
+        """The player has no legal move with the dice rolled."""
+
+    def on_cube_offered(self, game: 'Game', color: Color) -> None:
+        """The player offered to double the stakes."""
+
+    def on_cube_accepted(self, game: 'Game', color: Color) -> None:
+        """The player accepted the doubling cube."""
+
+    def on_resigned(self, game: 'Game', color: Color) -> None:
+        """The player resigned instead of accepting the cube."""
+
+    def on_forfeited(
+            self, game: 'Game', color: Color, reason: Forfeit) -> None:
+        """The player forfeited the match."""
+
+    def on_game_over(self, game: 'Game', winner: Color, score: int) -> None:
+        """The round was won for the score, after updating the scores."""
+
+    def on_game_aborted(self, game: 'Game') -> None:
+        """The round ended without a winner."""
+
+    def on_match_over(self, game: 'Game', winner: Color) -> None:
+        """The player won the match."""
+
+class ConsoleObserver(Observer):
+    """Write a game as text to a stream, or to stdout by default."""
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        self.stream = stream
+
+    def _get_stream(self) -> TextIO:
+        """Get the stream, looking up stdout late so it can be redirected."""
+        if self.stream is None:
+            return sys.stdout
+        return self.stream
+
+    def on_turn_started(self, game: 'Game', color: Color) -> None:
+        game.board.print(self._get_stream())
+
+    def on_dice_rolled(self, game: 'Game', color: Color, dice: DICE) -> None:
+        self._get_stream().write('Rolled {}-{}\n'.format(dice[0], dice[1]))
+
+    def on_no_legal_moves(self, game: 'Game', color: Color) -> None:
+        self._get_stream().write('No legal moves.\n')
+
+    def on_cube_accepted(self, game: 'Game', color: Color) -> None:
+        self._get_stream().write('Doubling cube accepted.\n')
+
+    def on_resigned(self, game: 'Game', color: Color) -> None:
+        self._get_stream().write('{} resigns.\n'.format(color))
+
+    def on_forfeited(
+            self, game: 'Game', color: Color, reason: Forfeit) -> None:
+        if Forfeit.IllegalMove == reason:
+            message = 'Illegal move. '
+        elif Forfeit.IllegalResponse == reason:
+            message = 'Illegal respoonse. '
+        else:
+            message = 'Illegal command. '
+        self._get_stream().write(
+            message + '{} forfeits match.\n'.format(color))
+
+    def on_game_over(self, game: 'Game', winner: Color, score: int) -> None:
+        # Resigning and forfeiting have been written already.
+        if game.board.is_winner(winner):
+            self._get_stream().write('{} wins!\n'.format(winner))
+
+    def on_game_aborted(self, game: 'Game') -> None:
+        self._get_stream().write('Something went wrong.\n')
+
+    def on_match_over(self, game: 'Game', winner: Color) -> None:
+        self._get_stream().write('{} wins the match!\n'.format(winner))
+
+class DiceSource(metaclass=ABCMeta):
+    """Roll the dice of a game."""
+
+    @abstractmethod
+    def roll(self) -> DICE:
+        """Roll two dice."""
+
+class RandomDice(DiceSource):
+    """Roll dice from a NumPy generator, rolling a block of them at a time."""
+
+    BLOCK_SIZE = 1024
+
+    def __init__(self, rng: Optional[np.random.Generator] = None) -> None:
+        self.rng = np.random.default_rng() if rng is None else rng
+        self._block = [] # type: List[DICE]
+        self._block_index = 0
+
+    def roll(self) -> DICE:
+        if len(self._block) <= self._block_index:
+            self._block = self.rng.integers(
+                1, 7, size=(RandomDice.BLOCK_SIZE, 2)).tolist()
+            self._block_index = 0
+        dice = self._block[self._block_index]
+        self._block_index += 1
+        return dice
+
+class ReplayDice(DiceSource):
+    """Roll the dice of a recorded sequence."""
+
+    def __init__(self, rolls: Sequence[DICE]) -> None:
+        self.rolls = rolls
+        self._roll_index = 0
+
+    def roll(self) -> DICE:
+        if len(self.rolls) <= self._roll_index:
+            raise IndexError('No more dice to replay.')
+        dice = list(self.rolls[self._roll_index])
+        self._roll_index += 1
+        return dice
+
 class Game:
     """Represent a game of Backgammon."""
 
     WIN_SCORE = 3
 
-    def __init__(self, board: Board) -> None:
+    def __init__(
+            self, board: Board, observer: Optional[Observer] = None,
+            dice: Optional[DiceSource] = None) -> None:
         self.stakes = 1
         self.cube = Cube.Centered
         self.black_score = 0
         self.white_score = 0
         self.board = board
-
-    @staticmethod
-    def _roll_dice() -> DICE:
-        return [random.randint(1, 6), random.randint(1, 6)]
+        # Write to the console unless told otherwise. Pass Observer() to
+        # play quietly.
+        self.observer = ConsoleObserver() if observer is None else observer
+        self.dice = RandomDice() if dice is None else dice
+        # The color and dice of the turn being played, and its legal moves
+        # once someone asks for them.
+        self._turn = None # type: Optional[Tuple[Color, DICE]]
+        self._turn_moves = None # type: Optional[List[Move]]
+        self._turn_move_set = set() # type: Set[Move]
+
+    def _roll_dice(self) -> DICE:
+        return self.dice.roll()
+
+    def _begin_turn(self, color: Color, dice: DICE) -> bool:
+        """Begin the turn. Return whether there is any legal move."""
+        self._turn = (color, dice[0:2])
+        return self.board.has_legal_move(color, dice)
+
+    def _end_turn(self) -> None:
+        """Forget the legal moves before the board changes."""
+        self._turn = None
+        self._turn_moves = None
+        self._turn_move_set = set()
+
+    def _is_turn(self, color: Color, dice: DICE) -> bool:
+        """Check if this is the turn being played."""
+        return (color, dice[0:2]) == self._turn
+
+    def get_legal_moves(self, color: Color, dice: DICE) -> List[Move]:
+        """List legal moves. They are generated at most once per turn."""
+        if not self._is_turn(color, dice):
+            return self.board.list_moves(color, dice)
+        if self._turn_moves is None:
+            self._turn_moves = self.board.list_moves(color, dice)
+            self._turn_move_set = set(self._turn_moves)
+        return self._turn_moves
+
+    def is_legal_move(self, color: Color, dice: DICE, move: Move) -> bool:
+        """Check if the move is legal.
+        If the legal moves of the turn were generated, look the move up among
+        them first. Those list one order of the submoves of a double, so
+        check other moves directly.
+        """
+        if self._is_turn(color, dice) and (move in self._turn_move_set):
+            return True
+        return self.board.is_valid_move(color, dice, move)
+
+    def _play_move(self, player: Player, color: Color, dice: DICE) -> bool:
+        """Ask the player for a move in the turn begun and play it.
+        Return whether the move was legal.
+        """
+        move = player.make_move(color, self, dice)
+        is_legal = self.is_legal_move(color, dice, move)
+        self._end_turn()
+        if is_legal:
+            self.board.do_move(color, move)
+            self.observer.on_move_played(self, color, dice, move)
+        return is_legal
 
     def _did_win_by_resignition(self, winner: Color) -> bool:
         """Check if the game was won by resignition."""
@@ -435,6 +1349,7 @@ class Game:
             self.black_score += score
             if did_win_by_forfeit:
                 self.black_score = Game.WIN_SCORE
+        self.observer.on_game_over(self, winner, score)
 
     def play_round(self, black: Player, white: Player) -> None:
         """The main game loop."""
@@ -453,97 +1368,104 @@ class Game:
 
             player = players[1]
             color = colors[1]
-            self.board.print()
-            sys.stdout.write('Rolled {}-{}\n'.format(dice[0], dice[1]))
-            move = player.make_move(color, self, dice)
-            if self.board.is_valid_move(color, dice, move):
-                self.board.do_move(color, move)
-            else:
-                sys.stdout.write(
-                    'Illegal move. {} forfeits match.\n'.format(
-                        color))
+            self.observer.on_turn_started(self, color)
+            self.observer.on_dice_rolled(self, color, dice)
+            self._begin_turn(color, dice)
+            if not self._play_move(player, color, dice):
+                self.observer.on_forfeited(self, color, Forfeit.IllegalMove)
                 self.update_score(color.opposite(), True)
                 return
             break
+        self._play_turns(players, colors)
+
+    def play_position(
+            self, black: Player, white: Player, color: Color) -> None:
+        """Play a round from the position on the board, with color to
+        roll."""
+        if Color.Black == color:
+            self._play_turns([black, white], [Color.Black, Color.White])
+        else:
+            self._play_turns([white, black], [Color.White, Color.Black])
 
+    def _play_turns(
+            self, players: List[Player], colors: List[Color]) -> None:
+        """Play turns until the round is over, starting with the first
+        player."""
         for _ in range(1, 1000):
             for player_index in range(0, 2):
                 color = colors[player_index]
                 player = players[player_index]
-                self.board.print()
+                self.observer.on_turn_started(self, color)
                 command = player.roll_or_double(color, self)
 
                 if isinstance(command, DoubleCommand):
                     if (Cube.Centered == self.cube) or \
                             (Cube.Black == self.cube) or \
                             (Cube.White == self.cube):
+                        self.observer.on_cube_offered(self, color)
                         other_player = players[(player_index + 1) % 2]
                         response = other_player.accept_or_resign(color, self)
 
                         if isinstance(response, AcceptCommand):
-                            sys.stdout.write('Doubling cube accepted.\n')
+                            self.observer.on_cube_accepted(
+                                self, color.opposite())
                             self.stakes *= 2
                             if Color.Black == color:
                                 self.cube = Cube.White
                             else:
                                 self.cube = Cube.Black
                         elif isinstance(response, ResignCommand):
-                            sys.stdout.write('{} resigns.\n'.format(
-                                color.opposite()))
+                            self.observer.on_resigned(self, color.opposite())
                             self.update_score(color, False)
                             return
                         else:
-                            sys.stdout.write('Illegal respoonse. ' + \
-                                '{} forfeits match.\n'.format(
-                                    color.opposite()))
+                            self.observer.on_forfeited(
+                                self, color.opposite(),
+                                Forfeit.IllegalResponse)
                             self.update_score(color, True)
                             return
                 elif not isinstance(command, RollCommand):
-                    sys.stdout.write(
-                        'Illegal command. {} forfeits match.\n'.format(
-                            color))
+                    self.observer.on_forfeited(
+                        self, color, Forfeit.IllegalCommand)
                     self.update_score(color.opposite(), True)
                     return
 
                 # Roll dice.
-                dice = Game._roll_dice()
-                sys.stdout.write('Rolled {}-{}\n'.format(dice[0], dice[1]))
-                legal_moves = self.board.list_moves(color, dice)
-                if 0 == len(legal_moves):
-                    sys.stdout.write('No legal moves.\n')
+                dice = self._roll_dice()
+                self.observer.on_dice_rolled(self, color, dice)
+                if not self._begin_turn(color, dice):
+                    self._end_turn()
+                    self.observer.on_no_legal_moves(self, color)
                     continue
-                move = player.make_move(color, self, dice)
-                if self.board.is_valid_move(color, dice, move):
-                    self.board.do_move(color, move)
-                else:
-                    sys.stdout.write(
-                        'Illegal move. {} forfeits match.\n'.format(
-                            color))
+                if not self._play_move(player, color, dice):
+                    self.observer.on_forfeited(
+                        self, color, Forfeit.IllegalMove)
                     self.update_score(color.opposite(), True)
                     return
 
                 if self.board.is_winner(color):
-                    sys.stdout.write('{} wins!\n'.format(color))
                     self.update_score(color, False)
                     return
 
         # Stalemates are impossible in backgammon
-        sys.stdout.write('Something went wrong.\n')
+        self.observer.on_game_aborted(self)
 
     def play_match(self, black: Player, white: Player) -> None:
         """Play many rounds."""
         for _ in range(0, 10000):
             self.play_round(black, white)
             if Game.WIN_SCORE <= self.black_score:
-                sys.stdout.write('Black wins the match!\n')
+                self.observer.on_match_over(self, Color.Black)
                 return
             elif Game.WIN_SCORE <= self.white_score:
-                sys.stdout.write('White wins the match!\n')
+                self.observer.on_match_over(self, Color.White)
                 return
 
-    def print(self) -> None:
-        """Print the game."""
-        sys.stdout.write('Black: {} === White: {}\n'.format(
+    def print(self, stream: Optional[TextIO] = None) -> None:
+        """Print the game to the stream, or to stdout by default."""
+        if stream is None:
+            stream = sys.stdout
+        stream.write('Black: {} === White: {}\n'.format(
             self.black_score, self.white_score))
-        sys.stdout.write('Stakes: {}\n'.format(self.stakes))
-        self.board.print()
+        stream.write('Stakes: {}\n'.format(self.stakes))
+        self.board.print(stream)
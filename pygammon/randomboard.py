@@ -0,0 +1,40 @@
+"""Random positions for tests and benchmarks."""
+import random
+from typing import Callable
+from typing import List
+from typing import Sequence
+from typing import TypeVar
+
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+
+BOARD = TypeVar('BOARD', bound=Board)
+
+def scatter_checkers(board: Board, color: Color, rng: random.Random,
+                     points: Sequence[int], checkers: int) -> None:
+    """Add checkers of color one at a time on points picked from points,
+    skipping the points the opponent holds. The same point may be listed
+    several times to make it likelier."""
+    for _ in range(0, checkers):
+        while True:
+            pos = rng.choice(points)
+            if (Board.BAR_POS == pos) or \
+                    (0 == board.get_opposite_checkers(color, pos)):
+                break
+        board.set_checkers(color, pos, board.get_checkers(color, pos) + 1)
+
+def make_positions(
+        count: int, make_board: Callable[[], BOARD]) -> List[BOARD]:
+    """Make the starting position and random positions with the checkers
+    spread out, where doubles have the most moves."""
+    board = make_board()
+    board.setup()
+    positions = [board]
+    rng = random.Random(0)
+    points = list(range(Board.BAR_POS + 1, Board.BEARING_OFF_POS))
+    while len(positions) < count:
+        board = make_board()
+        for color in Color:
+            scatter_checkers(board, color, rng, points, 15)
+        positions.append(board)
+    return positions
@@ -1,6 +1,13 @@
 """Random player."""
 import random
+from typing import List
+from typing import Optional
 
+import numpy as np
+
+from pygammon.batch import BoardBatch
+from pygammon.pygammon import Backend
+from pygammon.pygammon import Board
 from pygammon.pygammon import Color
 from pygammon.pygammon import Command
 from pygammon.pygammon import DICE
@@ -11,7 +18,11 @@ from pygammon.pygammon import ResignCommand
 from pygammon.pygammon import RollCommand
 
 class RandomPlayer(Player):
-    """Random backgammon player."""
+    """Random backgammon player. It uses the global random generator unless
+    given its own."""
+
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        self._randint = random.randint if rng is None else rng.randint
 
     def roll_or_double(self, _color: Color, _game: Game) -> Command:
         """Parse a command from the console."""
@@ -19,11 +30,40 @@ class RandomPlayer(Player):
 
     def make_move(self, color: Color, game: Game, dice: DICE) -> Move:
         """Generate a random move."""
-        board = game.board
-        moves = board.list_moves(color, dice)
-        move_index = random.randint(0, len(moves) - 1)
+        moves = game.get_legal_moves(color, dice)
+        move_index = self._randint(0, len(moves) - 1)
         return moves[move_index]
 
+    def choose_moves(
+            self, batch: BoardBatch,
+            dice: np.ndarray) -> List[Optional[Move]]:
+        """Choose a random move in each position of a batch, or None if there
+        is no legal move. Like make_move, every legal move is as likely. This
+        is a policy for Simulator."""
+        has_legal_move = batch.has_legal_move(dice)
+        board = Board(backend=Backend.ByteArray)
+        moves = [] # type: List[Optional[Move]]
+        for index in range(0, len(batch)):
+            if not has_legal_move[index]:
+                moves.append(None)
+                continue
+            legal_moves = batch.list_moves(
+                index, dice[index].tolist(), board)
+            moves.append(legal_moves[self._randint(0, len(legal_moves) - 1)])
+        return moves
+
+    def choose_walk_moves(
+            self, batch: BoardBatch,
+            dice: np.ndarray) -> List[Optional[Move]]:
+        """Choose a move in each position of a batch by playing random
+        submoves one at a time, or None if there is no legal move. This is a
+        different policy from make_move and choose_moves: moves reached
+        through more submoves are likelier. It is much cheaper, which makes
+        it a policy for Simulator where the speed matters more than playing
+        like make_move."""
+        rng = np.random.default_rng(self._randint(0, 2 ** 32 - 1))
+        return batch.choose_random_moves(dice, rng)
+
     def accept_or_resign(self, _color: Color, _game: Game) -> Command:
         """Resign."""
         return ResignCommand()
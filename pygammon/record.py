@@ -0,0 +1,190 @@
+"""A compact binary format for recorded games.
+
+A record file is a sequence of games. Each game is a 2-byte little-endian
+length followed by that many bytes:
+
+- The value of the Color playing the opening roll.
+- For each turn, one byte holding the dice and the number of submoves,
+  (first_die - 1) * 30 + (second_die - 1) * 5 + submoves, followed by the
+  Submove.index of each submove in the order of Move.submoves. A turn
+  without a legal move has no submoves. Players take turns from the opening.
+- Marker bytes from 0xF0, which no turn byte reaches:
+  DOUBLE when the player to move doubles, then ACCEPT or RESIGN for the
+  answer, FORFEIT followed by the Color and the Forfeit reason, and END
+  followed by the winning Color and the 2-byte little-endian score.
+
+A turn usually takes 3 to 5 bytes. Games don't depend on each other, so
+files can be concatenated and split at any game.
+"""
+import struct
+from typing import BinaryIO
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from pygammon.pygammon import Color
+from pygammon.pygammon import DICE
+from pygammon.pygammon import Forfeit
+from pygammon.pygammon import Game
+from pygammon.pygammon import Move
+from pygammon.pygammon import Observer
+from pygammon.pygammon import SUBMOVES
+
+MARKER_DOUBLE = 0xF0
+MARKER_ACCEPT = 0xF1
+MARKER_RESIGN = 0xF2
+MARKER_FORFEIT = 0xF3
+MARKER_END = 0xF4
+
+_LENGTH = struct.Struct('<H')
+_SCORE = struct.Struct('<H')
+
+def encode_turn(dice: DICE, submoves: int) -> int:
+    """Get the byte starting a turn."""
+    return (dice[0] - 1) * 30 + (dice[1] - 1) * 5 + submoves
+
+# The dice and number of submoves of each turn byte.
+_TURNS = [([first_die, second_die], submoves)
+          for first_die in range(1, 7) for second_die in range(1, 7)
+          for submoves in range(0, 5)]
+
+class GameRecord:
+    """A decoded game. turns holds the color, dice and move of each turn,
+    with an empty move when there was no legal move. doubles holds the
+    indices of the turns the player doubled in before rolling.
+    """
+
+    def __init__(self, first_color: Color) -> None:
+        self.first_color = first_color
+        self.turns = [] # type: List[Tuple[Color, DICE, Move]]
+        self.doubles = [] # type: List[int]
+        self.winner = None # type: Optional[Color]
+        self.score = 0
+        self.resigned = False
+        self.forfeit = None # type: Optional[Forfeit]
+
+def decode_game(body: bytes) -> GameRecord:
+    """Decode the bytes of a game, without the length."""
+    colors = list(Color)
+    color = colors[body[0]]
+    record = GameRecord(color)
+    turns = record.turns
+    index = 1
+    end = len(body)
+    while index < end:
+        code = body[index]
+        index += 1
+        if code < MARKER_DOUBLE:
+            dice, submoves = _TURNS[code]
+            # Each turn gets its own dice, since callers may change them.
+            turns.append((color, list(dice), Move(
+                [SUBMOVES[submove_index]
+                 for submove_index in body[index:index + submoves]])))
+            index += submoves
+            color = color.opposite()
+        elif MARKER_DOUBLE == code:
+            record.doubles.append(len(turns))
+        elif MARKER_ACCEPT == code:
+            continue
+        elif MARKER_RESIGN == code:
+            record.resigned = True
+        elif MARKER_FORFEIT == code:
+            record.forfeit = list(Forfeit)[body[index + 1]]
+            index += 2
+        elif MARKER_END == code:
+            record.winner = colors[body[index]]
+            record.score = _SCORE.unpack_from(body, index + 1)[0]
+            index += 1 + _SCORE.size
+        else:
+            raise ValueError('Unknown byte in game record: {}'.format(code))
+    return record
+
+class RecordWriter(Observer):
+    """Write the games played to a binary stream as they end."""
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self.stream = stream
+        # The game being recorded, and the dice of the turn being played.
+        self._body = None # type: Optional[bytearray]
+        self._dice = [] # type: DICE
+
+    def _get_body(self) -> bytearray:
+        """Get the game being recorded."""
+        if self._body is None:
+            raise ValueError('No game is being recorded.')
+        return self._body
+
+    def on_turn_started(self, game: Game, color: Color) -> None:
+        if self._body is None:
+            self._body = bytearray([color.value])
+
+    def on_dice_rolled(self, game: Game, color: Color, dice: DICE) -> None:
+        self._dice = dice
+
+    def on_move_played(
+            self, game: Game, color: Color, dice: DICE, move: Move) -> None:
+        body = self._get_body()
+        body.append(encode_turn(dice, len(move.submoves)))
+        body.extend([submove.index for submove in move.submoves])
+
+    def on_no_legal_moves(self, game: Game, color: Color) -> None:
+        self._get_body().append(encode_turn(self._dice, 0))
+
+    def on_cube_offered(self, game: Game, color: Color) -> None:
+        self._get_body().append(MARKER_DOUBLE)
+
+    def on_cube_accepted(self, game: Game, color: Color) -> None:
+        self._get_body().append(MARKER_ACCEPT)
+
+    def on_resigned(self, game: Game, color: Color) -> None:
+        self._get_body().append(MARKER_RESIGN)
+
+    def on_forfeited(
+            self, game: Game, color: Color, reason: Forfeit) -> None:
+        self._get_body().extend([MARKER_FORFEIT, color.value, reason.value])
+
+    def on_game_over(self, game: Game, winner: Color, score: int) -> None:
+        body = self._get_body()
+        self._body = None
+        body.extend([MARKER_END, winner.value])
+        body.extend(_SCORE.pack(score))
+        self.stream.write(_LENGTH.pack(len(body)))
+        self.stream.write(body)
+
+    def on_game_aborted(self, game: Game) -> None:
+        self._body = None
+
+def read_games(
+        stream: BinaryIO, chunk_size: int = 1 << 20,
+        size: Optional[int] = None) -> Iterator[bytes]:
+    """Read the bytes of each game from a stream, a chunk at a time.
+    If size is given, stop after that many bytes."""
+    buffer = b''
+    while True:
+        if size is None:
+            chunk = stream.read(chunk_size)
+        else:
+            chunk = stream.read(min(chunk_size, size))
+            size -= len(chunk)
+        if not chunk:
+            break
+        buffer = buffer + chunk if buffer else chunk
+        index = 0
+        end = len(buffer)
+        while index + _LENGTH.size <= end:
+            length = buffer[index] | (buffer[index + 1] << 8)
+            body_end = index + _LENGTH.size + length
+            if end < body_end:
+                break
+            yield buffer[index + _LENGTH.size:body_end]
+            index = body_end
+        buffer = buffer[index:]
+    if buffer:
+        raise ValueError('Truncated game record.')
+
+def read_records(
+        stream: BinaryIO, chunk_size: int = 1 << 20) -> Iterator[GameRecord]:
+    """Read and decode each game from a stream."""
+    for body in read_games(stream, chunk_size):
+        yield decode_game(body)
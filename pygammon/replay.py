@@ -0,0 +1,220 @@
+"""Replay recorded games to check every move and gather statistics."""
+import argparse
+import mmap
+import multiprocessing
+import os
+import sys
+from typing import List
+from typing import Optional
+from typing import TextIO
+from typing import Tuple
+
+from pygammon.pygammon import Backend
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.record import GameRecord
+from pygammon.record import decode_game
+from pygammon.record import read_games
+
+class GameStats:
+    """What happened in a replayed game. Lists are indexed by Color.value.
+    The pip swing of a turn is how much it moved the pip count difference
+    in favor of the player, so it counts the pips of blots hit too.
+    """
+
+    def __init__(self) -> None:
+        self.turns = 0
+        self.hits = [0, 0]
+        self.max_pip_swing = [0, 0]
+        self.total_pip_swing = [0, 0]
+        # The first turn with an illegal move, or with no move although
+        # there was a legal one.
+        self.illegal_turn = None # type: Optional[int]
+        self.missed_turn = None # type: Optional[int]
+        # Whether the recorded winner did not bear off all checkers in a
+        # game that was neither resigned nor forfeited.
+        self.wrong_winner = False
+
+    def is_valid(self) -> bool:
+        """Check if the game replayed without problems."""
+        return self.illegal_turn is None and self.missed_turn is None and \
+            not self.wrong_winner
+
+def replay_game(record: GameRecord) -> GameStats:
+    """Replay a game from the starting position, checking every move."""
+    stats = GameStats()
+    board = Board(backend=Backend.ByteArray)
+    board.setup()
+    for turn_index, (color, dice, move) in enumerate(record.turns):
+        stats.turns += 1
+        if 0 == move.size():
+            if board.has_legal_move(color, dice):
+                stats.missed_turn = turn_index
+                return stats
+            continue
+        if not board.is_valid_move(color, dice, move):
+            stats.illegal_turn = turn_index
+            return stats
+        pip_difference = board.get_pips(color.opposite()) - \
+            board.get_pips(color)
+        did_hits = board.do_move(color, move)
+        pip_swing = board.get_pips(color.opposite()) - \
+            board.get_pips(color) - pip_difference
+        color_index = color.value
+        stats.hits[color_index] += sum(did_hits)
+        stats.total_pip_swing[color_index] += pip_swing
+        if stats.max_pip_swing[color_index] < pip_swing:
+            stats.max_pip_swing[color_index] = pip_swing
+    if record.winner is not None and not record.resigned and \
+            record.forfeit is None:
+        stats.wrong_winner = not board.is_winner(record.winner)
+    return stats
+
+class ReplayStats:
+    """Totals over many replayed games, with the byte offsets of the games
+    that failed to replay."""
+
+    def __init__(self) -> None:
+        self.games = 0
+        self.turns = 0
+        self.hits = [0, 0]
+        self.max_pip_swing = [0, 0]
+        self.total_pip_swing = [0, 0]
+        self.illegal_games = 0
+        self.missed_games = 0
+        self.wrong_winners = 0
+        self.corrupt_games = 0
+        self.bad_offsets = [] # type: List[int]
+
+    def add(self, stats: GameStats, offset: int) -> None:
+        """Add a game starting at the offset in the file."""
+        self.games += 1
+        self.turns += stats.turns
+        for color_index in range(0, 2):
+            self.hits[color_index] += stats.hits[color_index]
+            self.total_pip_swing[color_index] += \
+                stats.total_pip_swing[color_index]
+            self.max_pip_swing[color_index] = max(
+                self.max_pip_swing[color_index],
+                stats.max_pip_swing[color_index])
+        if stats.illegal_turn is not None:
+            self.illegal_games += 1
+        if stats.missed_turn is not None:
+            self.missed_games += 1
+        if stats.wrong_winner:
+            self.wrong_winners += 1
+        if not stats.is_valid():
+            self.bad_offsets.append(offset)
+
+    def add_corrupt(self, offset: int) -> None:
+        """Add a game that could not be decoded."""
+        self.corrupt_games += 1
+        self.bad_offsets.append(offset)
+
+    def merge(self, other: 'ReplayStats') -> None:
+        """Add the totals of other games."""
+        self.games += other.games
+        self.turns += other.turns
+        for color_index in range(0, 2):
+            self.hits[color_index] += other.hits[color_index]
+            self.total_pip_swing[color_index] += \
+                other.total_pip_swing[color_index]
+            self.max_pip_swing[color_index] = max(
+                self.max_pip_swing[color_index],
+                other.max_pip_swing[color_index])
+        self.illegal_games += other.illegal_games
+        self.missed_games += other.missed_games
+        self.wrong_winners += other.wrong_winners
+        self.corrupt_games += other.corrupt_games
+        self.bad_offsets.extend(other.bad_offsets)
+
+    def print(self, stream: Optional[TextIO] = None) -> None:
+        """Print the totals."""
+        if stream is None:
+            stream = sys.stdout
+        stream.write('{} games, {} turns\n'.format(self.games, self.turns))
+        stream.write('Illegal moves: {}, missed moves: {}, '
+                     'wrong winners: {}\n'.format(
+                         self.illegal_games, self.missed_games,
+                         self.wrong_winners))
+        stream.write('Corrupt games: {}\n'.format(self.corrupt_games))
+        for color in Color:
+            stream.write(
+                '{}: hits {}, pip swing {}, max pip swing {}\n'.format(
+                    color, self.hits[color.value],
+                    self.total_pip_swing[color.value],
+                    self.max_pip_swing[color.value]))
+        for offset in sorted(self.bad_offsets):
+            stream.write('Bad game at byte {}\n'.format(offset))
+
+def split_records(path: str, parts: int) -> List[Tuple[int, int]]:
+    """Split a record file into ranges of bytes holding whole games, of
+    about the same size. A game cut short by the end of the file ends the
+    last range."""
+    size = os.path.getsize(path)
+    if 0 == size:
+        return []
+    target = max(size // max(parts, 1), 1)
+    ranges = [] # type: List[Tuple[int, int]]
+    start = 0
+    offset = 0
+    with open(path, 'rb') as record_file:
+        with mmap.mmap(
+                record_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            while offset + 2 <= size:
+                offset = min(
+                    size,
+                    offset + 2 + (data[offset] | (data[offset + 1] << 8)))
+                if start + target <= offset:
+                    ranges.append((start, offset))
+                    start = offset
+    if start < size:
+        ranges.append((start, size))
+    return ranges
+
+def _replay_range(path_range: Tuple[str, int, int]) -> ReplayStats:
+    """Replay the games in a range of bytes of a record file."""
+    path, start, end = path_range
+    stats = ReplayStats()
+    offset = start
+    with open(path, 'rb') as record_file:
+        record_file.seek(start)
+        try:
+            for body in read_games(record_file, size=end - start):
+                try:
+                    record = decode_game(body)
+                except (IndexError, ValueError):
+                    stats.add_corrupt(offset)
+                else:
+                    stats.add(replay_game(record), offset)
+                offset += 2 + len(body)
+        except ValueError:
+            # The file ends in the middle of the game at the offset.
+            stats.add_corrupt(offset)
+    return stats
+
+def replay_file(path: str, workers: int = 1) -> ReplayStats:
+    """Replay every game of a record file, one range of it per worker."""
+    ranges = [(path, start, end)
+              for start, end in split_records(path, workers)]
+    stats = ReplayStats()
+    if workers <= 1:
+        for path_range in ranges:
+            stats.merge(_replay_range(path_range))
+        return stats
+    with multiprocessing.Pool(workers) as pool:
+        for range_stats in pool.imap_unordered(_replay_range, ranges):
+            stats.merge(range_stats)
+    return stats
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Replay a record file from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('path', help='record file written by RecordWriter')
+    parser.add_argument('--workers', type=int,
+                        default=multiprocessing.cpu_count())
+    args = parser.parse_args(argv)
+    replay_file(args.path, args.workers).print()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+"""Evaluate positions by playing them out many times.
+
+Trials come in pairs with mirrored dice: the second trial of a pair rolls
+7 - d wherever the first rolls d, so luck in one tends to cancel luck in
+the other. The first roll of each trial is stratified: pair j of every 18
+starts with the j-th of the 36 rolls, and its mirrored trial with the
+(35 - j)-th, so every 36 trials start with each roll once.
+
+Standard errors are computed from the means of the pairs, which leaves out
+what stratifying gains and so errs on the safe side.
+"""
+import copy
+import multiprocessing
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+
+from pygammon.pygammon import Backend
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.pygammon import DICE
+from pygammon.pygammon import DiceSource
+from pygammon.pygammon import Game
+from pygammon.pygammon import Observer
+from pygammon.pygammon import Player
+from pygammon.pygammon import RandomDice
+
+# The 36 ordered rolls. Mirroring the j-th gives the (35 - j)-th.
+FIRST_ROLLS = [[first_die, second_die]
+               for first_die in range(1, 7) for second_die in range(1, 7)]
+
+# Trials are dispatched in blocks, which keep the first rolls balanced.
+BLOCK_SIZE = len(FIRST_ROLLS)
+
+class RolloutDice(DiceSource):
+    """Roll a given first roll and then dice from a seed, all of them
+    mirrored if asked."""
+
+    def __init__(self, first_roll: DICE, seed: Tuple[int, int],
+                 mirror: bool = False) -> None:
+        self.first_roll = first_roll
+        self.mirror = mirror
+        self._dice = RandomDice(np.random.default_rng(list(seed)))
+        self._rolled = False
+
+    def roll(self) -> DICE:
+        if self._rolled:
+            dice = self._dice.roll()
+        else:
+            dice = self.first_roll
+            self._rolled = True
+        if self.mirror:
+            return [7 - dice[0], 7 - dice[1]]
+        return list(dice)
+
+    @staticmethod
+    def for_trial(trial: int, seed: int) -> 'RolloutDice':
+        """Make the dice of a trial of a rollout."""
+        pair = trial // 2
+        return RolloutDice(FIRST_ROLLS[pair % (BLOCK_SIZE // 2)],
+                           (seed, pair), 1 == trial % 2)
+
+class _ResultObserver(Observer):
+    """Keep the winner of a game."""
+
+    def __init__(self) -> None:
+        self.winner = None # type: Optional[Color]
+
+    def on_game_over(self, game: Game, winner: Color, score: int) -> None:
+        self.winner = winner
+
+def play_trial(board: Board, color: Color, player: Player,
+               dice: DiceSource) -> int:
+    """Play a position out with color to roll and the player on both sides.
+    Return the points won by color: 1, 2 or 3 for a single game, gammon or
+    backgammon, negative if lost, or 0 if the game was aborted."""
+    observer = _ResultObserver()
+    game = Game(board, observer, dice)
+    game.play_position(player, player, color)
+    winner = observer.winner
+    if winner is None:
+        return 0
+    points = 1
+    if board.is_winner(winner) and board.is_gammon(winner):
+        points = 3 if board.is_backgammon(winner) else 2
+    return points if color == winner else -points
+
+def _copy_board(board: Board, backend: Backend) -> Board:
+    """Copy the checkers of a board to a board with the backend."""
+    board_copy = Board(backend=backend)
+    for color in Color:
+        checkers = board_copy.get_board(color)
+        for pos, count in enumerate(board.get_board(color)):
+            checkers[pos] = int(count)
+    board_copy.recompute()
+    return board_copy
+
+def _play_trials(
+        task: Tuple[Board, Color, Player, int, int, int]) -> np.ndarray:
+    """Play trials from first to first + count - 1."""
+    board, color, player, first, count, seed = task
+    # Players may keep state, such as a random generator. Start each block
+    # from the player given, so it plays the same in any process.
+    player = copy.deepcopy(player)
+    start = _copy_board(board, Backend.ByteArray)
+    outcomes = np.zeros(count, dtype=np.int8)
+    for index in range(0, count):
+        outcomes[index] = play_trial(
+            start.copy(), color, player,
+            RolloutDice.for_trial(first + index, seed))
+    return outcomes
+
+class RolloutResults:
+    """The outcomes of the trials of a rollout, seen by the player to roll.
+    outcomes[i] holds the points won by trial i as play_trial returns them.
+    """
+
+    def __init__(self, outcomes: np.ndarray) -> None:
+        self.outcomes = outcomes
+
+    def __len__(self) -> int:
+        return len(self.outcomes)
+
+    def _get_mean_and_error(self, values: np.ndarray) -> Tuple[float, float]:
+        """Get the mean of the values of the trials and its standard error,
+        taking the pairs of mirrored trials as the samples. A last trial
+        without its mirror counts in the mean only."""
+        pairs = values[:len(values) // 2 * 2].reshape(-1, 2).mean(axis=1)
+        if len(pairs) < 2:
+            return float(np.mean(values)), float('inf')
+        return float(np.mean(values)), \
+            float(np.std(pairs, ddof=1) / np.sqrt(len(pairs)))
+
+    def get_win(self) -> Tuple[float, float]:
+        """Get the probability of winning and its standard error."""
+        return self._get_mean_and_error(0 < self.outcomes)
+
+    def get_gammon(self) -> Tuple[float, float]:
+        """Get the probability of winning a gammon or backgammon."""
+        return self._get_mean_and_error(2 <= self.outcomes)
+
+    def get_backgammon(self) -> Tuple[float, float]:
+        """Get the probability of winning a backgammon."""
+        return self._get_mean_and_error(3 <= self.outcomes)
+
+    def get_lose_gammon(self) -> Tuple[float, float]:
+        """Get the probability of losing a gammon or backgammon."""
+        return self._get_mean_and_error(self.outcomes <= -2)
+
+    def get_lose_backgammon(self) -> Tuple[float, float]:
+        """Get the probability of losing a backgammon."""
+        return self._get_mean_and_error(self.outcomes <= -3)
+
+    def get_equity(self) -> Tuple[float, float]:
+        """Get the points won per game without the cube."""
+        return self._get_mean_and_error(self.outcomes.astype(float))
+
+def rollout(board: Board, color: Color, player: Player, trials: int,
+            workers: int = 1, seed: int = 0,
+            target_error: Optional[float] = None,
+            min_trials: int = 4 * BLOCK_SIZE) -> RolloutResults:
+    """Play the position out up to trials times with color to roll and the
+    player on both sides, dividing the trials between worker processes. If
+    target_error is given, stop once the standard error of the equity is
+    below it, after at least min_trials trials. Trials are dispatched a
+    block per worker at a time, so an early stop comes after a whole block,
+    but the last block only plays the trials left. The first rolls are only
+    balanced over whole blocks.
+    """
+    if trials < 1:
+        raise ValueError('Expected at least one trial: {}'.format(trials))
+    tasks = [(board, color, player, first, min(BLOCK_SIZE, trials - first),
+              seed)
+             for first in range(0, trials, BLOCK_SIZE)]
+    outcomes = [] # type: List[np.ndarray]
+    played = 0
+    pool = multiprocessing.Pool(workers) if 1 < workers else None
+    try:
+        results = map(_play_trials, tasks) if pool is None else \
+            pool.imap(_play_trials, tasks)
+        for block_outcomes in results:
+            outcomes.append(block_outcomes)
+            played += len(block_outcomes)
+            if target_error is None or played < min_trials:
+                continue
+            _, error = RolloutResults(np.concatenate(outcomes)).get_equity()
+            if error < target_error:
+                break
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    return RolloutResults(np.concatenate(outcomes))
@@ -0,0 +1,265 @@
+"""Expectiminimax search player.
+
+The search alternates move nodes, where a player picks the best move for a
+roll, and chance nodes, which average over the 21 distinct rolls of the
+other player. Values are winning probabilities of the player who just
+moved, so they lie in [0, 1], which is what the pruning below relies on.
+
+- Chance nodes are stored in a transposition table keyed by the Zobrist
+  hash of the position with the player to roll, holding bounds found at
+  each depth.
+- Star1: a chance node stops once the rolls searched so far, with the
+  best and worst case for the rest, decide it is outside the window. Each
+  roll is searched with the narrowest window that could still matter.
+- Star2: before searching a chance node, one reply to every roll is
+  probed. The other player does at least that well, which bounds the
+  chance node from above before the full search, and tightens the best
+  case of each roll still to search.
+- Iterative deepening: each depth orders the moves for the next one, and a
+  time budget stops the search, keeping the last finished depth.
+"""
+import time
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+
+from pygammon.neuralplayer import Network
+from pygammon.neuralplayer import NeuralPlayer
+from pygammon.neuralplayer import encode_keys
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.pygammon import DICE
+from pygammon.pygammon import Move
+
+# The 21 distinct rolls and their probabilities.
+ROLLS = [([first_die, second_die], (1 if first_die == second_die else 2) / 36)
+         for first_die in range(1, 7) for second_die in range(first_die, 7)]
+
+class _SearchTimeout(Exception):
+    """Raised when the time budget of a search runs out."""
+
+class SearchPlayer(NeuralPlayer):
+    """Pick moves by expectiminimax search down to max_depth plies, scoring
+    the positions at the bottom with the network. Depth 1 plays like
+    NeuralPlayer; depth 2 also averages over every reply. If time_budget is
+    given, deeper searches stop after that many seconds.
+    """
+
+    def __init__(self, network: Network, max_depth: int = 2,
+                 time_budget: Optional[float] = None,
+                 table_size: int = 1000000) -> None:
+        super().__init__(network)
+        self.max_depth = max_depth
+        self.time_budget = time_budget
+        self.table_size = table_size
+        # Bounds of chance node values by hash, with the depth they hold for.
+        self._table = {} # type: Dict[int, Tuple[int, float, float]]
+        self._deadline = None # type: Optional[float]
+        # Counters of the last search.
+        self.depth = 0
+        self.nodes = 0
+        self.table_hits = 0
+        self.cutoffs = 0
+
+    def clear(self) -> None:
+        """Drop the transposition table."""
+        self._table.clear()
+
+    def _evaluate(self, keys: Sequence[bytes]) -> np.ndarray:
+        """Get the winning probability of each position, given by its key
+        seen by the player who just moved."""
+        values = self.network.evaluate(encode_keys(keys)).astype(float)
+        for index, key in enumerate(keys):
+            if 15 <= key[Board.BEARING_OFF_POS]:
+                values[index] = 1.0
+        return values
+
+    def _list_candidates(
+            self, board: Board, color: Color,
+            dice: DICE) -> Sequence[Tuple[Optional[Move], bytes]]:
+        """List the moves with the keys they reach. Without a legal move
+        the player passes, which is None."""
+        candidates = board.list_moves_with_keys(
+            color, dice) # type: Sequence[Tuple[Optional[Move], bytes]]
+        if 0 == len(candidates):
+            candidates = [(None, board.get_key(color, []))]
+        return candidates
+
+    def _search_move(self, board: Board, color: Color, dice: DICE,
+                     depth: int, alpha: float, beta: float) -> float:
+        """Get the value for color of its best move, searching depth plies
+        including this one. Values outside (alpha, beta) are only bounds."""
+        candidates = self._list_candidates(board, color, dice)
+        values = self._evaluate([key for _, key in candidates])
+        if 1 == depth:
+            return float(values.max())
+        best = 0.0
+        for index in np.argsort(-values):
+            move = candidates[index][0]
+            did_hits = [] # type: List[bool]
+            if move is not None:
+                did_hits = board.do_move(color, move)
+            try:
+                value = self._search_chance(
+                    board, color, depth - 1, max(alpha, best), beta)
+            finally:
+                if move is not None:
+                    board.undo_move(color, move, did_hits)
+            if best < value:
+                best = value
+                if beta <= best:
+                    self.cutoffs += 1
+                    break
+        return best
+
+    def _probe(self, board: Board, color: Color, depth: int) -> List[float]:
+        """Get the value for color of the first move it finds with each
+        roll, which its best move is at least worth."""
+        values = [] # type: List[float]
+        keys = [] # type: List[bytes]
+        for dice, _ in ROLLS:
+            moves = board.iter_moves(color, dice)
+            try:
+                next(moves, None)
+                if 1 == depth:
+                    keys.append(board.get_key(color, []))
+                else:
+                    values.append(self._search_chance(
+                        board, color, depth - 1, 0.0, 1.0))
+            finally:
+                moves.close()
+        if 1 == depth:
+            return self._evaluate(keys).tolist()
+        return values
+
+    def _search_chance(self, board: Board, mover: Color, depth: int,
+                       alpha: float, beta: float) -> float:
+        """Get the value for the mover of the position it just moved to,
+        averaging over the rolls of the other player and searching depth
+        plies from there. Values outside (alpha, beta) are only bounds."""
+        if board.is_winner(mover):
+            return 1.0
+        if self._deadline is not None and \
+                self._deadline < time.perf_counter():
+            raise _SearchTimeout()
+        self.nodes += 1
+        opponent = mover.opposite()
+        position_hash = board.get_hash(opponent)
+        lower = 0.0
+        upper = 1.0
+        entry = self._table.get(position_hash)
+        if entry is not None and depth == entry[0]:
+            self.table_hits += 1
+            lower = entry[1]
+            upper = entry[2]
+            if lower == upper or beta <= lower:
+                return lower
+            if upper <= alpha:
+                return upper
+        search_alpha = max(alpha, lower)
+        search_beta = min(beta, upper)
+        # Star2: the best reply to each roll is at least the probed one.
+        highs = [1.0 - value for value in self._probe(board, opponent, depth)]
+        remaining_high = sum(
+            probability * high for (_, probability), high in zip(ROLLS, highs))
+        if remaining_high <= search_alpha:
+            self.cutoffs += 1
+            return self._store(position_hash, depth, lower, upper,
+                               remaining_high, search_alpha, search_beta)
+        # Star1: search each roll with the window that could still move the
+        # average across alpha or beta. The rolls still to search are worth
+        # at least 0 and at most their probed bound.
+        total = 0.0
+        for (dice, probability), high in zip(ROLLS, highs):
+            remaining_high -= probability * high
+            roll_alpha = (search_alpha - total - remaining_high) / probability
+            roll_beta = (search_beta - total) / probability
+            value = 1.0 - self._search_move(
+                board, opponent, dice, depth, max(1.0 - roll_beta, 0.0),
+                min(1.0 - roll_alpha, 1.0))
+            total += probability * value
+            if value <= roll_alpha:
+                self.cutoffs += 1
+                return self._store(
+                    position_hash, depth, lower, upper,
+                    total + remaining_high, search_alpha, search_beta)
+            if roll_beta <= value:
+                self.cutoffs += 1
+                return self._store(position_hash, depth, lower, upper,
+                                   total, search_alpha, search_beta)
+        return self._store(
+            position_hash, depth, lower, upper, total, search_alpha,
+            search_beta)
+
+    def _store(self, position_hash: int, depth: int, lower: float,
+               upper: float, value: float, alpha: float,
+               beta: float) -> float:
+        """Remember what a search within (alpha, beta) found about a chance
+        node, on top of the bounds already known, and return the value."""
+        if value <= alpha:
+            upper = min(upper, value)
+        elif beta <= value:
+            lower = max(lower, value)
+        else:
+            lower = value
+            upper = value
+        if self.table_size <= len(self._table):
+            self._table.clear()
+        self._table[position_hash] = (depth, lower, upper)
+        return value
+
+    def choose_move(
+            self, board: Board, color: Color, dice: DICE) -> Optional[Move]:
+        """Search deeper and deeper until max_depth or the time budget,
+        and pick the best move of the deepest search finished."""
+        candidates = board.list_moves_with_keys(color, dice)
+        self.depth = 1
+        if len(candidates) <= 1:
+            return candidates[0][0] if candidates else None
+        moves = [move for move, _ in candidates]
+        values = self.search_moves(
+            board, color, moves,
+            self._evaluate([key for _, key in candidates]))
+        return moves[int(np.argmax(values))]
+
+    def search_moves(self, board: Board, color: Color, moves: List[Move],
+                     values: np.ndarray) -> np.ndarray:
+        """Search the moves deeper and deeper, starting from their values at
+        depth 1, and get their values at the deepest search finished."""
+        self.depth = 1
+        self.nodes = 0
+        self.table_hits = 0
+        self.cutoffs = 0
+        self._deadline = None
+        if self.time_budget is not None:
+            self._deadline = time.perf_counter() + self.time_budget
+        try:
+            for depth in range(2, self.max_depth + 1):
+                values = self._search_root(board, color, moves, values, depth)
+                self.depth = depth
+        except _SearchTimeout:
+            pass
+        finally:
+            self._deadline = None
+        return values
+
+    def _search_root(self, board: Board, color: Color, moves: List[Move],
+                     values: np.ndarray, depth: int) -> np.ndarray:
+        """Search the moves in the order of their values at the previous
+        depth. Moves that can't beat the best get an upper bound."""
+        new_values = np.zeros(len(moves))
+        best = 0.0
+        for index in np.argsort(-values):
+            move = moves[index]
+            did_hits = board.do_move(color, move)
+            try:
+                new_values[index] = self._search_chance(
+                    board, color, depth - 1, best, 1.0)
+            finally:
+                board.undo_move(color, move, did_hits)
+            best = max(best, new_values[index])
+        return new_values
@@ -0,0 +1,119 @@
+"""Play many games at once in lockstep."""
+from typing import Callable
+from typing import List
+from typing import Optional
+
+import numpy as np
+
+from pygammon.batch import BoardBatch
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.pygammon import MAX_CHECKERS
+from pygammon.pygammon import Move
+
+# A policy chooses a move for the player to move in each position of a batch
+# given dice of shape (positions, 2), or None if there is no legal move.
+POLICY = Callable[[BoardBatch, np.ndarray], List[Optional[Move]]]
+
+class SimulationResults:
+    """The result of each game simulated. winners[i] is the value of the
+    Color winning game i, or -1 if it did not finish. points[i] is 1, 2 or 3
+    for a single game, gammon or backgammon, and turns[i] is the number of
+    turns played.
+    """
+
+    def __init__(self, games: int) -> None:
+        self.winners = np.full(games, -1, dtype=np.int8)
+        self.points = np.zeros(games, dtype=np.int8)
+        self.turns = np.zeros(games, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.winners)
+
+    def get_win_rate(self, color: Color) -> float:
+        """Get the fraction of games won by the player."""
+        return float(np.mean(color.value == self.winners))
+
+    def get_points_per_game(self, color: Color) -> float:
+        """Get the average points won by the player, less the points lost."""
+        won = np.where(color.value == self.winners, self.points, 0)
+        lost = np.where(color.opposite().value == self.winners, self.points, 0)
+        return float(np.mean(won.astype(int) - lost))
+
+class Simulator:
+    """Play games between two policies without the cube. Every game in
+    progress takes its turn at once, with the positions in a BoardBatch seen
+    by the player to move. Finished games drop out of the batch.
+    """
+
+    # Stalemates are impossible, so this only guards against broken policies.
+    MAX_TURNS = 2000
+
+    def __init__(
+            self, black: POLICY, white: POLICY,
+            rng: Optional[np.random.Generator] = None) -> None:
+        self.policies = [black, white]
+        self.rng = np.random.default_rng() if rng is None else rng
+
+    def _roll_dice(self, games: int) -> np.ndarray:
+        """Roll the dice for each game."""
+        return self.rng.integers(1, 7, size=(games, 2))
+
+    def _roll_opening(self, games: int) -> np.ndarray:
+        """Roll the dice until no game has doubles."""
+        dice = self._roll_dice(games)
+        is_double = dice[:, 0] == dice[:, 1]
+        while is_double.any():
+            dice[is_double] = self._roll_dice(int(is_double.sum()))
+            is_double = dice[:, 0] == dice[:, 1]
+        return dice
+
+    def play(self, games: int) -> SimulationResults:
+        """Play games from the starting position."""
+        results = SimulationResults(games)
+        board = Board()
+        board.setup()
+        checkers = np.tile(
+            np.array(list(board.get_board(Color.Black)), dtype=np.int8),
+            (games, 2, 1))
+        # Black rolls the first die and White the second. The higher die
+        # plays the opening roll.
+        dice = self._roll_opening(games)
+        colors = np.where(
+            dice[:, 0] < dice[:, 1], Color.White.value, Color.Black.value)
+        game_indices = np.arange(games)
+        for turn in range(0, Simulator.MAX_TURNS):
+            if 0 == len(game_indices):
+                break
+            if 0 < turn:
+                dice = self._roll_dice(len(game_indices))
+            for color in Color:
+                indices = np.flatnonzero(color.value == colors)
+                if 0 == len(indices):
+                    continue
+                batch = BoardBatch(checkers[indices])
+                moves = self.policies[color.value](batch, dice[indices])
+                batch.do_moves(moves)
+                checkers[indices] = batch.checkers
+            results.turns[game_indices] += 1
+
+            is_over = MAX_CHECKERS <= checkers[:, 0, Board.BEARING_OFF_POS]
+            if is_over.any():
+                finished = game_indices[is_over]
+                losers = checkers[is_over, 1, :]
+                is_gammon = 0 == losers[:, Board.BEARING_OFF_POS]
+                # The loser still has checkers in the winner's home board.
+                is_backgammon = is_gammon & (
+                    0 < losers[:, 1:Board.BEARING_OFF_POS - Board.HOME_POS + 1]
+                ).any(axis=1)
+                results.winners[finished] = colors[is_over]
+                results.points[finished] = 1 + is_gammon + is_backgammon
+                is_playing = ~is_over
+                checkers = checkers[is_playing]
+                colors = colors[is_playing]
+                game_indices = game_indices[is_playing]
+
+            # Pass the turn.
+            checkers = checkers[:, ::-1, :].copy()
+            colors = 1 - colors
+        return results
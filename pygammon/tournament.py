@@ -0,0 +1,218 @@
+"""Play many matches between two players across processes."""
+import argparse
+import importlib
+import inspect
+import multiprocessing
+import random
+import sys
+import time
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import TextIO
+from typing import Tuple
+from typing import Type
+
+import numpy as np
+
+from pygammon.neuralplayer import Network
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.pygammon import Forfeit
+from pygammon.pygammon import Game
+from pygammon.pygammon import Observer
+from pygammon.pygammon import Player
+from pygammon.pygammon import RandomDice
+
+def load_player_class(path: str) -> Type[Player]:
+    """Load a Player class from a dotted path such as
+    pygammon.randomplayer.RandomPlayer."""
+    module_name, _, class_name = path.rpartition('.')
+    if not module_name:
+        raise ValueError('Expected module.Class: {}'.format(path))
+    player_class = getattr(importlib.import_module(module_name), class_name)
+    if not (isinstance(player_class, type) and
+            issubclass(player_class, Player)):
+        raise ValueError('Not a Player class: {}'.format(path))
+    return player_class
+
+class PlayerFactory:
+    """Make players of a class given by a dotted path in the workers. If
+    weights is given, the network loaded from it is passed to the class,
+    like NeuralPlayer. Otherwise a class taking an rng argument, like
+    RandomPlayer, gets its own generator. Factories are picklable, so they
+    can be sent to the workers.
+    """
+
+    def __init__(self, path: str, weights: Optional[str] = None) -> None:
+        self.path = path
+        self.weights = weights
+        # Fail early rather than in every worker.
+        self.player_class = load_player_class(
+            path) # type: Callable[..., Player]
+
+    def __call__(self, rng: random.Random) -> Player:
+        """Make a player with its own generator."""
+        if self.weights is not None:
+            return self.player_class(Network.load(self.weights))
+        if 'rng' in inspect.signature(self.player_class).parameters:
+            return self.player_class(rng=rng)
+        return self.player_class()
+
+class TournamentStats(Observer):
+    """Count the results of the games played between two players. Lists are
+    indexed by player, 0 for the first player and 1 for the second, whatever
+    color they play.
+    """
+
+    def __init__(self) -> None:
+        self.matches = 0
+        self.match_wins = [0, 0]
+        self.games = 0
+        self.wins = [0, 0]
+        self.gammons = [0, 0]
+        self.backgammons = [0, 0]
+        self.forfeits = [0, 0]
+        self.points = [0, 0]
+        self.total_stakes = 0
+        # The color of the first player in the match being played.
+        self.first_color = Color.Black
+
+    def _get_player(self, color: Color) -> int:
+        """Get the index of the player playing the color."""
+        return 0 if self.first_color == color else 1
+
+    def on_forfeited(
+            self, game: Game, color: Color, reason: Forfeit) -> None:
+        self.forfeits[self._get_player(color)] += 1
+
+    def on_game_over(self, game: Game, winner: Color, score: int) -> None:
+        player = self._get_player(winner)
+        self.games += 1
+        self.wins[player] += 1
+        self.points[player] += score
+        self.total_stakes += game.stakes
+        if game.board.is_winner(winner):
+            if game.board.is_backgammon(winner):
+                self.backgammons[player] += 1
+            elif game.board.is_gammon(winner):
+                self.gammons[player] += 1
+
+    def on_match_over(self, game: Game, winner: Color) -> None:
+        self.matches += 1
+        self.match_wins[self._get_player(winner)] += 1
+
+    def merge(self, other: 'TournamentStats') -> None:
+        """Add the results of another tournament."""
+        self.matches += other.matches
+        self.games += other.games
+        self.total_stakes += other.total_stakes
+        for player in range(0, 2):
+            self.match_wins[player] += other.match_wins[player]
+            self.wins[player] += other.wins[player]
+            self.gammons[player] += other.gammons[player]
+            self.backgammons[player] += other.backgammons[player]
+            self.forfeits[player] += other.forfeits[player]
+            self.points[player] += other.points[player]
+
+    def print(self, names: List[str], seconds: float,
+              stream: Optional[TextIO] = None) -> None:
+        """Print the rates of each player and the games per second."""
+        if stream is None:
+            stream = sys.stdout
+        games = max(self.games, 1)
+        stream.write('{} matches, {} games in {:.2f}s ({:.1f} games/s)\n'
+                     .format(self.matches, self.games, seconds,
+                             self.games / seconds if 0 < seconds else 0.0))
+        stream.write('Average stakes: {:.3f}\n'.format(
+            self.total_stakes / games))
+        for player in range(0, 2):
+            stream.write(
+                '{}: matches {:.3f}, games {:.3f}, gammons {:.3f}, '
+                'backgammons {:.3f}, points/game {:.3f}, forfeits {}\n'.format(
+                    names[player],
+                    self.match_wins[player] / max(self.matches, 1),
+                    self.wins[player] / games,
+                    self.gammons[player] / games,
+                    self.backgammons[player] / games,
+                    self.points[player] / games,
+                    self.forfeits[player]))
+
+# Make a player given its own random generator. It must be picklable to be
+# sent to the workers, like PlayerFactory.
+PLAYER_FACTORY = Callable[[random.Random], Player]
+
+# The player factories, the index of the first match, the number of matches
+# and the seed of a chunk of matches.
+CHUNK = Tuple[PLAYER_FACTORY, PLAYER_FACTORY, int, int, int]
+
+def _play_chunk(chunk: CHUNK) -> TournamentStats:
+    """Play a chunk of matches in a worker. The players swap colors every
+    match, starting with the first player as Black in even matches."""
+    first_factory, second_factory, first_match, matches, seed = chunk
+    dice_seed, first_seed, second_seed = [
+        int(sequence.generate_state(1)[0])
+        for sequence in np.random.SeedSequence(seed).spawn(3)]
+    dice = RandomDice(np.random.default_rng(dice_seed))
+    players = [first_factory(random.Random(first_seed)),
+               second_factory(random.Random(second_seed))]
+    stats = TournamentStats()
+    for match in range(first_match, first_match + matches):
+        stats.first_color = Color.Black if 0 == match % 2 else Color.White
+        game = Game(Board(), stats, dice)
+        if Color.Black == stats.first_color:
+            game.play_match(players[0], players[1])
+        else:
+            game.play_match(players[1], players[0])
+    return stats
+
+def run_tournament(
+        first_factory: PLAYER_FACTORY, second_factory: PLAYER_FACTORY,
+        matches: int, workers: int = 1, seed: int = 0,
+        chunk_size: int = 10) -> TournamentStats:
+    """Play matches between two players made by factories such as
+    PlayerFactory. The matches are split into chunks with their own seeds,
+    so the results depend on the seed and chunk size but not on the number
+    of workers.
+    """
+    starts = list(range(0, matches, chunk_size))
+    seeds = [int(sequence.generate_state(1)[0]) for sequence in
+             np.random.SeedSequence(seed).spawn(len(starts))]
+    chunks = [(first_factory, second_factory, start,
+               min(chunk_size, matches - start), chunk_seed)
+              for start, chunk_seed in zip(starts, seeds)]
+    stats = TournamentStats()
+    if workers <= 1:
+        for chunk in chunks:
+            stats.merge(_play_chunk(chunk))
+        return stats
+    with multiprocessing.Pool(workers) as pool:
+        for chunk_stats in pool.imap_unordered(_play_chunk, chunks):
+            stats.merge(chunk_stats)
+    return stats
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run a tournament from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('first', help='dotted path of the first player')
+    parser.add_argument('second', help='dotted path of the second player')
+    parser.add_argument('--first-weights',
+                        help='network weights of the first player')
+    parser.add_argument('--second-weights',
+                        help='network weights of the second player')
+    parser.add_argument('--matches', type=int, default=100)
+    parser.add_argument('--workers', type=int,
+                        default=multiprocessing.cpu_count())
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-size', type=int, default=10)
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    stats = run_tournament(
+        PlayerFactory(args.first, args.first_weights),
+        PlayerFactory(args.second, args.second_weights), args.matches,
+        args.workers, args.seed, args.chunk_size)
+    seconds = time.perf_counter() - start
+    stats.print([args.first, args.second], seconds)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""Train a Network by TD(lambda) self-play.
+
+Each game is played with fixed weights, then learned from at once. The
+eligibility traces of offline TD(lambda) add up to the lambda-return: the
+error of each position is the sum of the later TD errors discounted by
+lambda. It takes one pass backwards over the game, and the gradients of all
+positions then combine in a couple of matrix multiplies.
+
+Positions are seen by the player who just moved, so the next position is
+worth one minus its value when the other player moved.
+"""
+import argparse
+import multiprocessing
+import multiprocessing.pool
+import os
+import sys
+import tempfile
+import time
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+
+from pygammon.neuralplayer import Network
+from pygammon.neuralplayer import NeuralPlayer
+from pygammon.neuralplayer import encode_keys
+from pygammon.pygammon import Backend
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.pygammon import DICE
+from pygammon.pygammon import Game
+from pygammon.pygammon import Move
+from pygammon.pygammon import Observer
+from pygammon.pygammon import RandomDice
+
+# The keys of the positions after each move, the color value of the player
+# who moved, and the color value of the winner.
+EXPERIENCE = Tuple[List[bytes], List[int], int]
+
+class ExperienceObserver(Observer):
+    """Keep the position after every move of a game."""
+
+    def __init__(self) -> None:
+        self.keys = [] # type: List[bytes]
+        self.movers = [] # type: List[int]
+        self.winner = Color.Black
+
+    def on_move_played(
+            self, game: Game, color: Color, dice: DICE, move: Move) -> None:
+        self.keys.append(game.board.get_key(color, []))
+        self.movers.append(color.value)
+
+    def on_game_over(self, game: Game, winner: Color, score: int) -> None:
+        self.winner = winner
+
+def play_game(network: Network, dice: RandomDice) -> EXPERIENCE:
+    """Play a game of the network against itself."""
+    observer = ExperienceObserver()
+    player = NeuralPlayer(network)
+    game = Game(Board(backend=Backend.ByteArray), observer, dice)
+    game.play_round(player, player)
+    return observer.keys, observer.movers, observer.winner.value
+
+def get_errors(
+        values: np.ndarray, movers: np.ndarray, winner: int,
+        trace_decay: float) -> np.ndarray:
+    """Get the lambda-return error of each position of a game."""
+    # The point of view flips whenever the other player moves next.
+    same_mover = movers[1:] == movers[:-1]
+    next_values = np.where(same_mover, values[1:], 1 - values[1:])
+    deltas = np.empty_like(values)
+    deltas[:-1] = next_values - values[:-1]
+    deltas[-1] = (1.0 if winner == movers[-1] else 0.0) - values[-1]
+    signs = np.where(same_mover, trace_decay, -trace_decay)
+    errors = np.empty_like(values)
+    errors[-1] = deltas[-1]
+    for index in range(len(values) - 2, -1, -1):
+        errors[index] = deltas[index] + signs[index] * errors[index + 1]
+    return errors
+
+def learn(network: Network, experience: EXPERIENCE, learning_rate: float,
+          trace_decay: float) -> None:
+    """Update the weights in place from a game."""
+    keys, movers, winner = experience
+    if 0 == len(keys):
+        return
+    inputs = encode_keys(keys)
+    hidden, values = network.forward(inputs)
+    errors = get_errors(values, np.array(movers), winner, trace_decay)
+    # Back-propagate the errors through the output sigmoid.
+    output_errors = (learning_rate * errors * values * (1 - values)).astype(
+        np.float32)
+    hidden_errors = output_errors[:, None] * \
+        network.output_weights[:, 0] * hidden * (1 - hidden)
+    network.output_weights += (hidden.T @ output_errors)[:, None]
+    network.output_biases += output_errors.sum()
+    network.hidden_weights += inputs.T @ hidden_errors
+    network.hidden_biases += hidden_errors.sum(axis=0)
+
+def _play_games(task: Tuple[str, int, int]) -> List[EXPERIENCE]:
+    """Play games in a worker with the weights saved at a path."""
+    path, games, seed = task
+    network = Network.load(path)
+    dice = RandomDice(np.random.default_rng(seed))
+    return [play_game(network, dice) for _ in range(0, games)]
+
+class Trainer:
+    """Train a network by self-play, playing games in worker processes if
+    asked. Workers play a batch of games with the same weights, read from a
+    memory-mapped snapshot, and send back the positions to learn from.
+    """
+
+    def __init__(
+            self, network: Network, learning_rate: float = 0.1,
+            trace_decay: float = 0.7, seed: int = 0) -> None:
+        self.network = network
+        self.learning_rate = learning_rate
+        self.trace_decay = trace_decay
+        self.games = 0
+        self._seeds = np.random.SeedSequence(seed)
+        self._dice = RandomDice(np.random.default_rng(self._seeds.spawn(1)[0]))
+
+    def train(self, games: int, workers: int = 1,
+              checkpoint_path: Optional[str] = None,
+              checkpoint_every: int = 1000, batch_size: int = 50) -> None:
+        """Play and learn from games, saving the weights to the checkpoint
+        path every checkpoint_every games and at the end."""
+        next_checkpoint = self.games + checkpoint_every
+        end = self.games + games
+        pool = multiprocessing.Pool(workers) if 1 < workers else None
+        try:
+            while self.games < end:
+                batch = min(batch_size, end - self.games)
+                for experience in self._collect(batch, workers, pool):
+                    learn(self.network, experience, self.learning_rate,
+                          self.trace_decay)
+                self.games += batch
+                if checkpoint_path is not None and \
+                        next_checkpoint <= self.games:
+                    self.save(checkpoint_path)
+                    next_checkpoint += checkpoint_every
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        if checkpoint_path is not None:
+            self.save(checkpoint_path)
+
+    def _collect(self, games: int, workers: int,
+                 pool: Optional[multiprocessing.pool.Pool]) \
+            -> List[EXPERIENCE]:
+        """Play games with the current weights."""
+        if pool is None:
+            return [play_game(self.network, self._dice)
+                    for _ in range(0, games)]
+        handle, path = tempfile.mkstemp(suffix='.net')
+        os.close(handle)
+        try:
+            self.network.save(path)
+            sizes = [games // workers + (1 if worker < games % workers else 0)
+                     for worker in range(0, workers)]
+            tasks = [(path, size, int(seed.generate_state(1)[0]))
+                     for size, seed in zip(
+                         sizes, self._seeds.spawn(workers)) if 0 < size]
+            experiences = [] # type: List[EXPERIENCE]
+            for worker_experiences in pool.map(_play_games, tasks):
+                experiences.extend(worker_experiences)
+            return experiences
+        finally:
+            os.remove(path)
+
+    def save(self, path: str) -> None:
+        """Write the weights, replacing the file only once complete."""
+        temporary_path = path + '.tmp'
+        self.network.save(temporary_path)
+        os.replace(temporary_path, path)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Train a network from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('path', help='weights to train, created if missing')
+    parser.add_argument('--games', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--hidden', type=int, default=40)
+    parser.add_argument('--learning-rate', type=float, default=0.1)
+    parser.add_argument('--trace-decay', type=float, default=0.7)
+    parser.add_argument('--checkpoint-every', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    if os.path.exists(args.path):
+        network = Network.load(args.path, writable=True)
+    else:
+        network = Network.create(
+            args.hidden, np.random.default_rng(args.seed))
+    trainer = Trainer(
+        network, args.learning_rate, args.trace_decay, args.seed)
+    start = time.perf_counter()
+    trainer.train(args.games, args.workers, args.path, args.checkpoint_every)
+    seconds = time.perf_counter() - start
+    sys.stdout.write('Trained {} games in {:.1f}s ({:.0f} games/minute)\n'
+                     .format(args.games, seconds, 60 * args.games / seconds))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+from typing import Any, Iterator, Optional, Sequence, Tuple, Union
+
+from . import random as random
+from . import testing as testing
+
+inf = ...  # type: float
+
+class generic: ...
+class int8(generic): ...
+class int32(generic): ...
+class int64(generic): ...
+class uint8(generic): ...
+class float32(generic): ...
+class float64(generic): ...
+
+_Shape = Union[int, Sequence[int]]
+
+class ndarray:
+    shape = ...  # type: Tuple[int, ...]
+    ndim = ...  # type: int
+    size = ...  # type: int
+    dtype = ...  # type: Any
+    T = ...  # type: ndarray
+    def __len__(self) -> int: ...
+    def __iter__(self) -> Iterator[Any]: ...
+    def __getitem__(self, key: Any) -> Any: ...
+    def __setitem__(self, key: Any, value: Any) -> None: ...
+    def __bool__(self) -> bool: ...
+    def __int__(self) -> int: ...
+    def __float__(self) -> float: ...
+    def __neg__(self) -> ndarray: ...
+    def __invert__(self) -> ndarray: ...
+    def __add__(self, other: Any) -> ndarray: ...
+    def __radd__(self, other: Any) -> ndarray: ...
+    def __iadd__(self, other: Any) -> ndarray: ...
+    def __sub__(self, other: Any) -> ndarray: ...
+    def __rsub__(self, other: Any) -> ndarray: ...
+    def __isub__(self, other: Any) -> ndarray: ...
+    def __mul__(self, other: Any) -> ndarray: ...
+    def __rmul__(self, other: Any) -> ndarray: ...
+    def __imul__(self, other: Any) -> ndarray: ...
+    def __truediv__(self, other: Any) -> ndarray: ...
+    def __rtruediv__(self, other: Any) -> ndarray: ...
+    def __itruediv__(self, other: Any) -> ndarray: ...
+    def __floordiv__(self, other: Any) -> ndarray: ...
+    def __rfloordiv__(self, other: Any) -> ndarray: ...
+    def __mod__(self, other: Any) -> ndarray: ...
+    def __pow__(self, other: Any) -> ndarray: ...
+    def __rpow__(self, other: Any) -> ndarray: ...
+    def __matmul__(self, other: Any) -> ndarray: ...
+    def __rmatmul__(self, other: Any) -> ndarray: ...
+    def __and__(self, other: Any) -> ndarray: ...
+    def __rand__(self, other: Any) -> ndarray: ...
+    def __iand__(self, other: Any) -> ndarray: ...
+    def __or__(self, other: Any) -> ndarray: ...
+    def __ror__(self, other: Any) -> ndarray: ...
+    def __ior__(self, other: Any) -> ndarray: ...
+    def __xor__(self, other: Any) -> ndarray: ...
+    def __lshift__(self, other: Any) -> ndarray: ...
+    def __rshift__(self, other: Any) -> ndarray: ...
+    def __lt__(self, other: Any) -> ndarray: ...
+    def __le__(self, other: Any) -> ndarray: ...
+    def __gt__(self, other: Any) -> ndarray: ...
+    def __ge__(self, other: Any) -> ndarray: ...
+    def __eq__(self, other: Any) -> Any: ...
+    def __ne__(self, other: Any) -> Any: ...
+    def tolist(self) -> Any: ...
+    def tobytes(self) -> bytes: ...
+    def item(self) -> Any: ...
+    def astype(self, dtype: Any) -> ndarray: ...
+    def copy(self) -> ndarray: ...
+    def reshape(self, *shape: Any) -> ndarray: ...
+    def ravel(self) -> ndarray: ...
+    def nonzero(self) -> Tuple[ndarray, ...]: ...
+    def fill(self, value: Any) -> None: ...
+    def sum(self, axis: Optional[int] = ...) -> Any: ...
+    def mean(self, axis: Optional[int] = ...) -> Any: ...
+    def max(self, axis: Optional[int] = ...) -> Any: ...
+    def min(self, axis: Optional[int] = ...) -> Any: ...
+    def argmax(self, axis: Optional[int] = ...) -> Any: ...
+    def argmin(self, axis: Optional[int] = ...) -> Any: ...
+    def any(self, axis: Optional[int] = ...) -> Any: ...
+    def all(self, axis: Optional[int] = ...) -> Any: ...
+    def cumsum(self, axis: Optional[int] = ...) -> ndarray: ...
+
+class memmap(ndarray):
+    def __init__(self, filename: Any, dtype: Any = ..., mode: str = ...,
+                 offset: int = ..., shape: Optional[_Shape] = ...) -> None: ...
+
+def array(object: Any, dtype: Any = ...) -> ndarray: ...
+def asarray(object: Any, dtype: Any = ...) -> ndarray: ...
+def ascontiguousarray(object: Any, dtype: Any = ...) -> ndarray: ...
+def frombuffer(buffer: Any, dtype: Any = ...) -> ndarray: ...
+def zeros(shape: _Shape, dtype: Any = ...) -> ndarray: ...
+def zeros_like(a: Any, dtype: Any = ...) -> ndarray: ...
+def empty(shape: _Shape, dtype: Any = ...) -> ndarray: ...
+def empty_like(a: Any, dtype: Any = ...) -> ndarray: ...
+def full(shape: _Shape, fill_value: Any, dtype: Any = ...) -> ndarray: ...
+def arange(start: int, stop: Optional[int] = ..., step: int = ...,
+           dtype: Any = ...) -> ndarray: ...
+def tile(a: Any, reps: Any) -> ndarray: ...
+def concatenate(arrays: Sequence[Any], axis: int = ...) -> ndarray: ...
+def where(condition: Any, x: Any = ..., y: Any = ...) -> Any: ...
+def flatnonzero(a: Any) -> ndarray: ...
+def argsort(a: Any, axis: int = ..., kind: Optional[str] = ...) -> ndarray: ...
+def argmax(a: Any, axis: Optional[int] = ...) -> Any: ...
+def cumsum(a: Any, axis: Optional[int] = ...) -> ndarray: ...
+def dot(a: Any, b: Any) -> Any: ...
+def mean(a: Any, axis: Optional[int] = ...) -> Any: ...
+def std(a: Any, axis: Optional[int] = ..., ddof: int = ...) -> Any: ...
+def sqrt(x: Any) -> Any: ...
+def exp(x: Any) -> Any: ...
+def maximum(x1: Any, x2: Any) -> Any: ...
+def minimum(x1: Any, x2: Any) -> Any: ...
+def clip(a: Any, a_min: Any, a_max: Any) -> Any: ...
+def isin(element: Any, test_elements: Any) -> ndarray: ...
+def isfinite(x: Any) -> Any: ...
+def array_equal(a1: Any, a2: Any) -> bool: ...
+def allclose(a: Any, b: Any) -> bool: ...
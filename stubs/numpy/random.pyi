@@ -0,0 +1,27 @@
+from typing import Any, List, Optional, Sequence, Union
+
+from . import ndarray
+
+_Seed = Union[None, int, Sequence[int], SeedSequence]
+
+class SeedSequence:
+    def __init__(
+        self, entropy: Optional[Union[int, Sequence[int]]] = ...) -> None: ...
+    def spawn(self, n_children: int) -> List[SeedSequence]: ...
+    def generate_state(self, n_words: int) -> ndarray: ...
+
+class Generator:
+    def integers(self, low: int, high: Optional[int] = ...,
+                 size: Any = ...) -> Any: ...
+    def uniform(self, low: float = ..., high: float = ...,
+                size: Any = ...) -> Any: ...
+    def random(self, size: Any = ...) -> Any: ...
+    def choice(self, a: Any, size: Any = ..., replace: bool = ...) -> Any: ...
+    def permutation(self, x: Any) -> ndarray: ...
+
+class RandomState:
+    def __init__(self, seed: Optional[int] = ...) -> None: ...
+    def randint(self, low: int, high: Optional[int] = ...,
+                size: Any = ...) -> Any: ...
+
+def default_rng(seed: _Seed = ...) -> Generator: ...
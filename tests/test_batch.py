@@ -0,0 +1,123 @@
+"""Tests for batches of positions."""
+import random
+from typing import List
+from typing import Optional
+import unittest
+
+import numpy as np
+
+from pygammon.batch import BoardBatch
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.pygammon import Move
+from pygammon.pygammon import Submove
+from pygammon.randomboard import scatter_checkers
+
+def make_random_boards(count: int) -> list:
+    """Scatter checkers over boards, with some of them bearing off."""
+    rng = random.Random(0)
+    boards = []
+    for board_index in range(0, count):
+        board = Board()
+        first_pos = Board.HOME_POS if 0 == board_index % 3 else 1
+        for color in Color:
+            scatter_checkers(
+                board, color, rng,
+                [Board.BAR_POS] + list(range(first_pos, 25)),
+                rng.randint(1, 15))
+        boards.append(board)
+    return boards
+
+class TestBoardBatch(unittest.TestCase):
+    """Tests for BoardBatch."""
+
+    def setUp(self):
+        self.boards = make_random_boards(60)
+        self.colors = [list(Color)[index % 2]
+                       for index in range(0, len(self.boards))]
+        self.batch = BoardBatch.from_boards(self.boards, self.colors)
+
+    def test_submove_mask(self):
+        """Make sure the mask agrees with Board.list_submoves."""
+        mask = self.batch.submove_mask()
+        self.assertEqual(mask.shape, (len(self.boards), 25, 6))
+        for index, (board, color) in enumerate(
+                zip(self.boards, self.colors)):
+            for die in range(1, 7):
+                self.assertEqual(
+                    self.batch.list_submoves(index, die, mask),
+                    board.list_submoves(color, die))
+
+    def test_is_valid_submove(self):
+        """Make sure single submoves are checked like Board does."""
+        rng = np.random.RandomState(0)
+        sources = rng.randint(-1, 27, size=len(self.boards))
+        dice = rng.randint(0, 8, size=len(self.boards))
+        valid = self.batch.is_valid_submove(sources, dice)
+        for index, (board, color) in enumerate(
+                zip(self.boards, self.colors)):
+            submove = Submove(int(sources[index]), int(dice[index]))
+            self.assertEqual(
+                valid[index], submove in board.list_submoves(
+                    color, submove.die) if 1 <= submove.die <= 6 else False)
+
+    def test_list_moves(self):
+        """Make sure the moves match Board.list_moves."""
+        dice = np.array([[1 + index % 6, 1 + index // 6 % 6]
+                         for index in range(0, len(self.boards))])
+        has_legal_move = self.batch.has_legal_move(dice)
+        for index, (board, color) in enumerate(
+                zip(self.boards, self.colors)):
+            moves = board.list_moves(color, dice[index].tolist())
+            self.assertEqual(
+                self.batch.list_moves(index, dice[index].tolist()), moves)
+            self.assertEqual(has_legal_move[index], 0 < len(moves))
+
+    def test_to_board(self):
+        """Make sure converting back gives the same position."""
+        board = self.batch.to_board(1)
+        self.assertEqual(
+            list(board.get_board(Color.Black)),
+            list(self.boards[1].get_board(Color.White)))
+        self.assertEqual(
+            list(board.get_board(Color.White)),
+            list(self.boards[1].get_board(Color.Black)))
+
+    def test_do_moves(self):
+        """Make sure moves are played like Board.do_move."""
+        rng = random.Random(0)
+        moves = [] # type: List[Optional[Move]]
+        for index, (board, color) in enumerate(
+                zip(self.boards, self.colors)):
+            legal_moves = board.list_moves(
+                color, [1 + index % 6, 1 + index // 6 % 6])
+            if 0 == len(legal_moves) or 0 == index % 7:
+                moves.append(None)
+                continue
+            move = rng.choice(legal_moves)
+            board.do_move(color, move)
+            moves.append(move)
+        self.batch.do_moves(moves)
+        expected = BoardBatch.from_boards(self.boards, self.colors)
+        self.assertEqual(
+            self.batch.checkers.tolist(), expected.checkers.tolist())
+
+    def test_choose_random_moves(self):
+        """Make sure the random moves reach positions of legal moves."""
+        rng = np.random.default_rng(0)
+        for offset in range(0, 36, 7):
+            dice = np.array([[1 + (index + offset) % 6,
+                              1 + (index + offset) // 6 % 6]
+                             for index in range(0, len(self.boards))])
+            moves = self.batch.choose_random_moves(dice, rng)
+            for index, (board, color) in enumerate(
+                    zip(self.boards, self.colors)):
+                keys = {key for _, key in board.list_moves_with_keys(
+                    color, dice[index].tolist())}
+                move = moves[index]
+                if move is None:
+                    self.assertEqual(0, len(keys))
+                    continue
+                did_hits = board.do_move(color, move)
+                self.assertIn(board.get_key(color, []), keys)
+                board.undo_move(color, move, did_hits)
@@ -0,0 +1,122 @@
+"""Tests for the bear-off database."""
+import itertools
+import os
+import tempfile
+from typing import Dict
+from typing import Tuple
+from typing import cast
+import unittest
+
+import numpy as np
+
+from pygammon.bearoff import BearoffDatabase
+from pygammon.bearoff import count_positions
+from pygammon.bearoff import rank_position
+from pygammon.bearoff import write_database
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+
+MAX_CHECKERS = 3
+
+def make_board(counts: Tuple[int, ...]) -> Board:
+    """Put Black's checkers on points 1 to 6 and everything else off."""
+    board = Board()
+    for point, checkers in enumerate(counts, 1):
+        board.set_checkers(
+            Color.Black, Board.BEARING_OFF_POS - point, checkers)
+    board.set_checkers(
+        Color.Black, Board.BEARING_OFF_POS, 15 - sum(counts))
+    board.set_checkers(Color.White, Board.BEARING_OFF_POS, 15)
+    return board
+
+def get_expected_rolls(
+        counts: Tuple[int, ...], memo: Dict[Tuple[int, ...], float]) -> float:
+    """Compute the expected rolls by playing every move of every roll."""
+    if 0 == sum(counts):
+        return 0.0
+    if counts not in memo:
+        board = make_board(counts)
+        expected = 1.0
+        for dice in itertools.product(range(1, 7), repeat=2):
+            best = float('inf')
+            for move in board.list_moves(Color.Black, list(dice)):
+                did_hits = board.do_move(Color.Black, move)
+                after = tuple(board.get_checkers(
+                    Color.Black, Board.BEARING_OFF_POS - point)
+                              for point in range(1, 7))
+                board.undo_move(Color.Black, move, did_hits)
+                best = min(best, get_expected_rolls(after, memo))
+            expected += best / 36
+        memo[counts] = expected
+    return memo[counts]
+
+class TestBearoff(unittest.TestCase):
+    """Tests for the bear-off database."""
+
+    # Set up once for the class, since generating takes a while.
+    path = ''
+    database = cast(BearoffDatabase, None)
+
+    @classmethod
+    def setUpClass(cls):
+        handle, cls.path = tempfile.mkstemp()
+        os.close(handle)
+        write_database(cls.path, MAX_CHECKERS)
+        cls.database = BearoffDatabase(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.database
+        os.remove(cls.path)
+
+    def test_rank(self):
+        """Make sure every position has its own index."""
+        positions = [counts for counts in itertools.product(
+            range(0, MAX_CHECKERS + 1), repeat=6)
+                     if sum(counts) <= MAX_CHECKERS]
+        ranks = sorted(rank_position(counts, MAX_CHECKERS)
+                       for counts in positions)
+        self.assertEqual(ranks, list(range(0, count_positions(MAX_CHECKERS))))
+        self.assertEqual(len(self.database), count_positions(MAX_CHECKERS))
+        self.assertEqual(count_positions(15), 54264)
+
+    def test_expected_rolls(self):
+        """Make sure the expected rolls agree with playing every move."""
+        memo = {} # type: Dict[Tuple[int, ...], float]
+        for counts in itertools.product(
+                range(0, MAX_CHECKERS + 1), repeat=6):
+            if MAX_CHECKERS < sum(counts):
+                continue
+            board = make_board(counts)
+            self.assertTrue(self.database.includes(board, Color.Black))
+            self.assertAlmostEqual(
+                self.database.get_expected_rolls(board, Color.Black),
+                get_expected_rolls(counts, memo), places=5)
+            distribution = self.database.get_distribution(
+                board, Color.Black)
+            self.assertAlmostEqual(float(distribution.sum()), 1.0, places=5)
+            self.assertAlmostEqual(
+                float(distribution @ np.arange(len(distribution))),
+                self.database.get_expected_rolls(board, Color.Black),
+                places=5)
+
+    def test_known_positions(self):
+        """Make sure a few positions have their well known values."""
+        board = make_board((2, 0, 0, 0, 0, 0))
+        self.assertAlmostEqual(
+            self.database.get_expected_rolls(board, Color.Black), 1.0)
+        board = make_board((0, 0, 0, 0, 0, 1))
+        # Only 1-1, 1-2, 1-3, 1-4 and 2-3 fail to bear off at once.
+        self.assertAlmostEqual(
+            float(self.database.get_distribution(board, Color.Black)[1]),
+            1 - 9 / 36, places=6)
+
+    def test_includes(self):
+        """Make sure positions outside of the database are rejected."""
+        board = Board()
+        board.setup()
+        self.assertFalse(self.database.includes(board, Color.Black))
+        with self.assertRaises(ValueError):
+            self.database.get_rank(board, Color.Black)
+        board = make_board((4, 0, 0, 0, 0, 0))
+        self.assertFalse(self.database.includes(board, Color.Black))
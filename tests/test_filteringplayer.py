@@ -0,0 +1,81 @@
+"""Tests for the filtering player."""
+import io
+import unittest
+
+import numpy as np
+
+from pygammon.filteringplayer import FilteringPlayer
+from pygammon.filteringplayer import STATIC_WEIGHTS
+from pygammon.filteringplayer import Stage
+from pygammon.filteringplayer import StageFilter
+from pygammon.neuralplayer import Network
+from pygammon.neuralplayer import NeuralPlayer
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.searchplayer import SearchPlayer
+
+class TestFilteringPlayer(unittest.TestCase):
+    """Tests for FilteringPlayer."""
+
+    def setUp(self):
+        self.network = Network.create(10, np.random.default_rng(0))
+        self.board = Board()
+        self.board.setup()
+
+    def test_select(self):
+        """Make sure the best moves and those close to them pass."""
+        scores = np.array([0.1, 0.5, 0.45, 0.3, 0.5])
+        self.assertEqual([1, 4], StageFilter(1, 0.0).select(scores).tolist())
+        self.assertEqual([1, 4, 2],
+                         StageFilter(1, 0.1).select(scores).tolist())
+        self.assertEqual([1, 4, 2, 3],
+                         StageFilter(4, 0.0).select(scores).tolist())
+
+    def test_static_stage(self):
+        """Make sure a static stage passing one move decides alone."""
+        player = FilteringPlayer(self.network, StageFilter(1, -1.0))
+        move = player.choose_move(self.board, Color.Black, [3, 1])
+        best_score = None
+        for legal_move, _, features in self.board.list_moves_with_features(
+                Color.Black, [3, 1]):
+            score = np.dot(features, STATIC_WEIGHTS)
+            if best_score is None or best_score < score:
+                best_score = score
+                best_move = legal_move
+        self.assertEqual(best_move, move)
+        self.assertEqual(0, player.stats.candidates[Stage.Neural.value])
+
+    def test_stages(self):
+        """Make sure passing every move matches the stage run alone."""
+        everything = StageFilter(100)
+        player = FilteringPlayer(self.network, everything, everything)
+        for dice in ([6, 5], [2, 2], [4, 1]):
+            self.assertEqual(
+                SearchPlayer(self.network, 2).choose_move(
+                    self.board, Color.White, dice),
+                player.choose_move(self.board, Color.White, dice))
+        neural_player = FilteringPlayer(
+            self.network, everything, StageFilter(1, -1.0))
+        self.assertEqual(
+            NeuralPlayer(self.network).choose_move(
+                self.board, Color.White, [6, 5]),
+            neural_player.choose_move(self.board, Color.White, [6, 5]))
+        stats = player.stats
+        self.assertEqual(3, stats.decisions)
+        self.assertEqual(stats.candidates[Stage.Static.value],
+                         stats.candidates[Stage.Deep.value])
+        stream = io.StringIO()
+        stats.print(stream)
+        self.assertIn('Deep', stream.getvalue())
+
+    def test_rollout_stage(self):
+        """Make sure the deep stage can roll the moves out."""
+        board = Board()
+        for pos in range(Board.HOME_POS, Board.BEARING_OFF_POS):
+            board.set_checkers(Color.Black, pos, 1)
+            board.set_checkers(Color.White, pos, 1)
+        player = FilteringPlayer(
+            self.network, neural_filter=StageFilter(2), rollout_trials=1)
+        move = player.choose_move(board, Color.Black, [2, 1])
+        self.assertIn(move, board.list_moves(Color.Black, [2, 1]))
+        self.assertEqual(2, player.stats.candidates[Stage.Deep.value])
@@ -0,0 +1,110 @@
+"""Tests for the neural network player."""
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from pygammon.neuralplayer import INPUTS
+from pygammon.neuralplayer import Network
+from pygammon.neuralplayer import NeuralPlayer
+from pygammon.neuralplayer import encode_keys
+from pygammon.pygammon import AcceptCommand
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.pygammon import Game
+from pygammon.pygammon import Observer
+from pygammon.pygammon import RandomDice
+from pygammon.pygammon import ResignCommand
+from pygammon.randomplayer import RandomPlayer
+
+class TestNeuralPlayer(unittest.TestCase):
+    """Tests for NeuralPlayer."""
+
+    def setUp(self):
+        self.network = Network.create(20, np.random.default_rng(0))
+
+    def test_encode(self):
+        """Make sure points are encoded with the TD-Gammon units."""
+        board = Board()
+        board.setup()
+        board.set_checkers(Color.Black, 6, 5)
+        board.set_checkers(Color.Black, Board.BAR_POS, 1)
+        inputs = encode_keys([board.get_key(Color.Black, [])])
+        self.assertEqual(inputs.shape, (1, INPUTS))
+        # Black's 6 point comes fifth among its 24 points.
+        self.assertEqual(inputs[0, 5 * 4:6 * 4].tolist(), [1, 1, 1, 1])
+        # White's 24 point is its first.
+        self.assertEqual(inputs[0, 96:100].tolist(), [1, 1, 0, 0])
+        self.assertEqual(inputs[0, 192:194].tolist(), [0.5, 0])
+        self.assertEqual(inputs[0, 197], 1)
+
+    def test_save_and_load(self):
+        """Make sure loaded weights give the same scores."""
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            self.network.save(path)
+            board = Board()
+            board.setup()
+            inputs = encode_keys(
+                [key for _, key in board.list_moves_with_keys(
+                    Color.Black, [6, 5])])
+            for writable in (False, True):
+                network = Network.load(path, writable)
+                self.assertTrue(np.allclose(
+                    network.evaluate(inputs), self.network.evaluate(inputs)))
+                del network
+        finally:
+            os.remove(path)
+
+    def test_choose_move(self):
+        """Make sure the move reaching the best position is chosen."""
+        rng = random.Random(0)
+        player = NeuralPlayer(self.network)
+        board = Board()
+        board.setup()
+        for _ in range(0, 10):
+            dice = [rng.randint(1, 6), rng.randint(1, 6)]
+            move = player.choose_move(board, Color.Black, dice)
+            best_score = -1.0
+            for legal_move, after in board.list_moves_with_positions(
+                    Color.Black, dice):
+                score = self.network.evaluate(encode_keys(
+                    [after.get_key(Color.Black, [])]))[0]
+                if best_score < score:
+                    best_score = score
+                    best_move = legal_move
+            self.assertEqual(move, best_move)
+        self.assertIsNone(player.choose_move(Board(), Color.Black, [1, 2]))
+
+    def test_accept_or_resign(self):
+        """Make sure a hopeless double is resigned and a winning one
+        accepted."""
+        # A network liking the checkers borne off by the player who just
+        # moved and disliking those of its opponent.
+        hidden_weights = np.zeros((INPUTS, 1), dtype=np.float32)
+        hidden_weights[194, 0] = 10.0
+        hidden_weights[195, 0] = -10.0
+        player = NeuralPlayer(Network(
+            hidden_weights, np.zeros(1, dtype=np.float32),
+            np.full((1, 1), 20.0, dtype=np.float32),
+            np.full(1, -10.0, dtype=np.float32)))
+        board = Board()
+        board.set_checkers(Color.White, Board.HOME_POS, 15)
+        board.set_checkers(Color.Black, Board.HOME_POS, 1)
+        board.set_checkers(Color.Black, Board.BEARING_OFF_POS, 14)
+        game = Game(board, Observer())
+        self.assertIsInstance(player.accept_or_resign(Color.Black, game),
+                              ResignCommand)
+        self.assertIsInstance(player.accept_or_resign(Color.White, game),
+                              AcceptCommand)
+
+    def test_play(self):
+        """Make sure the player plays legal games."""
+        game = Game(Board(), Observer(), RandomDice(np.random.default_rng(0)))
+        game.play_round(NeuralPlayer(self.network),
+                        RandomPlayer(random.Random(0)))
+        self.assertTrue(game.board.is_winner(Color.Black) or
+                        game.board.is_winner(Color.White))
@@ -1,10 +1,39 @@
 """Tests for backgammon engine."""
+from collections import Counter
+import contextlib
+import io
+import random
+from typing import List
 import unittest
 
+import numpy as np
+
+from pygammon.pygammon import Backend
 from pygammon.pygammon import Board
 from pygammon.pygammon import Color
+from pygammon.pygammon import ConsoleObserver
+from pygammon.pygammon import DICE
+from pygammon.pygammon import Feature
+from pygammon.pygammon import Game
 from pygammon.pygammon import Submove
 from pygammon.pygammon import Move
+from pygammon.pygammon import MoveCache
+from pygammon.pygammon import Observer
+from pygammon.pygammon import RandomDice
+from pygammon.pygammon import ReplayDice
+from pygammon.randomboard import scatter_checkers
+from pygammon.randomplayer import RandomPlayer
+
+def make_random_board(
+        rng: random.Random, backend: Backend = Backend.NumPy) -> Board:
+    """Scatter checkers of both colors over the board."""
+    board = Board(backend=backend)
+    for color in Color:
+        scatter_checkers(
+            board, color, rng,
+            [Board.BAR_POS] + list(range(1, 25)) * 2 +
+            list(range(Board.HOME_POS, Board.BEARING_OFF_POS)) * 3, 15)
+    return board
 
 class TestColor(unittest.TestCase):
     """Tests for Color."""
@@ -28,6 +57,18 @@ class TestSubmove(unittest.TestCase):
         second = Submove(1, 2)
         self.assertTrue(first != second)
 
+    def test_get_shared(self):
+        """Test that legal submoves are shared."""
+        self.assertIs(Submove.get(3, 4), Submove.get(3, 4))
+        self.assertEqual(Submove.get(3, 4), Submove(3, 4))
+        self.assertEqual(Submove.get(3, 9), Submove(3, 9))
+
+    def test_immutable(self):
+        """Test that submoves can't be changed."""
+        submove = Submove.get(3, 4)
+        with self.assertRaises(AttributeError):
+            submove.die = 5 # type: ignore
+
 class TestMove(unittest.TestCase):
     """Tests for Move."""
 
@@ -46,6 +87,15 @@ class TestMove(unittest.TestCase):
         second = Move([Submove(1, 1)])
         self.assertTrue(first != second)
 
+    def test_hash(self):
+        """Test that equal moves hash the same."""
+        first = Move([Submove(1, 1), Submove(3, 2)])
+        second = Move([Submove.get(1, 1), Submove.get(3, 2)])
+        third = Move([Submove(3, 2), Submove(1, 1)])
+        self.assertEqual(hash(first), hash(second))
+        self.assertIn(second, {first})
+        self.assertNotIn(third, {first})
+
 class TestBoard(unittest.TestCase):
     """Tests for Board."""
 
@@ -76,6 +126,21 @@ class TestBoard(unittest.TestCase):
         self.assertEqual(submove.destination(), 2)
         self.assertTrue(board.is_valid_submove(Color.Black, submove))
 
+    def test_list_submoves_agrees_with_is_valid_submove(self):
+        """Make sure listing submoves applies the rules of each submove."""
+        rng = random.Random(5)
+        for _ in range(0, 20):
+            board = make_random_board(rng, Backend.ByteArray)
+            for color in Color:
+                for die in range(1, 7):
+                    self.assertEqual(
+                        board.list_submoves(color, die),
+                        [Submove(pos, die)
+                         for pos in range(
+                             Board.BAR_POS, Board.BEARING_OFF_POS)
+                         if board.is_valid_submove(
+                             color, Submove(pos, die))])
+
     def test_is_valid_submove_blocked(self):
         """Make sure blocked move is illegal."""
         board = Board()
@@ -84,6 +149,45 @@ class TestBoard(unittest.TestCase):
         submove = Submove(1, 1)
         self.assertFalse(board.is_valid_submove(Color.Black, submove))
 
+    def test_undo_submove(self):
+        """Make sure undoing a submove restores the board."""
+        board = Board()
+        board.set_checkers(Color.Black, 1, 2)
+        submove = Submove(1, 2)
+        did_hit = board.do_submove(Color.Black, submove)
+        self.assertFalse(did_hit)
+        self.assertEqual(board.get_checkers(Color.Black, 3), 1)
+        board.undo_submove(Color.Black, submove, did_hit)
+        self.assertEqual(board.get_checkers(Color.Black, 1), 2)
+        self.assertEqual(board.get_checkers(Color.Black, 3), 0)
+
+    def test_undo_submove_hit(self):
+        """Make sure undoing a hit brings the blot back from the bar."""
+        board = Board()
+        board.set_checkers(Color.Black, 1, 1)
+        board.set_opposite_checkers(Color.Black, 3, 1)
+        submove = Submove(1, 2)
+        did_hit = board.do_submove(Color.Black, submove)
+        self.assertTrue(did_hit)
+        self.assertEqual(board.get_checkers(Color.White, Board.BAR_POS), 1)
+        self.assertEqual(board.get_opposite_checkers(Color.Black, 3), 0)
+        board.undo_submove(Color.Black, submove, did_hit)
+        self.assertEqual(board.get_checkers(Color.Black, 1), 1)
+        self.assertEqual(board.get_checkers(Color.Black, 3), 0)
+        self.assertEqual(board.get_checkers(Color.White, Board.BAR_POS), 0)
+        self.assertEqual(board.get_opposite_checkers(Color.Black, 3), 1)
+
+    def test_list_moves_keeps_board(self):
+        """Make sure listing moves leaves the board as it was."""
+        board = Board()
+        board.setup()
+        board.set_opposite_checkers(Color.Black, 5, 1)
+        black_board = list(board.get_board(Color.Black))
+        white_board = list(board.get_board(Color.White))
+        board.list_moves(Color.Black, [4, 4])
+        self.assertEqual(list(board.get_board(Color.Black)), black_board)
+        self.assertEqual(list(board.get_board(Color.White)), white_board)
+
     def test_list_moves(self):
         """Make sure we return moves in both orders."""
         board = Board()
@@ -146,6 +250,261 @@ class TestBoard(unittest.TestCase):
         second = move.pop()
         self.assertEqual(second.die, 2)
 
+    def test_undo_move(self):
+        """Make sure undoing a move restores the board."""
+        board = Board()
+        board.setup()
+        board.set_opposite_checkers(Color.Black, 5, 1)
+        key = board.key()
+        move = Move([Submove(5, 4), Submove(1, 4)])
+        did_hits = board.do_move(Color.Black, move)
+        self.assertEqual(did_hits, [True, False])
+        board.undo_move(Color.Black, move, did_hits)
+        self.assertEqual(board.key(), key)
+
+    def test_list_unique_moves(self):
+        """Make sure each resulting position is listed once."""
+        board = Board()
+        board.setup()
+        moves = board.list_moves(Color.Black, [6, 5])
+        unique_moves = board.list_unique_moves(Color.Black, [6, 5])
+        self.assertLess(len(unique_moves), len(moves))
+        keys = set()
+        for move in moves:
+            did_hits = board.do_move(Color.Black, move)
+            keys.add(board.key())
+            board.undo_move(Color.Black, move, did_hits)
+        self.assertEqual(len(unique_moves), len(keys))
+
+    def test_list_moves_with_positions(self):
+        """Make sure the attached positions are the ones the moves reach."""
+        board = Board()
+        board.setup()
+        key = board.key()
+        for move, position in board.list_moves_with_positions(
+                Color.Black, [3, 3]):
+            expected = board.copy()
+            expected.do_move(Color.Black, move)
+            self.assertEqual(position.key(), expected.key())
+        self.assertEqual(board.key(), key)
+
+    def test_hash_is_incremental(self):
+        """Make sure the hash kept by do_submove matches a fresh one."""
+        board = Board()
+        board.setup()
+        board.set_opposite_checkers(Color.Black, 5, 1)
+        initial_hash = board.position_hash
+        move = Move([Submove(5, 4), Submove(1, 4)])
+        did_hits = board.do_move(Color.Black, move)
+        moved_hash = board.position_hash
+        board.recompute()
+        self.assertEqual(board.position_hash, moved_hash)
+        self.assertNotEqual(moved_hash, initial_hash)
+        board.undo_move(Color.Black, move, did_hits)
+        self.assertEqual(board.position_hash, initial_hash)
+
+    def test_hash_side_to_move(self):
+        """Make sure the side to move changes the hash."""
+        board = Board()
+        board.setup()
+        self.assertNotEqual(
+            board.get_hash(Color.Black), board.get_hash(Color.White))
+
+    def test_hash_same_position(self):
+        """Make sure moves reaching the same position hash the same."""
+        first = Board()
+        first.setup()
+        second = first.copy()
+        first.do_move(Color.Black, Move([Submove(18, 5), Submove(12, 6)]))
+        second.do_move(Color.Black, Move([Submove(17, 6), Submove(12, 5)]))
+        self.assertEqual(first.key(), second.key())
+        self.assertEqual(first.position_hash, second.position_hash)
+
+    def test_is_valid_move_agrees_with_list_moves(self):
+        """Make sure checking a move agrees with listing the moves."""
+        rng = random.Random(1)
+        for _ in range(0, 25):
+            board = make_random_board(rng)
+            color = rng.choice(list(Color))
+            dice = [rng.randint(1, 6), rng.randint(1, 6)]
+            legal_moves = set(board.list_moves(color, dice))
+            # Doubles are listed in one order, but any order is legal.
+            if dice[0] == dice[1]:
+                legal_moves.update(board.list_moves_with_ordered_dice_r(
+                    color, dice * 2, False))
+            candidates = list(legal_moves)
+            for move in list(candidates):
+                shorter = Move(move.submoves)
+                shorter.pop()
+                candidates.append(shorter)
+            for pos in range(Board.BAR_POS, Board.BEARING_OFF_POS):
+                for first_die in set(dice):
+                    first = Submove(pos, first_die)
+                    candidates.append(Move([first]))
+                    for second_die in set(dice):
+                        candidates.append(Move(
+                            [Submove(first.destination(), second_die),
+                             first]))
+            for move in candidates:
+                self.assertEqual(
+                    board.is_valid_move(color, dice, move),
+                    move in legal_moves, '{} {}'.format(dice, move))
+
+    def test_list_moves_with_double_canonical(self):
+        """Make sure a double lists each set of submoves once."""
+        rng = random.Random(3)
+        for _ in range(0, 10):
+            board = make_random_board(rng)
+            all_orders = board.list_moves_with_ordered_dice_r(
+                Color.White, [2] * 4, False)
+            moves = board.list_moves(Color.White, [2, 2])
+            submove_sets = set(
+                frozenset(Counter(move.submoves).items()) for move in moves)
+            self.assertEqual(len(submove_sets), len(moves))
+            self.assertEqual(submove_sets, set(
+                frozenset(Counter(move.submoves).items())
+                for move in all_orders))
+
+    def test_iter_moves(self):
+        """Make sure lazily generated moves match the listed moves, and
+        that listing them leaves the board alone."""
+        rng = random.Random(2)
+        for _ in range(0, 10):
+            board = make_random_board(rng)
+            key = board.key()
+            position_hash = board.position_hash
+            for dice in ([first_die, second_die]
+                         for first_die in range(1, 7)
+                         for second_die in range(1, 7)):
+                self.assertEqual(
+                    list(board.iter_moves(Color.Black, dice)),
+                    board.list_moves(Color.Black, dice))
+            self.assertEqual(key, board.key())
+            self.assertEqual(position_hash, board.position_hash)
+
+    def test_iter_moves_positions(self):
+        """Make sure the board is in the position of each move yielded."""
+        rng = random.Random(3)
+        boards = [make_random_board(rng) for _ in range(0, 10)]
+        # Only one die can be played.
+        board = Board()
+        board.set_checkers(Color.Black, 1, 1)
+        board.set_opposite_checkers(Color.Black, 7, 2)
+        board.set_opposite_checkers(Color.Black, 12, 2)
+        self.assertEqual(
+            board.list_moves(Color.Black, [5, 6]), [Move([Submove(1, 5)])])
+        boards.append(board)
+        for board in boards:
+            for dice in ([2, 2], [6, 1], [5, 6]):
+                before = board.copy()
+                for move in board.iter_moves(Color.Black, dice):
+                    after = before.copy()
+                    after.do_move(Color.Black, move)
+                    self.assertEqual(board.key(), after.key())
+                    self.assertEqual(
+                        board.position_hash, after.position_hash)
+
+    def test_iter_moves_closed_early(self):
+        """Make sure the board is restored when we stop early."""
+        board = Board()
+        board.setup()
+        key = board.key()
+        moves = board.iter_moves(Color.Black, [4, 4])
+        next(moves)
+        self.assertNotEqual(board.key(), key)
+        moves.close()
+        self.assertEqual(board.key(), key)
+
+    def test_has_legal_move(self):
+        """Make sure we find a legal move when there is one."""
+        board = Board()
+        board.set_checkers(Color.Black, Board.BAR_POS, 1)
+        board.set_opposite_checkers(Color.Black, 1, 2)
+        board.set_opposite_checkers(Color.Black, 2, 2)
+        self.assertFalse(board.has_legal_move(Color.Black, [1, 2]))
+        self.assertTrue(board.has_legal_move(Color.Black, [1, 3]))
+
+    def test_summaries_are_incremental(self):
+        """Make sure the summaries kept by do_submove match fresh ones."""
+        def summarize(board: Board) -> list:
+            return [(board.get_back_pos(color),
+                     board.get_outside_checkers(color),
+                     board.get_bar_checkers(color),
+                     board.get_off_checkers(color),
+                     board.get_features(color)) for color in Color]
+        rng = random.Random(4)
+        board = make_random_board(rng)
+        initial_summaries = summarize(board)
+        history = []
+        for turn in range(0, 60):
+            color = list(Color)[turn % 2]
+            moves = board.list_moves(
+                color, [rng.randint(1, 6), rng.randint(1, 6)])
+            if 0 == len(moves):
+                continue
+            move = rng.choice(moves)
+            history.append((color, move, board.do_move(color, move)))
+            summaries = summarize(board)
+            board.recompute()
+            self.assertEqual(summarize(board), summaries)
+        for color, move, did_hits in reversed(history):
+            board.undo_move(color, move, did_hits)
+        self.assertEqual(summarize(board), initial_summaries)
+
+    def test_features(self):
+        """Make sure the features are counted and updated by hits."""
+        board = Board()
+        board.setup()
+        features = board.get_features(Color.Black)
+        self.assertEqual(len(features), Feature.SIZE)
+        self.assertEqual(features[Feature.Pips], 167)
+        self.assertEqual(features[Feature.OpponentPips], 167)
+        self.assertEqual(features[Feature.Blots], 0)
+        self.assertEqual(features[Feature.MadePoints], 4)
+        self.assertEqual(features[Feature.PrimeLength], 1)
+        self.assertEqual(features[Feature.BackCheckers], 2)
+        self.assertEqual(features[Feature.Contact], 1)
+        # Make the 5 point and the 4 point for a prime of three.
+        board.do_move(Color.Black, Move([Submove(17, 4), Submove(19, 2)]))
+        board.do_move(Color.Black, Move([Submove(17, 3), Submove(19, 1)]))
+        features = board.get_features(Color.Black)
+        self.assertEqual(features[Feature.Pips], 167 - 10)
+        self.assertEqual(features[Feature.MadePoints], 5)
+        self.assertEqual(features[Feature.PrimeLength], 3)
+        self.assertEqual(features[Feature.Blots], 1)
+        # Hit White's blot by moving a back checker to the 24 point.
+        board.set_checkers(Color.White, 1, 0)
+        board.set_checkers(Color.White, 2, 1)
+        did_hit = board.do_submove(Color.Black, Submove(1, 22))
+        features = board.get_features(Color.White)
+        self.assertTrue(did_hit)
+        # Two checkers left the 24 point and the blot went to the bar.
+        self.assertEqual(features[Feature.Pips], 167 - 2 * 24 + 25)
+        self.assertEqual(features[Feature.BackCheckers], 1)
+        self.assertEqual(features[Feature.OpponentBackCheckers], 1)
+        # Put everyone past each other for a race.
+        board = Board()
+        board.set_checkers(Color.Black, 20, 15)
+        board.set_checkers(Color.White, 10, 15)
+        self.assertTrue(board.is_race())
+        self.assertEqual(board.get_features(Color.White)[Feature.Contact], 0)
+        board.set_checkers(Color.White, 10, 14)
+        board.set_checkers(Color.White, 4, 1)
+        self.assertFalse(board.is_race())
+
+    def test_is_all_home(self):
+        """Make sure we know when everyone is home."""
+        board = Board()
+        board.set_checkers(Color.Black, 18, 1)
+        board.set_checkers(Color.Black, 20, 2)
+        self.assertFalse(board.is_all_home(Color.Black))
+        self.assertEqual(board.get_back_pos(Color.Black), 18)
+        board.do_submove(Color.Black, Submove(18, 3))
+        self.assertTrue(board.is_all_home(Color.Black))
+        self.assertEqual(board.get_back_pos(Color.Black), 20)
+        self.assertTrue(board.is_highest_home_point(Color.Black, 20))
+        self.assertFalse(board.is_highest_home_point(Color.Black, 22))
+
     def test_valid_move__bug_1(self):
         """Make sure legal move is listed."""
         board = Board()
@@ -178,3 +537,261 @@ class TestBoard(unittest.TestCase):
         dice = [2, 1]
         move = Move([Submove(24, 2)])
         self.assertTrue(board.is_valid_move(Color.Black, dice, move))
+
+class TestBackend(unittest.TestCase):
+    """Tests for the board backends."""
+
+    def test_backends_agree(self):
+        """Make sure both backends list the same moves."""
+        for seed in range(0, 10):
+            numpy_board = make_random_board(random.Random(seed))
+            byte_board = make_random_board(
+                random.Random(seed), Backend.ByteArray)
+            self.assertIsInstance(byte_board.get_board(Color.Black), bytearray)
+            self.assertEqual(numpy_board.key(), byte_board.key())
+            self.assertEqual(
+                numpy_board.position_hash, byte_board.position_hash)
+            for dice in ([5, 5], [4, 2]):
+                self.assertEqual(
+                    numpy_board.list_moves(Color.White, dice),
+                    byte_board.list_moves(Color.White, dice))
+
+    def test_copy_keeps_backend(self):
+        """Make sure copies use the same backend."""
+        board = Board(backend=Backend.ByteArray)
+        board.setup()
+        copy = board.copy()
+        self.assertIs(copy.backend, Backend.ByteArray)
+        copy.do_submove(Color.Black, Submove(1, 3))
+        self.assertEqual(board.get_checkers(Color.Black, 1), 2)
+        self.assertEqual(copy.get_checkers(Color.Black, 1), 1)
+
+    def test_copy_keeps_summaries(self):
+        """Make sure copies carry their own summaries and hash."""
+        board = Board()
+        board.setup()
+        copy = board.copy()
+        copy.do_submove(Color.Black, Submove(1, 3))
+        expected = Board()
+        expected.setup()
+        expected.do_submove(Color.Black, Submove(1, 3))
+        for color in Color:
+            self.assertEqual(copy.get_features(color),
+                             expected.get_features(color))
+            self.assertNotEqual(copy.get_features(color),
+                                board.get_features(color))
+        self.assertEqual(copy.position_hash, expected.position_hash)
+        copy.recompute()
+        self.assertEqual(copy.position_hash, expected.position_hash)
+
+class TestMoveCache(unittest.TestCase):
+    """Tests for MoveCache."""
+
+    def test_hits(self):
+        """Make sure repeated positions hit the cache."""
+        cache = MoveCache()
+        board = Board(cache)
+        board.setup()
+        moves = board.list_moves(Color.Black, [3, 1])
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(board.list_moves(Color.Black, [1, 3]), moves)
+        self.assertEqual(cache.hits, 1)
+
+    def test_mirrored_positions(self):
+        """Make sure Black and White share mirrored positions."""
+        cache = MoveCache()
+        board = Board(cache)
+        board.setup()
+        black_moves = board.list_moves(Color.Black, [6, 4])
+        white_moves = board.list_moves(Color.White, [6, 4])
+        self.assertEqual(black_moves, white_moves)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(len(cache), 1)
+
+    def test_evicts_least_recently_used(self):
+        """Make sure the cache stays within its bound."""
+        cache = MoveCache(2)
+        board = Board(cache)
+        board.setup()
+        board.list_moves(Color.Black, [1, 2])
+        board.list_moves(Color.Black, [1, 3])
+        board.list_moves(Color.Black, [1, 2])
+        board.list_moves(Color.Black, [1, 4])
+        self.assertEqual(len(cache), 2)
+        board.list_moves(Color.Black, [1, 2])
+        self.assertEqual(cache.hits, 2)
+        board.list_moves(Color.Black, [1, 3])
+        self.assertEqual(cache.misses, 4)
+
+    def test_cached_moves_are_copies(self):
+        """Make sure changing a listed move doesn't change the cache."""
+        cache = MoveCache()
+        board = Board(cache)
+        board.setup()
+        board.list_moves(Color.Black, [6, 5])[0].pop()
+        self.assertEqual(board.list_moves(Color.Black, [6, 5])[0].size(), 2)
+
+class CountingBoard(Board):
+    """Board counting how often moves are generated and checked."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.list_moves_calls = 0
+        self.is_valid_move_calls = 0
+
+    def list_moves(self, color: Color, dice: DICE) -> List[Move]:
+        self.list_moves_calls += 1
+        return super().list_moves(color, dice)
+
+    def is_valid_move(self, color: Color, dice: DICE, move: Move) -> bool:
+        self.is_valid_move_calls += 1
+        return super().is_valid_move(color, dice, move)
+
+class CountingPlayer(RandomPlayer):
+    """Random player counting the moves it makes."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.make_move_calls = 0
+
+    def make_move(self, color: Color, game: Game, dice: DICE) -> Move:
+        self.make_move_calls += 1
+        return super().make_move(color, game, dice)
+
+class TestDice(unittest.TestCase):
+    """Tests for dice sources."""
+
+    def test_random_dice(self):
+        """Make sure seeded dice roll the same across blocks."""
+        first = RandomDice(np.random.default_rng(0))
+        second = RandomDice(np.random.default_rng(0))
+        rolls = [first.roll() for _ in range(0, RandomDice.BLOCK_SIZE + 10)]
+        self.assertEqual(
+            rolls, [second.roll() for _ in range(0, len(rolls))])
+        for dice in rolls:
+            self.assertEqual(len(dice), 2)
+            self.assertTrue(all(1 <= die <= 6 for die in dice))
+        self.assertEqual(len(set(tuple(dice) for dice in rolls)), 36)
+
+    def test_replay_dice(self):
+        """Make sure recorded dice are rolled in order until they run out."""
+        dice = ReplayDice([[3, 1], [6, 6]])
+        self.assertEqual(dice.roll(), [3, 1])
+        self.assertEqual(dice.roll(), [6, 6])
+        with self.assertRaises(IndexError):
+            dice.roll()
+
+class CountingObserver(Observer):
+    """Observer counting the events of each kind."""
+
+    def __init__(self) -> None:
+        self.events = Counter() # type: Counter
+        self.scores = [] # type: List[int]
+
+    def on_dice_rolled(self, game: Game, color: Color, dice: DICE) -> None:
+        self.events['dice_rolled'] += 1
+
+    def on_move_played(
+            self, game: Game, color: Color, dice: DICE, move: Move) -> None:
+        self.events['move_played'] += 1
+
+    def on_no_legal_moves(self, game: Game, color: Color) -> None:
+        self.events['no_legal_moves'] += 1
+
+    def on_game_over(self, game: Game, winner: Color, score: int) -> None:
+        self.events['game_over'] += 1
+        self.scores.append(score)
+
+class TestGame(unittest.TestCase):
+    """Tests for Game."""
+
+    def test_moves_generated_once_per_turn(self):
+        """Make sure moves are generated at most once per turn."""
+        board = CountingBoard()
+        game = Game(board)
+        player = CountingPlayer()
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.play_round(player, player)
+        self.assertLess(0, player.make_move_calls)
+        self.assertEqual(board.list_moves_calls, player.make_move_calls)
+        self.assertEqual(board.is_valid_move_calls, 0)
+
+    def test_legal_moves_outside_turn(self):
+        """Make sure legal moves are generated outside of a turn."""
+        board = Board()
+        board.setup()
+        game = Game(board)
+        moves = game.get_legal_moves(Color.Black, [6, 5])
+        self.assertEqual(moves, board.list_moves(Color.Black, [6, 5]))
+        self.assertTrue(game.is_legal_move(Color.Black, [6, 5], moves[0]))
+
+    def test_observer(self):
+        """Make sure every roll is followed by a move or by no move."""
+        observer = CountingObserver()
+        game = Game(Board(), observer, RandomDice(np.random.default_rng(0)))
+        player = RandomPlayer(random.Random(0))
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            game.play_round(player, player)
+        self.assertEqual(stdout.getvalue(), '')
+        self.assertLess(0, observer.events['move_played'])
+        self.assertEqual(
+            observer.events['dice_rolled'],
+            observer.events['move_played'] +
+            observer.events['no_legal_moves'])
+        self.assertEqual(observer.events['game_over'], 1)
+        self.assertEqual(
+            observer.scores, [game.black_score + game.white_score])
+
+    def test_console_observer(self):
+        """Make sure the console observer writes to its stream."""
+        stream = io.StringIO()
+        game = Game(Board(), ConsoleObserver(stream),
+                    RandomDice(np.random.default_rng(0)))
+        player = RandomPlayer(random.Random(0))
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            game.play_round(player, player)
+        self.assertEqual(stdout.getvalue(), '')
+        self.assertIn('Rolled ', stream.getvalue())
+        self.assertIn(' wins!\n', stream.getvalue())
+
+    def test_replay(self):
+        """Make sure replaying the dice replays the game."""
+        class RecordingDice(RandomDice):
+            """Dice recording every roll."""
+
+            def __init__(self, rng: np.random.Generator) -> None:
+                super().__init__(rng)
+                self.rolls = [] # type: List[DICE]
+
+            def roll(self) -> DICE:
+                dice = super().roll()
+                self.rolls.append(dice)
+                return dice
+
+        recording_dice = RecordingDice(np.random.default_rng(5))
+        games = []
+        for dice in (recording_dice, ReplayDice(recording_dice.rolls)):
+            game = Game(Board(), Observer(), dice)
+            player = RandomPlayer(random.Random(5))
+            game.play_round(player, player)
+            games.append(game)
+        self.assertEqual(games[0].board.key(), games[1].board.key())
+        self.assertEqual(
+            (games[0].black_score, games[0].white_score),
+            (games[1].black_score, games[1].white_score))
+
+    def test_play_position(self):
+        """Make sure a round can start from any position."""
+        board = Board()
+        board.set_checkers(Color.White, Board.BEARING_OFF_POS - 1, 2)
+        board.set_checkers(Color.White, Board.BEARING_OFF_POS, 13)
+        board.set_checkers(Color.Black, Board.BAR_POS + 1, 15)
+        observer = CountingObserver()
+        game = Game(board, observer, ReplayDice([[2, 1]]))
+        player = RandomPlayer(random.Random(0))
+        game.play_position(player, player, Color.White)
+        self.assertTrue(board.is_winner(Color.White))
+        self.assertEqual(observer.scores, [3])
+        self.assertEqual(game.white_score, 3)
@@ -0,0 +1,140 @@
+"""Tests for game records."""
+import io
+import random
+import unittest
+
+import numpy as np
+
+from pygammon.pygammon import AcceptCommand
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.pygammon import Command
+from pygammon.pygammon import DICE
+from pygammon.pygammon import DoubleCommand
+from pygammon.pygammon import Forfeit
+from pygammon.pygammon import Game
+from pygammon.pygammon import Move
+from pygammon.pygammon import RandomDice
+from pygammon.pygammon import Submove
+from pygammon.randomplayer import RandomPlayer
+from pygammon.record import GameRecord
+from pygammon.record import RecordWriter
+from pygammon.record import read_games
+from pygammon.record import read_records
+
+class DoublingPlayer(RandomPlayer):
+    """Random player doubling on its first turn and accepting doubles."""
+
+    def __init__(self, rng: random.Random) -> None:
+        super().__init__(rng)
+        self.did_double = False
+
+    def roll_or_double(self, color: Color, game: Game) -> Command:
+        if not self.did_double:
+            self.did_double = True
+            return DoubleCommand()
+        return super().roll_or_double(color, game)
+
+    def accept_or_resign(self, color: Color, game: Game) -> Command:
+        return AcceptCommand()
+
+class CheatingPlayer(RandomPlayer):
+    """Random player trying to bear off from the start."""
+
+    def make_move(self, color: Color, game: Game, dice: DICE) -> Move:
+        return Move([Submove(24, dice[0])])
+
+def replay(record: GameRecord) -> Board:
+    """Play the moves of a record from the starting position."""
+    board = Board()
+    board.setup()
+    for color, dice, move in record.turns:
+        if 0 < move.size():
+            assert board.is_valid_move(color, dice, move)
+            board.do_move(color, move)
+    return board
+
+class TestRecord(unittest.TestCase):
+    """Tests for recording games."""
+
+    def record_games(self, players, rounds: int):
+        """Play rounds and return the record stream and the final boards."""
+        stream = io.BytesIO()
+        writer = RecordWriter(stream)
+        dice = RandomDice(np.random.default_rng(0))
+        games = []
+        for _ in range(0, rounds):
+            game = Game(Board(), writer, dice)
+            game.play_round(players[0], players[1])
+            games.append(game)
+        stream.seek(0)
+        return stream, games
+
+    def test_round_trip(self):
+        """Make sure replaying the records gives the final positions."""
+        player = RandomPlayer(random.Random(0))
+        stream, games = self.record_games([player, player], 5)
+        turns = 0
+        records = list(read_records(stream, chunk_size=7))
+        self.assertEqual(len(records), len(games))
+        for record, game in zip(records, games):
+            board = replay(record)
+            self.assertEqual(board.key(), game.board.key())
+            self.assertTrue(record.winner is not None and
+                            board.is_winner(record.winner))
+            self.assertEqual(
+                record.score, game.black_score + game.white_score)
+            turns += len(record.turns)
+        # Well under 8 bytes a turn.
+        self.assertLess(len(stream.getvalue()), turns * 5)
+
+    def test_cube(self):
+        """Make sure doubles and resignations are recorded."""
+        rng = random.Random(1)
+        stream, _ = self.record_games(
+            [DoublingPlayer(rng), DoublingPlayer(rng)], 1)
+        record = next(read_records(stream))
+        self.assertEqual(len(record.doubles), 2)
+        self.assertEqual(
+            [record.turns[index][0] for index in record.doubles],
+            [record.first_color.opposite(), record.first_color])
+        self.assertFalse(record.resigned)
+        self.assertEqual(record.score % 4, 0)
+
+        stream, _ = self.record_games(
+            [DoublingPlayer(rng), RandomPlayer(rng)], 1)
+        record = next(read_records(stream))
+        self.assertEqual(len(record.doubles), 1)
+        self.assertTrue(record.resigned)
+        self.assertEqual(record.winner, Color.Black)
+        self.assertEqual(record.score, 1)
+
+    def test_forfeit(self):
+        """Make sure forfeits are recorded."""
+        stream, _ = self.record_games(
+            [CheatingPlayer(), CheatingPlayer()], 1)
+        record = next(read_records(stream))
+        self.assertEqual(record.forfeit, Forfeit.IllegalMove)
+        self.assertEqual(record.turns, [])
+        self.assertEqual(record.winner, record.first_color.opposite())
+
+    def test_truncated(self):
+        """Make sure a truncated stream is reported."""
+        player = RandomPlayer(random.Random(0))
+        stream, _ = self.record_games([player, player], 1)
+        data = stream.getvalue()
+        with self.assertRaises(ValueError):
+            list(read_games(io.BytesIO(data[:-1])))
+
+    def test_dice_not_shared(self):
+        """Make sure changing the dice of a decoded turn changes no other
+        turn."""
+        player = RandomPlayer(random.Random(0))
+        stream, _ = self.record_games([player, player], 1)
+        data = stream.getvalue()
+        record = next(read_records(io.BytesIO(data)))
+        expected = [list(dice) for _, dice, _ in record.turns]
+        for _, dice, _ in record.turns:
+            dice[0] = 0
+        record = next(read_records(io.BytesIO(data)))
+        self.assertEqual([dice for _, dice, _ in record.turns], expected)
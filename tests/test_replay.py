@@ -0,0 +1,109 @@
+"""Tests for replaying recorded games."""
+import io
+import os
+import random
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.pygammon import Game
+from pygammon.pygammon import RandomDice
+from pygammon.pygammon import Submove
+from pygammon.randomplayer import RandomPlayer
+from pygammon.record import MARKER_END
+from pygammon.record import RecordWriter
+from pygammon.record import encode_turn
+from pygammon.replay import replay_file
+from pygammon.replay import split_records
+
+def make_game(turns: bytes) -> bytes:
+    """Make the record of a game Black won with the turns."""
+    body = bytes([Color.Black.value]) + turns + \
+        bytes([MARKER_END, Color.Black.value]) + struct.pack('<H', 1)
+    return struct.pack('<H', len(body)) + body
+
+class TestReplay(unittest.TestCase):
+    """Tests for replaying recorded games."""
+
+    def setUp(self):
+        stream = io.BytesIO()
+        writer = RecordWriter(stream)
+        dice = RandomDice(np.random.default_rng(0))
+        player = RandomPlayer(random.Random(0))
+        for _ in range(0, 6):
+            Game(Board(), writer, dice).play_round(player, player)
+        self.data = stream.getvalue()
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def write(self, data: bytes) -> None:
+        """Write the record file."""
+        with open(self.path, 'wb') as record_file:
+            record_file.write(data)
+
+    def test_replay(self):
+        """Make sure recorded games replay cleanly with any workers."""
+        self.write(self.data)
+        results = []
+        for workers in (1, 2):
+            stats = replay_file(self.path, workers)
+            self.assertEqual(stats.games, 6)
+            self.assertEqual(stats.bad_offsets, [])
+            results.append((stats.turns, stats.hits, stats.total_pip_swing,
+                            stats.max_pip_swing))
+        self.assertEqual(results[0], results[1])
+        self.assertLess(0, sum(results[0][1]))
+
+    def test_split_records(self):
+        """Make sure the ranges hold whole games and cover the file."""
+        self.write(self.data)
+        ranges = split_records(self.path, 3)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], len(self.data))
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+
+    def test_bad_games(self):
+        """Make sure illegal, missed and undecodable games are found."""
+        # There is no checker on Black's 2 point.
+        illegal = make_game(bytes([
+            encode_turn([6, 5], 2), Submove.get(2, 6).index,
+            Submove.get(1, 5).index]))
+        # Black can move with 6-5 from the start.
+        missed = make_game(bytes([encode_turn([6, 5], 0)]))
+        corrupt = make_game(bytes([0xFE]))
+        self.write(self.data + illegal + missed + corrupt)
+        stats = replay_file(self.path)
+        self.assertEqual(stats.games, 8)
+        self.assertEqual(stats.illegal_games, 1)
+        self.assertEqual(stats.missed_games, 1)
+        self.assertEqual(stats.corrupt_games, 1)
+        self.assertEqual(stats.bad_offsets, [
+            len(self.data), len(self.data) + len(illegal),
+            len(self.data) + len(illegal) + len(missed)])
+
+    def test_truncated(self):
+        """Make sure a last game cut short is counted as corrupt."""
+        last_offset = 0
+        while True:
+            length = struct.unpack_from('<H', self.data, last_offset)[0]
+            if len(self.data) <= last_offset + 2 + length:
+                break
+            last_offset += 2 + length
+        for size in (len(self.data) - 1, len(self.data) - 3,
+                     last_offset + 1):
+            self.write(self.data[:size])
+            ranges = split_records(self.path, 3)
+            self.assertEqual(ranges[-1][1], size)
+            for workers in (1, 2):
+                stats = replay_file(self.path, workers)
+                self.assertEqual(stats.games, 5)
+                self.assertEqual(stats.corrupt_games, 1)
+                self.assertEqual(stats.bad_offsets, [last_offset])
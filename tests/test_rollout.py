@@ -0,0 +1,97 @@
+"""Tests for rollouts."""
+import random
+import unittest
+
+import numpy as np
+
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.randomplayer import RandomPlayer
+from pygammon.rollout import BLOCK_SIZE
+from pygammon.rollout import FIRST_ROLLS
+from pygammon.rollout import RolloutDice
+from pygammon.rollout import RolloutResults
+from pygammon.rollout import play_trial
+from pygammon.rollout import rollout
+
+class TestRollout(unittest.TestCase):
+    """Tests for rollout."""
+
+    def setUp(self):
+        self.player = RandomPlayer(random.Random(0))
+
+    def test_dice(self):
+        """Make sure every block starts with each roll once and pairs of
+        trials roll mirrored dice."""
+        first_rolls = []
+        for trial in range(0, BLOCK_SIZE):
+            first_rolls.append(RolloutDice.for_trial(trial, 0).roll())
+        self.assertEqual(sorted(first_rolls), sorted(FIRST_ROLLS))
+        dice = RolloutDice.for_trial(10, 3)
+        mirrored_dice = RolloutDice.for_trial(11, 3)
+        for _ in range(0, 10):
+            self.assertEqual([7 - die for die in dice.roll()],
+                             mirrored_dice.roll())
+
+    def test_play_trial(self):
+        """Make sure trials score gammons and backgammons."""
+        board = Board()
+        board.set_checkers(Color.Black, Board.BEARING_OFF_POS - 1, 1)
+        board.set_checkers(Color.Black, Board.BEARING_OFF_POS, 14)
+        board.set_checkers(Color.White, Board.BAR_POS + 1, 15)
+        self.assertEqual(3, play_trial(
+            board.copy(), Color.Black, self.player,
+            RolloutDice.for_trial(0, 0)))
+        self.assertEqual(-3, play_trial(
+            board.copy(), Color.White, self.player,
+            RolloutDice([6, 6], (0, 0))))
+
+    def test_results(self):
+        """Make sure the probabilities count the outcomes."""
+        results = RolloutResults(np.array([1, -1, 2, -3], dtype=np.int8))
+        self.assertEqual(0.5, results.get_win()[0])
+        self.assertEqual(0.25, results.get_gammon()[0])
+        self.assertEqual(0.0, results.get_backgammon()[0])
+        self.assertEqual(0.25, results.get_lose_gammon()[0])
+        self.assertEqual(0.25, results.get_lose_backgammon()[0])
+        equity, error = results.get_equity()
+        self.assertEqual(-0.25, equity)
+        # The pairs average 0 and -0.5.
+        self.assertAlmostEqual(0.25, error)
+
+    def test_rollout(self):
+        """Make sure rollouts agree with workers and stop early."""
+        board = Board()
+        board.setup()
+        key = board.key()
+        results = rollout(board, Color.Black, self.player, 2 * BLOCK_SIZE,
+                          seed=1)
+        self.assertEqual(2 * BLOCK_SIZE, len(results))
+        self.assertTrue(0 < results.get_win()[0] < 1)
+        self.assertTrue(np.isfinite(results.get_win()[1]))
+        parallel_results = rollout(board, Color.Black, self.player,
+                                   2 * BLOCK_SIZE, workers=2, seed=1)
+        np.testing.assert_array_equal(
+            results.outcomes, parallel_results.outcomes)
+        early_results = rollout(board, Color.Black, self.player,
+                                10 * BLOCK_SIZE, seed=1, target_error=10.0,
+                                min_trials=BLOCK_SIZE)
+        self.assertEqual(BLOCK_SIZE, len(early_results))
+        self.assertEqual(key, board.key())
+
+    def test_partial_block(self):
+        """Make sure only the trials asked for are played."""
+        board = Board()
+        board.setup()
+        self.assertEqual(1, len(rollout(board, Color.Black, self.player, 1)))
+        results = rollout(board, Color.Black, self.player, BLOCK_SIZE + 5,
+                          seed=1)
+        self.assertEqual(BLOCK_SIZE + 5, len(results))
+        np.testing.assert_array_equal(
+            results.outcomes[:BLOCK_SIZE],
+            rollout(board, Color.Black, self.player, BLOCK_SIZE,
+                    seed=1).outcomes)
+        self.assertEqual(float(np.mean(results.outcomes)),
+                         results.get_equity()[0])
+        with self.assertRaises(ValueError):
+            rollout(board, Color.Black, self.player, 0)
@@ -0,0 +1,95 @@
+"""Tests for the search player."""
+import random
+import unittest
+
+import numpy as np
+
+from pygammon.neuralplayer import Network
+from pygammon.neuralplayer import NeuralPlayer
+from pygammon.neuralplayer import encode_keys
+from pygammon.pygammon import Backend
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.searchplayer import ROLLS
+from pygammon.searchplayer import SearchPlayer
+
+class TestSearchPlayer(unittest.TestCase):
+    """Tests for SearchPlayer."""
+
+    def setUp(self):
+        self.network = Network.create(10, np.random.default_rng(0))
+
+    def _get_reply_value(self, board: Board, color: Color) -> float:
+        """Average the best replies of the other player without pruning."""
+        if board.is_winner(color):
+            return 1.0
+        opponent = color.opposite()
+        value = 0.0
+        for dice, probability in ROLLS:
+            keys = [key for _, key in board.list_moves_with_keys(
+                opponent, dice)]
+            if 0 == len(keys):
+                keys = [board.get_key(opponent, [])]
+            value += probability * (1.0 - float(self.network.evaluate(
+                encode_keys(keys)).max()))
+        return value
+
+    def test_rolls(self):
+        """Make sure the rolls cover every outcome of two dice."""
+        self.assertEqual(21, len(ROLLS))
+        self.assertAlmostEqual(1.0, sum(
+            probability for _, probability in ROLLS))
+
+    def test_choose_move(self):
+        """Make sure pruning finds the best move of a full 2-ply search
+        and leaves the board unchanged."""
+        rng = random.Random(0)
+        player = SearchPlayer(self.network, 2)
+        board = Board(backend=Backend.ByteArray)
+        board.setup()
+        color = Color.Black
+        for _ in range(0, 4):
+            dice = [rng.randint(1, 6), rng.randint(1, 6)]
+            key = board.key()
+            position_hash = board.position_hash
+            move = player.choose_move(board, color, dice)
+            self.assertEqual(key, board.key())
+            self.assertEqual(position_hash, board.position_hash)
+            self.assertEqual(2, player.depth)
+            self.assertLess(0, player.cutoffs)
+            values = []
+            for legal_move, after in board.list_moves_with_positions(
+                    color, dice):
+                value = self._get_reply_value(after, color)
+                values.append(value)
+                if legal_move == move:
+                    chosen_value = value
+            self.assertAlmostEqual(max(values), chosen_value)
+            self.assertIsNotNone(move)
+            if move is not None:
+                board.do_move(color, move)
+            color = color.opposite()
+
+    def test_table(self):
+        """Make sure a repeated search finds its nodes in the table."""
+        player = SearchPlayer(self.network, 2)
+        board = Board()
+        board.setup()
+        move = player.choose_move(board, Color.White, [3, 1])
+        self.assertEqual(0, player.table_hits)
+        self.assertEqual(move, player.choose_move(board, Color.White, [3, 1]))
+        self.assertLess(0, player.table_hits)
+        player.clear()
+        player.choose_move(board, Color.White, [3, 1])
+        self.assertEqual(0, player.table_hits)
+
+    def test_time_budget(self):
+        """Make sure the search keeps the last depth it finished in time."""
+        player = SearchPlayer(self.network, 3, time_budget=0.0)
+        board = Board()
+        board.setup()
+        move = player.choose_move(board, Color.Black, [6, 2])
+        self.assertEqual(1, player.depth)
+        self.assertEqual(move, NeuralPlayer(self.network).choose_move(
+            board, Color.Black, [6, 2]))
+        self.assertIsNone(player.choose_move(Board(), Color.Black, [1, 2]))
@@ -0,0 +1,59 @@
+"""Tests for the lockstep simulator."""
+import random
+import unittest
+
+import numpy as np
+
+from pygammon.batch import BoardBatch
+from pygammon.pygammon import Board
+from pygammon.pygammon import Color
+from pygammon.pygammon import Game
+from pygammon.pygammon import Observer
+from pygammon.randomplayer import RandomPlayer
+from pygammon.simulator import Simulator
+
+class TestSimulator(unittest.TestCase):
+    """Tests for Simulator."""
+
+    def play(self, seed: int, games: int, walk: bool = False):
+        """Play random games with the seed, picking among the legal moves
+        or by random submoves if walk."""
+        player = RandomPlayer(random.Random(seed))
+        policy = player.choose_walk_moves if walk else player.choose_moves
+        simulator = Simulator(policy, policy, np.random.default_rng(seed))
+        return simulator.play(games)
+
+    def test_play(self):
+        """Make sure every game finishes with a sensible result."""
+        for walk in (False, True):
+            results = self.play(0, 40, walk)
+            self.assertEqual(len(results), 40)
+            self.assertTrue(np.isin(results.winners, [0, 1]).all())
+            self.assertTrue(np.isin(results.points, [1, 2, 3]).all())
+            self.assertTrue((0 < results.turns).all())
+            self.assertAlmostEqual(
+                results.get_win_rate(Color.Black) +
+                results.get_win_rate(Color.White), 1.0)
+            self.assertAlmostEqual(
+                results.get_points_per_game(Color.Black),
+                -results.get_points_per_game(Color.White))
+
+    def test_same_moves_as_game(self):
+        """Make sure the batch policy picks the move make_move picks."""
+        board = Board()
+        board.setup()
+        game = Game(board, Observer())
+        for color in Color:
+            for dice in ([6, 5], [2, 2], [1, 3]):
+                batch = BoardBatch.from_boards([board], [color])
+                move = RandomPlayer(random.Random(0)).choose_moves(
+                    batch, np.array([dice]))[0]
+                self.assertEqual(move, RandomPlayer(
+                    random.Random(0)).make_move(color, game, dice))
+
+    def test_seed(self):
+        """Make sure the same seeds play the same games."""
+        first = self.play(1, 10)
+        second = self.play(1, 10)
+        self.assertEqual(first.winners.tolist(), second.winners.tolist())
+        self.assertEqual(first.turns.tolist(), second.turns.tolist())
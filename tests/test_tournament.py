@@ -0,0 +1,76 @@
+"""Tests for tournaments."""
+import io
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from pygammon.neuralplayer import Network
+from pygammon.neuralplayer import NeuralPlayer
+from pygammon.randomplayer import RandomPlayer
+from pygammon.tournament import PlayerFactory
+from pygammon.tournament import load_player_class
+from pygammon.tournament import run_tournament
+
+RANDOM_PLAYER = 'pygammon.randomplayer.RandomPlayer'
+
+class TestTournament(unittest.TestCase):
+    """Tests for tournaments."""
+
+    def test_load_player_class(self):
+        """Make sure only Player classes are loaded."""
+        self.assertIs(load_player_class(RANDOM_PLAYER), RandomPlayer)
+        self.assertIsInstance(
+            PlayerFactory(RANDOM_PLAYER)(random.Random(0)), RandomPlayer)
+        with self.assertRaises(ValueError):
+            load_player_class('RandomPlayer')
+        with self.assertRaises(ValueError):
+            load_player_class('pygammon.pygammon.Board')
+
+    def test_run_tournament(self):
+        """Make sure every game and match is counted."""
+        state = random.getstate()
+        stats = run_tournament(
+            PlayerFactory(RANDOM_PLAYER), PlayerFactory(RANDOM_PLAYER), 6,
+            seed=1, chunk_size=4)
+        self.assertEqual(state, random.getstate())
+        self.assertEqual(stats.matches, 6)
+        self.assertEqual(sum(stats.match_wins), 6)
+        self.assertEqual(sum(stats.wins), stats.games)
+        self.assertLessEqual(6, stats.games)
+        for player in range(0, 2):
+            self.assertLessEqual(
+                stats.gammons[player] + stats.backgammons[player],
+                stats.wins[player])
+        stream = io.StringIO()
+        stats.print(['first', 'second'], 1.0, stream)
+        self.assertIn('6 matches', stream.getvalue())
+
+    def test_workers(self):
+        """Make sure the results don't depend on the number of workers."""
+        results = []
+        for workers in (1, 2):
+            stats = run_tournament(
+                PlayerFactory(RANDOM_PLAYER), PlayerFactory(RANDOM_PLAYER), 4,
+                workers, seed=2, chunk_size=2)
+            results.append((stats.match_wins, stats.wins, stats.points))
+        self.assertEqual(results[0], results[1])
+
+    def test_network_player(self):
+        """Make sure network players load their weights in the workers."""
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            Network.create(10, np.random.default_rng(0)).save(path)
+            factory = PlayerFactory(
+                'pygammon.neuralplayer.NeuralPlayer', path)
+            self.assertIsInstance(factory(random.Random(0)), NeuralPlayer)
+            stats = run_tournament(
+                factory, PlayerFactory(RANDOM_PLAYER), 2, workers=2,
+                chunk_size=1)
+            self.assertEqual(stats.matches, 2)
+            self.assertEqual(sum(stats.wins), stats.games)
+        finally:
+            os.remove(path)
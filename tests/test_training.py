@@ -0,0 +1,80 @@
+"""Tests for TD(lambda) training."""
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from pygammon.neuralplayer import Network
+from pygammon.neuralplayer import encode_keys
+from pygammon.pygammon import RandomDice
+from pygammon.training import Trainer
+from pygammon.training import get_errors
+from pygammon.training import learn
+from pygammon.training import play_game
+
+class TestTraining(unittest.TestCase):
+    """Tests for training by self-play."""
+
+    def setUp(self):
+        self.network = Network.create(10, np.random.default_rng(0))
+
+    def test_get_errors(self):
+        """Make sure the errors match the lambda-weighted sums of TD errors,
+        seen by the player who moved."""
+        rng = np.random.default_rng(1)
+        values = rng.uniform(0, 1, 12)
+        movers = rng.integers(0, 2, 12)
+        trace_decay = 0.6
+        errors = get_errors(values, movers, 1, trace_decay)
+        for index in range(0, len(values)):
+            expected = 0.0
+            for later in range(index, len(values)):
+                if later + 1 < len(values):
+                    target = values[later + 1]
+                    if movers[later + 1] != movers[later]:
+                        target = 1 - target
+                else:
+                    target = 1.0 if 1 == movers[later] else 0.0
+                delta = target - values[later]
+                if movers[later] != movers[index]:
+                    delta = -delta
+                expected += trace_decay ** (later - index) * delta
+            self.assertAlmostEqual(errors[index], expected)
+
+    def test_learn(self):
+        """Make sure learning moves the last position toward the result."""
+        experience = play_game(
+            self.network, RandomDice(np.random.default_rng(2)))
+        keys, movers, winner = experience
+        self.assertLess(0, len(keys))
+        inputs = encode_keys(keys[-1:])
+        before = self.network.evaluate(inputs)[0]
+        learn(self.network, experience, 0.1, 0.0)
+        after = self.network.evaluate(inputs)[0]
+        if winner == movers[-1]:
+            self.assertLess(before, after)
+        else:
+            self.assertLess(after, before)
+
+    def test_train(self):
+        """Make sure training changes the weights and writes checkpoints,
+        with and without workers."""
+        handle, path = tempfile.mkstemp(suffix='.net')
+        os.close(handle)
+        try:
+            for workers in [1, 2]:
+                os.remove(path)
+                weights = self.network.hidden_weights.copy()
+                trainer = Trainer(self.network, seed=workers)
+                trainer.train(4, workers, path, 2, batch_size=2)
+                self.assertEqual(trainer.games, 4)
+                self.assertFalse(
+                    np.array_equal(weights, self.network.hidden_weights))
+                saved = Network.load(path)
+                np.testing.assert_array_equal(
+                    saved.hidden_weights, self.network.hidden_weights)
+                self.assertFalse(os.path.exists(path + '.tmp'))
+        finally:
+            if os.path.exists(path):
+                os.remove(path)